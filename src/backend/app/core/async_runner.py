@@ -0,0 +1,60 @@
+"""app/core/async_runner.py
+====================================
+
+Celery 워커 프로세스 전용 asyncio 이벤트 루프
+-------------------------------------------
+* 프로세스마다 이벤트 루프 하나를 데몬 스레드에서 계속 실행합니다.
+* 태스크(동기 함수)는 ``run_coroutine`` 으로 코루틴을 제출하고 결과를 기다립니다.
+* threads/gevent 풀처럼 한 프로세스에서 여러 태스크가 동시에 실행되면
+  각 태스크의 GPT 호출이 같은 루프 위에서 겹쳐 진행되므로,
+  네트워크 대기 동안 워커 슬롯을 점유하지 않습니다.
+
+AsyncOpenAI·asyncpg 연결은 생성된 루프에 묶이므로 ``asyncio.run`` 처럼
+태스크마다 새 루프를 만들지 않고 이 루프 하나만 재사용합니다.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+from typing import Any, Coroutine, Optional, TypeVar
+
+from app.core.logger import logging
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_lock = threading.Lock()
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_pid: Optional[int] = None
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """현재 프로세스의 백그라운드 이벤트 루프를 (필요하면 생성하여) 반환합니다.
+
+    prefork 풀에서 fork된 자식 프로세스는 부모의 스레드를 물려받지 않으므로
+    pid가 바뀌었으면 루프를 새로 만듭니다.
+    """
+    global _loop, _loop_pid
+    with _lock:
+        if _loop is None or _loop_pid != os.getpid() or _loop.is_closed():
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(
+                target=loop.run_forever,
+                name="celery-asyncio-loop",
+                daemon=True,
+            )
+            thread.start()
+            _loop, _loop_pid = loop, os.getpid()
+            logger.debug("워커 asyncio 이벤트 루프 시작: pid=%d", _loop_pid)
+        return _loop
+
+
+def run_coroutine(coro: Coroutine[Any, Any, T], timeout: Optional[float] = None) -> T:
+    """코루틴을 워커 공용 이벤트 루프에서 실행하고 결과를 반환합니다.
+
+    이벤트 루프 스레드 안에서 호출하면 교착 상태가 되므로 동기 코드(태스크 본문)에서만 사용합니다.
+    """
+    future = asyncio.run_coroutine_threadsafe(coro, _get_loop())
+    return future.result(timeout)
@@ -0,0 +1,218 @@
+"""app/core/audio_chunker.py
+====================================
+
+긴 녹음을 Whisper 요청 단위로 나누는 모듈
+--------------------------------------
+* load_pcm: 음성 파일을 16kHz·mono·16bit PCM 으로 디코딩
+* find_chunk_bounds: 최대 길이 안에서 무음 구간 중앙을 경계로 분할 위치 계산
+* export_wav: 분할 구간을 메모리 상의 WAV 바이트로 변환 (업로드용)
+* merge_transcript_stream / merge_transcripts: 구간별 변환 결과를 순서대로 이어 붙이며 겹침 구간 중복 제거
+  (겹침 구간 길이에 맞춘 토큰 범위 안에서 2토큰 이상 일치할 때만, overlap_token_window 참고)
+
+WAV 는 표준 라이브러리(wave, audioop)만으로 처리합니다.
+MP3 등 다른 형식은 선택 의존성 pydub(poetry install -E audio)과 ffmpeg 이 설치된 경우에만 분할할 수 있습니다.
+"""
+
+from __future__ import annotations
+
+import io
+import math
+import shutil
+import wave
+import warnings
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, List, Sequence
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore", DeprecationWarning)
+    import audioop  # Python 3.13 에서 제거 예정 (pyproject: python <3.12)
+
+try:
+    from pydub import AudioSegment  # 선택 의존성
+except ImportError:  # pragma: no cover - 설치 여부에 따라 다름
+    AudioSegment = None
+
+from app.core.logger import logging
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+SAMPLE_WIDTH = 2          # 16bit
+_WINDOW_SECONDS = 0.05    # 무음 판정 창 크기 (50ms)
+
+# 겹침 구간 중복 제거: 겹침 1초당 최대 토큰 수 (대화 초당 2~3 어절 + 경계에서 잘린 단어 여유)와 최소 일치 토큰 수
+_OVERLAP_TOKENS_PER_SECOND = 4
+MIN_OVERLAP_TOKENS = 2
+
+
+class AudioDecodeError(RuntimeError):
+    """Raised when an audio file cannot be decoded for chunking."""
+
+
+@dataclass(frozen=True)
+class ChunkBound:
+    index: int
+    start_sample: int
+    end_sample: int
+
+    @property
+    def start_seconds(self) -> float:
+        return self.start_sample / SAMPLE_RATE
+
+    @property
+    def end_seconds(self) -> float:
+        return self.end_sample / SAMPLE_RATE
+
+
+def can_decode(path: Path) -> bool:
+    """현재 설치된 의존성으로 분할 가능한 형식인지 여부 (WAV 외 형식은 pydub 과 ffmpeg 필요)."""
+    if path.suffix.lower() == ".wav":
+        return True
+    return AudioSegment is not None and shutil.which(AudioSegment.converter) is not None
+
+
+def load_pcm(path: Path) -> bytes:
+    """음성 파일을 16kHz mono 16bit little-endian PCM 바이트로 디코딩합니다."""
+    if path.suffix.lower() == ".wav":
+        try:
+            with wave.open(str(path), "rb") as wf:
+                channels = wf.getnchannels()
+                width = wf.getsampwidth()
+                rate = wf.getframerate()
+                frames = wf.readframes(wf.getnframes())
+        except (wave.Error, EOFError) as exc:
+            # PCM 이 아닌 WAV(float 등)는 pydub 으로 재시도
+            if AudioSegment is None:
+                raise AudioDecodeError(f"Unsupported WAV encoding: {path}") from exc
+        else:
+            if channels == 2:
+                frames = audioop.tomono(frames, width, 0.5, 0.5)
+            elif channels > 2:
+                raise AudioDecodeError(f"Unsupported channel count {channels}: {path}")
+            if width != SAMPLE_WIDTH:
+                frames = audioop.lin2lin(frames, width, SAMPLE_WIDTH)
+            if rate != SAMPLE_RATE:
+                frames, _ = audioop.ratecv(frames, SAMPLE_WIDTH, 1, rate, SAMPLE_RATE, None)
+            return frames
+
+    if AudioSegment is None:
+        raise AudioDecodeError(f"pydub is required to decode {path.suffix} files")
+
+    segment = (
+        AudioSegment.from_file(str(path))
+        .set_channels(1)
+        .set_frame_rate(SAMPLE_RATE)
+        .set_sample_width(SAMPLE_WIDTH)
+    )
+    return segment.raw_data
+
+
+def find_chunk_bounds(
+    pcm: bytes,
+    max_chunk_seconds: float,
+    min_silence_ms: int,
+    silence_threshold_dbfs: float,
+    overlap_seconds: float,
+) -> List[ChunkBound]:
+    """
+    ``max_chunk_seconds`` 를 넘지 않도록 PCM 을 나눌 구간을 계산합니다.
+
+    각 구간의 후반부(최대 길이의 50%~100%)에서 ``min_silence_ms`` 이상 이어지는 가장 긴 무음 구간의
+    중앙을 경계로 삼고, 무음이 없으면 최대 길이에서 자릅니다. 경계에서 단어가 잘리는 경우를 대비해
+    다음 구간은 ``overlap_seconds`` 만큼 앞에서 시작합니다.
+    """
+    total_samples = len(pcm) // SAMPLE_WIDTH
+    window = int(SAMPLE_RATE * _WINDOW_SECONDS)
+    window_bytes = window * SAMPLE_WIDTH
+
+    threshold = 32768 * (10 ** (silence_threshold_dbfs / 20))
+    silent = [
+        audioop.rms(pcm[i:i + window_bytes], SAMPLE_WIDTH) <= threshold
+        for i in range(0, len(pcm), window_bytes)
+    ]
+
+    max_windows = max(1, int(max_chunk_seconds / _WINDOW_SECONDS))
+    min_silence_windows = max(1, int(min_silence_ms / 1000 / _WINDOW_SECONDS))
+    overlap_samples = int(overlap_seconds * SAMPLE_RATE)
+
+    cuts: List[int] = []  # 경계 위치 (창 번호)
+    start = 0
+    while len(silent) - start > max_windows:
+        search_from = start + max_windows // 2
+        search_to = start + max_windows
+        best_len, best_mid = 0, search_to
+        run_start = None
+        for w in range(search_from, search_to + 1):
+            if w < search_to and silent[w]:
+                if run_start is None:
+                    run_start = w
+                continue
+            if run_start is not None:
+                run_len = w - run_start
+                if run_len >= min_silence_windows and run_len >= best_len:
+                    best_len, best_mid = run_len, run_start + run_len // 2
+                run_start = None
+        cuts.append(best_mid)
+        start = best_mid
+
+    bounds: List[ChunkBound] = []
+    previous = 0
+    for index, cut in enumerate(cuts + [None]):
+        end_sample = total_samples if cut is None else cut * window
+        start_sample = max(0, previous - overlap_samples) if index else 0
+        bounds.append(ChunkBound(index, start_sample, end_sample))
+        previous = end_sample
+    return bounds
+
+
+def export_wav(pcm: bytes, bound: ChunkBound) -> bytes:
+    """PCM 의 지정 구간을 WAV 파일 바이트로 만듭니다."""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(SAMPLE_WIDTH)
+        wf.setframerate(SAMPLE_RATE)
+        wf.writeframes(pcm[bound.start_sample * SAMPLE_WIDTH:bound.end_sample * SAMPLE_WIDTH])
+    return buffer.getvalue()
+
+
+def overlap_token_window(overlap_seconds: float) -> int:
+    """겹침 구간 길이(초)에 해당하는 최대 토큰 수. 겹침이 없으면 0 (중복 제거 안 함)."""
+    if overlap_seconds <= 0:
+        return 0
+    return max(MIN_OVERLAP_TOKENS, math.ceil(overlap_seconds * _OVERLAP_TOKENS_PER_SECOND) + 1)
+
+
+def merge_transcript_stream(
+    texts: Iterable[str],
+    max_overlap_tokens: int = 5,
+    min_overlap_tokens: int = MIN_OVERLAP_TOKENS,
+) -> Iterator[str]:
+    """
+    구간별 변환 결과를 도착 순서대로 받아 중복을 제거한 텍스트를 바로 내보냅니다.
+
+    앞 구간의 끝과 다음 구간의 시작이 같은 토큰열이면(겹침 구간을 두 번 변환한 결과)
+    가장 긴 일치 부분을 한 번만 남깁니다. 일치는 겹침 구간 안(``max_overlap_tokens`` 이내)에서
+    ``min_overlap_tokens`` 이상일 때만 인정하므로, 경계에서 실제로 반복된 한 단어("네 네")는 지우지 않습니다.
+    """
+    tail: List[str] = []
+    for text in texts:
+        tokens = text.split()
+        if tail and tokens:
+            limit = min(max_overlap_tokens, len(tail), len(tokens))
+            for k in range(limit, max(min_overlap_tokens, 1) - 1, -1):
+                if tail[-k:] == tokens[:k]:
+                    tokens = tokens[k:]
+                    break
+        if tokens:
+            yield " ".join(tokens)
+            tail = (tail + tokens)[-max_overlap_tokens:] if max_overlap_tokens > 0 else []
+
+
+def merge_transcripts(
+    texts: Sequence[str],
+    max_overlap_tokens: int = 5,
+    min_overlap_tokens: int = MIN_OVERLAP_TOKENS,
+) -> str:
+    """구간별 변환 결과 전체를 한 번에 합칩니다. (merge_transcript_stream 참고)"""
+    return " ".join(merge_transcript_stream(texts, max_overlap_tokens, min_overlap_tokens))
@@ -0,0 +1,177 @@
+"""app/core/batch_api.py
+====================================
+
+Chat Completions 배치 작업 (OpenAI Batch API / 로컬 대역)
+-------------------------------------------------------
+* 요청들을 JSONL 파일(줄마다 ``custom_id`` + 요청 본문)로 올려 배치 작업 하나로 제출하고,
+  끝나면 출력 JSONL 에서 ``custom_id`` 별 응답 content 를 꺼냅니다.
+  일반 호출보다 비용이 절반이고 분당 한도(app.core.rate_limiter)와 별도이지만, 완료까지 최대
+  GENERATION_BATCH_COMPLETION_WINDOW 가 걸리므로 급하지 않은 생성(app.tasks.batch_generations)에만 씁니다.
+* ``LocalBatchBackend`` 는 같은 형식의 입력‧출력 JSONL 을 GENERATION_BATCH_LOCAL_DIR 에 두고
+  처음 확인할 때 요청을 일반 API(app.core.llm.call_gpt_api)로 처리하는 대역입니다.
+  OPENAI_API_BASE 를 스텁 서버로 두면 Batch API 없이 배치 흐름 전체를 테스트할 수 있습니다.
+"""
+
+from __future__ import annotations
+
+import json
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Protocol
+
+from app.core.config import settings
+from app.core.llm import GPTCallError, call_gpt_api
+from app.core.openai_clients import chat_client
+
+from app.core.logger import logging
+logger = logging.getLogger(__name__)
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+
+# 아직 결과가 없는 배치 작업 상태
+_PENDING_STATUSES = frozenset({"validating", "in_progress", "finalizing", "cancelling"})
+
+
+class BatchJobFailed(RuntimeError):
+    """배치 작업 전체가 실패한 경우 (입력 파일 검증 실패 등)."""
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    content: Optional[str] = None  # 성공한 요청의 응답 content
+    error: Optional[str] = None    # 실패한 요청의 사유
+
+
+class BatchBackend(Protocol):
+    def submit(self, requests: Dict[str, dict]) -> str:
+        """{custom_id: 요청 본문} 을 배치 작업 하나로 제출하고 작업 id 를 반환합니다."""
+        ...
+
+    def poll(self, batch_id: str) -> Optional[Dict[str, BatchResult]]:
+        """
+        진행 중이면 None, 끝났으면 {custom_id: 결과}.
+
+        만료‧취소된 작업은 처리된 요청의 결과만 담으므로, 빠진 custom_id 는 호출자가 다시 제출합니다.
+        """
+        ...
+
+
+def to_jsonl(requests: Dict[str, dict]) -> bytes:
+    lines = (
+        json.dumps(
+            {"custom_id": custom_id, "method": "POST", "url": BATCH_ENDPOINT, "body": body},
+            ensure_ascii=False,
+        )
+        for custom_id, body in requests.items()
+    )
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def parse_output(text: str) -> Dict[str, BatchResult]:
+    """배치 출력‧오류 JSONL 을 {custom_id: BatchResult} 로 변환합니다."""
+    results: Dict[str, BatchResult] = {}
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        custom_id = record["custom_id"]
+        response = record.get("response") or {}
+        body = response.get("body") or {}
+        if record.get("error") or response.get("status_code", 0) >= 400:
+            error = record.get("error") or body.get("error") or response.get("status_code")
+            results[custom_id] = BatchResult(error=str(error))
+            continue
+        try:
+            content = body["choices"][0]["message"]["content"].strip()
+        except (KeyError, IndexError, TypeError, AttributeError):
+            results[custom_id] = BatchResult(error="Invalid response structure")
+            continue
+        results[custom_id] = BatchResult(content=content)
+    return results
+
+
+class OpenAIBatchBackend:
+    def submit(self, requests: Dict[str, dict]) -> str:
+        client = chat_client()
+        input_file = client.files.create(
+            file=("generation-batch.jsonl", to_jsonl(requests)), purpose="batch"
+        )
+        batch = client.batches.create(
+            input_file_id=input_file.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window=settings.GENERATION_BATCH_COMPLETION_WINDOW,
+        )
+        return batch.id
+
+    def poll(self, batch_id: str) -> Optional[Dict[str, BatchResult]]:
+        client = chat_client()
+        batch = client.batches.retrieve(batch_id)
+        if batch.status in _PENDING_STATUSES:
+            return None
+        if batch.status == "failed":
+            raise BatchJobFailed(f"Batch {batch_id} failed: {batch.errors}")
+
+        # completed / expired / cancelled
+        results: Dict[str, BatchResult] = {}
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if file_id:
+                results.update(parse_output(client.files.content(file_id).text))
+        return results
+
+
+class LocalBatchBackend:
+    def __init__(self, directory: str) -> None:
+        self._dir = Path(directory)
+
+    def submit(self, requests: Dict[str, dict]) -> str:
+        batch_id = f"local_batch_{uuid.uuid4().hex}"
+        self._dir.mkdir(parents=True, exist_ok=True)
+        (self._dir / f"{batch_id}.input.jsonl").write_bytes(to_jsonl(requests))
+        return batch_id
+
+    def poll(self, batch_id: str) -> Optional[Dict[str, BatchResult]]:
+        output_path = self._dir / f"{batch_id}.output.jsonl"
+        if not output_path.exists():
+            input_path = self._dir / f"{batch_id}.input.jsonl"
+            if not input_path.exists():
+                raise BatchJobFailed(f"Unknown local batch: {batch_id}")
+            lines = [
+                json.dumps(self._run(json.loads(line)), ensure_ascii=False)
+                for line in input_path.read_text(encoding="utf-8").splitlines()
+                if line.strip()
+            ]
+            tmp_path = output_path.with_suffix(".tmp")
+            tmp_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+            tmp_path.replace(output_path)
+        return parse_output(output_path.read_text(encoding="utf-8"))
+
+    @staticmethod
+    def _run(line: dict) -> dict:
+        body = line["body"]
+        try:
+            content = call_gpt_api(
+                body["messages"], model=body.get("model"), response_format=body.get("response_format")
+            )
+        except GPTCallError as exc:
+            return {
+                "custom_id": line["custom_id"],
+                "response": None,
+                "error": {"code": "request_failed", "message": str(exc)},
+            }
+        return {
+            "custom_id": line["custom_id"],
+            "response": {
+                "status_code": 200,
+                "body": {"choices": [{"index": 0, "message": {"role": "assistant", "content": content}}]},
+            },
+            "error": None,
+        }
+
+
+def batch_backend() -> BatchBackend:
+    if settings.GENERATION_BATCH_BACKEND == "openai":
+        return OpenAIBatchBackend()
+    if settings.GENERATION_BATCH_BACKEND == "local":
+        return LocalBatchBackend(settings.GENERATION_BATCH_LOCAL_DIR)
+    raise ValueError(f"Unknown GENERATION_BATCH_BACKEND: {settings.GENERATION_BATCH_BACKEND}")
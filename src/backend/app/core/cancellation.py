@@ -0,0 +1,190 @@
+"""
+작업 취소 신호 (Celery revoke + Redis pub/sub)
+=============================================
+API 의 취소 요청(cancel_generation / cancel_transcription)을 실행 중인 Celery 태스크에 즉시 전달합니다.
+
+* 등록 시: ``remember_task`` 로 (작업 종류, 레코드 id) → Celery task id(체인이면 단계별 id 전부)를 Redis 에 기록
+* 취소 시: ``publish_cancel`` 이
+    1. 취소 플래그 키를 TTL 과 함께 저장 (구독 전에 취소된 경우를 위해),
+    2. ``cancel:<kind>:<id>`` 채널에 메시지 발행 (실행 중인 태스크),
+    3. 기록된 task id 를 revoke (큐에서 아직 시작하지 않은 태스크는 워커가 버림)
+* 태스크: ``CancelWatcher`` 가 채널을 구독하는 백그라운드 스레드를 띄우고,
+  신호를 받으면 내부 Event 를 세우고 등록된 콜백(예: asyncio 태스크 취소)을 실행합니다.
+  단계 사이의 취소 확인은 DB 조회 없이 ``is_cancelled()`` (Event 확인)로 끝납니다.
+  구독에 실패하면(``subscribed`` 가 False) 신호를 받을 수 없으므로, 결과를 커밋하기 전에 DB 상태를 다시 확인합니다.
+
+브로커와 같은 Redis 를 쓰므로 Redis 장애 시에는 태스크 등록 자체가 불가능하지만,
+취소 신호 처리 실패가 작업 실패로 이어지지 않도록 Redis 오류는 경고 로그만 남깁니다.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Callable, List, Optional
+
+import redis
+
+from app.core.config import settings
+
+from app.core.logger import logging
+logger = logging.getLogger(__name__)
+
+
+_CHANNEL_PREFIX = "cancel:"
+_FLAG_PREFIX = "cancel-flag:"
+_TASK_PREFIX = "cancel-task:"
+
+_client: Optional[redis.Redis] = None
+
+
+class TaskCancelled(RuntimeError):
+    """실행 중인 태스크가 취소 신호를 받아 중단될 때 발생합니다."""
+
+
+def _get_client() -> redis.Redis:
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(
+            settings.REDIS_URL,
+            socket_connect_timeout=0.5,
+            socket_timeout=1.0,
+            decode_responses=True,
+        )
+    return _client
+
+
+def _suffix(kind: str, object_id) -> str:
+    return f"{kind}:{object_id}"
+
+
+# --------------------------------------------------------------------------- #
+# Publisher (API 서버)
+# --------------------------------------------------------------------------- #
+
+def remember_task(kind: str, object_id, *task_ids: str) -> None:
+    """Celery 등록 직후 호출. 취소 시 revoke 할 task id 들을 기록하고 이전 취소 플래그를 지웁니다."""
+    suffix = _suffix(kind, object_id)
+    try:
+        pipe = _get_client().pipeline()
+        pipe.set(_TASK_PREFIX + suffix, " ".join(task_ids), ex=settings.CANCEL_SIGNAL_TTL_SECONDS)
+        pipe.delete(_FLAG_PREFIX + suffix)
+        pipe.execute()
+    except redis.RedisError as exc:
+        logger.warning("취소용 task id 기록 실패: %s=%s (%s)", kind, object_id, exc)
+
+
+def publish_cancel(kind: str, object_id) -> None:
+    """취소 플래그 저장 + 채널 발행 + 대기 중인 Celery 태스크 revoke."""
+    suffix = _suffix(kind, object_id)
+    task_ids = None
+    try:
+        client = _get_client()
+        pipe = client.pipeline()
+        pipe.set(_FLAG_PREFIX + suffix, "1", ex=settings.CANCEL_SIGNAL_TTL_SECONDS)
+        pipe.publish(_CHANNEL_PREFIX + suffix, "cancel")
+        pipe.get(_TASK_PREFIX + suffix)
+        _, receivers, task_ids = pipe.execute()
+        logger.debug("취소 신호 발행: %s=%s, 구독 태스크 수=%d", kind, object_id, receivers)
+    except redis.RedisError as exc:
+        logger.warning("취소 신호 발행 실패: %s=%s (%s)", kind, object_id, exc)
+
+    if task_ids:
+        # 실행 중인 태스크는 구독 신호로 스스로 멈추므로 terminate 는 하지 않음 (워커 프로세스 보호)
+        from app.core.celery_app import celery_app
+        try:
+            celery_app.control.revoke(task_ids.split())
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Celery revoke 실패: task_id=%s (%s)", task_ids, exc)
+
+
+# --------------------------------------------------------------------------- #
+# Subscriber (Celery 태스크)
+# --------------------------------------------------------------------------- #
+
+class CancelWatcher:
+    """
+    태스크 하나의 취소 신호를 구독합니다. ``with`` 블록 또는 ``start()``/``close()`` 로 사용합니다.
+
+    Examples
+    --------
+    >>> with CancelWatcher("generation", generation_id) as watcher:
+    ...     if watcher.is_cancelled():
+    ...         return
+    """
+
+    def __init__(self, kind: str, object_id) -> None:
+        self._kind = kind
+        self._object_id = object_id
+        self._suffix = _suffix(kind, object_id)
+        self._event = threading.Event()
+        self._callbacks: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+        self._pubsub = None
+        self._thread = None
+
+    def start(self) -> "CancelWatcher":
+        try:
+            client = _get_client()
+            self._pubsub = client.pubsub(ignore_subscribe_messages=True)
+            self._pubsub.subscribe(**{_CHANNEL_PREFIX + self._suffix: self._on_message})
+            self._thread = self._pubsub.run_in_thread(sleep_time=0.5, daemon=True)
+            # 구독 전에 이미 취소된 경우
+            if client.exists(_FLAG_PREFIX + self._suffix):
+                self._fire()
+        except redis.RedisError as exc:
+            logger.warning("취소 신호 구독 실패, 취소 없이 진행: %s (%s)", self._suffix, exc)
+            self.close()
+        return self
+
+    def close(self) -> None:
+        if self._thread is not None:
+            self._thread.stop()
+            self._thread = None
+        if self._pubsub is not None:
+            try:
+                self._pubsub.close()
+            except redis.RedisError:
+                pass
+            self._pubsub = None
+
+    def __enter__(self) -> "CancelWatcher":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def subscribed(self) -> bool:
+        """취소 채널 구독 중인지 여부. False 면 ``is_cancelled()`` 만으로는 취소를 알 수 없습니다."""
+        return self._thread is not None
+
+    def is_cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise TaskCancelled(f"{self._kind} cancelled: {self._object_id}")
+
+    def add_callback(self, callback: Callable[[], None]) -> None:
+        """취소 신호 수신 시 (구독 스레드에서) 한 번 호출할 함수를 등록합니다. 이미 취소됐으면 즉시 호출."""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def _on_message(self, message) -> None:
+        self._fire()
+
+    def _fire(self) -> None:
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        logger.info("취소 신호 수신: %s", self._suffix)
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:  # noqa: BLE001
+                logger.warning("취소 콜백 실행 실패: %s", self._suffix, exc_info=True)
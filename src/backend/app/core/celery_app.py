@@ -2,24 +2,18 @@ from __future__ import annotations
 
 import logging
 from celery import Celery
+from celery.signals import worker_init, worker_process_init
+from kombu import Queue
 from app.core.config import settings
-
-import nltk
-nltk.data.path.append(settings.NLTK_DATA_PATH) # NLTK 리소스 경로 추가
-try: nltk.data.find("tokenizers/punkt")
-except LookupError: nltk.download("punkt", download_dir=settings.NLTK_DATA_PATH)
-try: nltk.data.find("tokenizers/punkt_tab")
-except LookupError: nltk.download("punkt_tab", download_dir=settings.NLTK_DATA_PATH)
-try: nltk.data.find("corpora/stopwords")
-except LookupError: nltk.download("stopwords", download_dir=settings.NLTK_DATA_PATH)
-
+from app.core import openai_clients, worker_pool
 
 from app.core.logger import setup_logging
 setup_logging()
 logger = logging.getLogger(__name__)
 
 from app.models import (
-    user, token, contract, transcription, generation, suggestion
+    user, token, contract, transcription, generation, suggestion, generation_batch,
+    transcription_script,
 )
 
 # Celery 인스턴스 생성
@@ -27,7 +21,7 @@ celery_app: Celery = Celery(
     "ai_contract_generator",
     broker=settings.CELERY_BROKER_URL,
     backend=settings.CELERY_RESULT_BACKEND,
-    include=["app.tasks.transcriptions", "app.tasks.generations"],
+    include=["app.tasks.transcriptions", "app.tasks.generations", "app.tasks.batch_generations"],
 )
 
 # 기본 설정값
@@ -42,4 +36,126 @@ celery_app.conf.update(
     worker_max_tasks_per_child=100,    # 메모리 누수 방지
 )
 
+# --------------------------------------------------------------------------- #
+# 큐 분리: 긴 Whisper 변환 뒤에 짧은 작업이 줄 서지 않도록 단계별 큐로 라우팅
+#   transcription : STT (파일 I/O + 긴 Whisper 호출)
+#   classify      : 계약 유형 판단 (짧은 GPT 호출, 생성 체인 첫 단계)
+#   generation    : 필드 추출 + 공란 제안 + 저장 (긴 GPT 호출), asyncio 파이프라인, 배치 작업 제출‧확인
+# --------------------------------------------------------------------------- #
+QUEUE_TRANSCRIPTION = "transcription"
+QUEUE_CLASSIFY = "classify"
+QUEUE_GENERATION = "generation"
+
+celery_app.conf.update(
+    task_queues=(
+        Queue(QUEUE_TRANSCRIPTION),
+        Queue(QUEUE_CLASSIFY),
+        Queue(QUEUE_GENERATION),
+    ),
+    task_default_queue=QUEUE_GENERATION,
+    task_routes={
+        "tasks.transcriptions.*": {"queue": QUEUE_TRANSCRIPTION},
+        "tasks.generations.classify_contract_type": {"queue": QUEUE_CLASSIFY},
+        "tasks.generations.*": {"queue": QUEUE_GENERATION},
+        "tasks.batch_generations.*": {"queue": QUEUE_GENERATION},
+    },
+)
+
+# 배치 모드 생성: 대기 요청 제출과 진행 중인 배치 작업 확인을 주기 실행
+#   celery -A app.core.celery_app beat (워커와 별도로 하나만 실행)
+# 주기보다 늦게 시작된 실행은 버림 (다음 주기에 다시 실행되므로)
+if settings.GENERATION_BATCH_ENABLED:
+    celery_app.conf.beat_schedule = {
+        "submit-generation-batches": {
+            "task": "tasks.batch_generations.submit_generation_batches",
+            "schedule": settings.GENERATION_BATCH_SUBMIT_INTERVAL_SECONDS,
+            "options": {"expires": settings.GENERATION_BATCH_SUBMIT_INTERVAL_SECONDS},
+        },
+        "poll-generation-batches": {
+            "task": "tasks.batch_generations.poll_generation_batches",
+            "schedule": settings.GENERATION_BATCH_POLL_INTERVAL_SECONDS,
+            "options": {"expires": settings.GENERATION_BATCH_POLL_INTERVAL_SECONDS},
+        },
+    }
+
+# 큐별 워커 설정. 긴 작업은 prefetch 1 로 한 작업씩만 가져와 다른 워커가 놀지 않게 하고,
+# 짧은 유형 판단은 여러 개를 미리 가져와 브로커 왕복을 줄임
+WORKER_PROFILES = {
+    QUEUE_TRANSCRIPTION: {
+        "worker_concurrency": settings.CELERY_TRANSCRIPTION_CONCURRENCY,
+        "worker_prefetch_multiplier": 1,
+    },
+    QUEUE_CLASSIFY: {
+        "worker_concurrency": settings.CELERY_CLASSIFY_CONCURRENCY,
+        "worker_prefetch_multiplier": 4,
+    },
+    QUEUE_GENERATION: {
+        "worker_concurrency": settings.CELERY_GENERATION_CONCURRENCY,
+        "worker_prefetch_multiplier": 1,
+    },
+}
+
+# 큐별 워커 실행 예)
+#   CELERY_WORKER_QUEUE=transcription celery -A app.core.celery_app worker -n stt@%h
+#   CELERY_WORKER_QUEUE=classify      celery -A app.core.celery_app worker -n classify@%h
+#   CELERY_WORKER_QUEUE=generation    celery -A app.core.celery_app worker -n generation@%h
+# CELERY_WORKER_QUEUE 를 비우면 한 워커가 모든 큐를 기본 설정으로 처리 (개발 환경)
+if settings.CELERY_WORKER_QUEUE:
+    if settings.CELERY_WORKER_QUEUE not in WORKER_PROFILES:
+        raise ValueError(f"Unknown CELERY_WORKER_QUEUE: {settings.CELERY_WORKER_QUEUE}")
+    celery_app.conf.update(WORKER_PROFILES[settings.CELERY_WORKER_QUEUE])
+    celery_app.select_queues([settings.CELERY_WORKER_QUEUE])
+
+# --------------------------------------------------------------------------- #
+# green thread(gevent/eventlet) 워커 프로필
+#   GPT 단계는 네트워크 대기뿐이므로 프로세스 하나에서 CELERY_POOL_CONCURRENCY 개 태스크를 동시에 실행
+#   예) CELERY_WORKER_POOL=gevent CELERY_WORKER_QUEUE=generation \
+#         celery -A app.core.celery_app worker -P gevent -c 100
+#   DB‧OpenAI 연결 풀은 app.core.worker_pool 에서 같은 동시성 기준으로 잡힘
+#   측정 방법: benchmarks/bench_worker_pool.py
+# --------------------------------------------------------------------------- #
+if worker_pool.is_green_pool():
+    celery_app.conf.update(
+        worker_concurrency=worker_pool.worker_concurrency(),
+        worker_prefetch_multiplier=1,
+    )
+
+
+@worker_init.connect
+def _init_worker_pool(**_kwargs) -> None:
+    if not worker_pool.is_green_pool():
+        return
+    worker_pool.warn_if_unpatched()
+    worker_pool.patch_green_db_driver()
+    # CPU 작업(음성 디코딩‧분할)이나 별도 이벤트 루프 스레드는 허브를 막으므로 green 풀에 맞지 않음
+    if settings.CELERY_WORKER_QUEUE == QUEUE_TRANSCRIPTION:
+        logger.warning("transcription 큐는 prefork 풀 사용을 권장합니다 (음성 디코딩이 CPU 작업)")
+    if settings.GENERATION_ASYNC_PIPELINE or settings.GENERATION_SPECULATIVE_TOP_K > 0:
+        logger.warning(
+            "%s 풀에서는 asyncio 파이프라인‧추측 실행 대신 동기 단계별 체인을 사용하세요",
+            settings.CELERY_WORKER_POOL
+        )
+
+
+# --------------------------------------------------------------------------- #
+# OpenAI 연결 예열 (app.core.openai_clients)
+#   prefork: 자식 프로세스마다 (worker_max_tasks_per_child 로 교체될 때도) 첫 태스크 전에 TLS 연결
+#   그 밖의 풀: 태스크를 실행하는 워커 프로세스 자체에서 한 번
+# --------------------------------------------------------------------------- #
+@worker_process_init.connect
+def _warm_up_child_process(**_kwargs) -> None:
+    openai_clients.warm_up()
+
+
+@worker_init.connect
+def _warm_up_worker_process(**_kwargs) -> None:
+    # prefork 부모 프로세스에서 연 소켓은 자식에게 쓸모가 없으므로 건너뜀
+    if settings.CELERY_WORKER_POOL != "prefork":
+        openai_clients.warm_up()
+
+
+# NOTE: GENERATION_ASYNC_PIPELINE 사용 시 워커를 threads 풀로 실행해야
+#       한 프로세스에서 여러 생성 작업이 공용 이벤트 루프를 공유합니다.
+#       예) CELERY_WORKER_QUEUE=generation celery -A app.core.celery_app worker -P threads -c 32
+
 logger.info("Celery app initialized (broker: %s)", settings.CELERY_BROKER_URL)
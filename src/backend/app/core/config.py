@@ -14,6 +14,12 @@ from pathlib import Path
 from dotenv import load_dotenv
 
 
+def _parse_stage_map(value: str) -> dict[str, str]:
+    """"classify=3,extract=1" 형식의 환경변수를 dict 로 변환합니다."""
+    pairs = (item.split("=", 1) for item in value.split(",") if "=" in item)
+    return {key.strip(): val.strip() for key, val in pairs if key.strip()}
+
+
 class Settings:
     """
     프로젝트 전역 설정 모음.
@@ -46,6 +52,10 @@ class Settings:
         # ------------------------------------------------------------------ #
         self.DATABASE_URL: str = os.getenv("DATABASE_URL", "")
         self.SYNC_DATABASE_URL: str = os.getenv("SYNC_DATABASE_URL", "")
+        # 동기 엔진(Celery 워커) 연결 풀. prefork 풀에서는 프로세스당 태스크 하나이므로 무시하고 최소로 둠
+        self.SYNC_DB_POOL_SIZE: int = int(os.getenv("SYNC_DB_POOL_SIZE", 10))
+        self.SYNC_DB_MAX_OVERFLOW: int = int(os.getenv("SYNC_DB_MAX_OVERFLOW", 10))
+        self.SYNC_DB_POOL_TIMEOUT: float = float(os.getenv("SYNC_DB_POOL_TIMEOUT", 30))
 
         # ------------------------------------------------------------------ #
         # JWT / 보안
@@ -75,10 +85,28 @@ class Settings:
         )
         # 태스크 타임아웃 등 옵션이 필요하면 추가 선언
 
+        # 워커 풀 종류 (prefork / threads / gevent / eventlet). celery worker -P 옵션과 같게 지정
+        self.CELERY_WORKER_POOL: str = os.getenv("CELERY_WORKER_POOL", "prefork").lower()
+        # threads/gevent/eventlet 풀의 동시 실행 수 (DB‧OpenAI 연결 풀 크기 산정에도 사용)
+        self.CELERY_POOL_CONCURRENCY: int = int(os.getenv("CELERY_POOL_CONCURRENCY", 100))
+
+        # 워커가 담당할 큐 (transcription / classify / generation, 비우면 모든 큐)
+        # 지정하면 celery_app.WORKER_PROFILES 의 동시성‧prefetch 설정이 적용됨
+        self.CELERY_WORKER_QUEUE: str = os.getenv("CELERY_WORKER_QUEUE", "")
+        self.CELERY_TRANSCRIPTION_CONCURRENCY: int = int(
+            os.getenv("CELERY_TRANSCRIPTION_CONCURRENCY", 2)
+        )
+        self.CELERY_CLASSIFY_CONCURRENCY: int = int(os.getenv("CELERY_CLASSIFY_CONCURRENCY", 8))
+        self.CELERY_GENERATION_CONCURRENCY: int = int(os.getenv("CELERY_GENERATION_CONCURRENCY", 4))
+
         # ------------------------------------------------------------------ #
         # Redis (캐시‧세션 등)
         # ------------------------------------------------------------------ #
         self.REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379/1")
+        # 작업 취소 신호(pub/sub)와 함께 남기는 취소 플래그‧task id 기록의 유지 시간
+        self.CANCEL_SIGNAL_TTL_SECONDS: int = int(
+            os.getenv("CANCEL_SIGNAL_TTL_SECONDS", 60 * 60)
+        )
 
         # ------------------------------------------------------------------ #
         # OpenAI / Whisper
@@ -90,6 +118,177 @@ class Settings:
         self.OPENAI_MODEL: str = os.getenv("OPENAI_MODEL", "gpt-4")
         self.OPENAI_TIMEOUT: int = int(os.getenv("OPENAI_TIMEOUT", 60))
         self.OPENAI_TEMPERATURE: float = float(os.getenv("OPENAI_TEMPERATURE", 0.2))
+        # 클라이언트당 최대 HTTP 연결 수 (0: 워커 동시성 × 태스크당 동시 요청 수로 자동 산정)
+        self.OPENAI_MAX_CONNECTIONS: int = int(os.getenv("OPENAI_MAX_CONNECTIONS", 0))
+        # HTTP/2 사용 (h2 패키지가 설치된 경우에만, 없으면 HTTP/1.1)
+        self.OPENAI_HTTP2: bool = os.getenv(
+            "OPENAI_HTTP2", "true"
+        ).lower() in {"1", "true", "yes"}
+        # 쉬는 연결을 닫기까지의 시간 (태스크 사이 간격보다 길게 잡아 TLS 재협상을 피함)
+        self.OPENAI_KEEPALIVE_EXPIRY_SECONDS: float = float(
+            os.getenv("OPENAI_KEEPALIVE_EXPIRY_SECONDS", 60)
+        )
+        # 워커 (자식) 프로세스 시작 시 미리 열어 둘 연결 수 (0 이면 예열 안 함)
+        self.OPENAI_WARMUP_CONNECTIONS: int = int(os.getenv("OPENAI_WARMUP_CONNECTIONS", 1))
+        # 연결 오류‧5xx 재시도 횟수 (429 는 LLM_RATE_LIMIT_MAX_RETRIES)
+        self.OPENAI_MAX_RETRIES: int = int(os.getenv("OPENAI_MAX_RETRIES", 2))
+        # 재시도 백오프 (full jitter: 0 ~ min(MAX, BASE × 2^n) 사이 임의 대기)
+        self.LLM_RETRY_BASE_SECONDS: float = float(os.getenv("LLM_RETRY_BASE_SECONDS", 0.5))
+        self.LLM_RETRY_MAX_SECONDS: float = float(os.getenv("LLM_RETRY_MAX_SECONDS", 8))
+        # 생성 단계별 GPT 호출 예산 ("단계=값" 쉼표 구분, 단계: classify / classify_extract / extract / annotate)
+        # - 재시도 횟수: 지정하지 않은 단계는 OPENAI_MAX_RETRIES
+        # - 헤지 요청: 응답이 이 시간(초) 안에 오지 않으면 같은 요청을 하나 더 보내 먼저 온 응답 사용
+        #   (지정하지 않거나 0 이면 헤지 없음, 기본값은 모든 단계 헤지 없음. 예: "classify=3")
+        self.LLM_STAGE_RETRIES: dict[str, int] = {
+            stage: int(value) for stage, value in _parse_stage_map(
+                os.getenv("LLM_STAGE_RETRIES", "classify=3,classify_extract=1,extract=1,annotate=2")
+            ).items()
+        }
+        self.LLM_STAGE_HEDGE_AFTER_SECONDS: dict[str, float] = {
+            stage: float(value) for stage, value in _parse_stage_map(
+                os.getenv("LLM_STAGE_HEDGE_AFTER_SECONDS", "")
+            ).items()
+        }
+
+        # 워커 공용 레이트 리미터 (Redis 토큰 버킷, 모델별 분당 요청 수‧토큰 수)
+        # 기본값은 꺼짐. 켤 때는 한도를 OpenAI 계정 등급에 맞게 지정 (0 이면 해당 한도 미적용)
+        self.LLM_RATE_LIMIT_ENABLED: bool = os.getenv(
+            "LLM_RATE_LIMIT_ENABLED", "false"
+        ).lower() in {"1", "true", "yes"}
+        self.OPENAI_RPM_LIMIT: int = int(os.getenv("OPENAI_RPM_LIMIT", 0))
+        self.OPENAI_TPM_LIMIT: int = int(os.getenv("OPENAI_TPM_LIMIT", 0))
+        self.WHISPER_RPM_LIMIT: int = int(os.getenv("WHISPER_RPM_LIMIT", 0))
+        # 요청 전 TPM 버킷에서 차감할 응답 토큰 추정치 (프롬프트 토큰은 직접 계산)
+        self.LLM_RATE_LIMIT_COMPLETION_TOKENS: int = int(
+            os.getenv("LLM_RATE_LIMIT_COMPLETION_TOKENS", 1000)
+        )
+        # 버킷 대기 상한 (넘으면 호출 실패), 429 재시도 횟수, Retry-After 가 없을 때 백오프 상한
+        self.LLM_RATE_LIMIT_MAX_WAIT_SECONDS: float = float(
+            os.getenv("LLM_RATE_LIMIT_MAX_WAIT_SECONDS", 120)
+        )
+        self.LLM_RATE_LIMIT_MAX_RETRIES: int = int(os.getenv("LLM_RATE_LIMIT_MAX_RETRIES", 5))
+        self.LLM_RATE_LIMIT_BACKOFF_MAX_SECONDS: float = float(
+            os.getenv("LLM_RATE_LIMIT_BACKOFF_MAX_SECONDS", 30)
+        )
+
+        # GPT 응답 캐시 (Redis 우선, 연결 불가 시 디스크)
+        self.LLM_CACHE_ENABLED: bool = os.getenv(
+            "LLM_CACHE_ENABLED", "true"
+        ).lower() in {"1", "true", "yes"}
+        self.LLM_CACHE_TTL_SECONDS: int = int(
+            os.getenv("LLM_CACHE_TTL_SECONDS", 7 * 24 * 60 * 60)  # 기본 7일
+        )
+        self.LLM_CACHE_MAX_ENTRIES: int = int(os.getenv("LLM_CACHE_MAX_ENTRIES", 10000))
+        self.LLM_CACHE_DIR: str = os.getenv("LLM_CACHE_DIR", "cache/llm")
+
+        # 스트리밍 응답: 조각마다 검증해 무효 출력은 조기 중단, 조각 사이에서 작업 취소 확인
+        # (취소 확인은 취소 신호 구독 결과를 보는 것이라 DB 조회가 없으므로 짧은 간격으로 둠)
+        self.LLM_STREAMING_ENABLED: bool = os.getenv(
+            "LLM_STREAMING_ENABLED", "true"
+        ).lower() in {"1", "true", "yes"}
+        self.LLM_STREAM_CANCEL_CHECK_SECONDS: float = float(
+            os.getenv("LLM_STREAM_CANCEL_CHECK_SECONDS", 0.1)
+        )
+        # 필드 추출 응답에서 스키마에 없거나 순서가 어긋난 키가 이 개수를 넘으면 중단
+        self.LLM_STREAM_MAX_KEY_DIVERGENCE: int = int(
+            os.getenv("LLM_STREAM_MAX_KEY_DIVERGENCE", 5)
+        )
+
+        # 유사 대화 계약 유형 캐시 (MinHash, Redis 색인을 모든 워커가 공유)
+        # 유사도만으로 다른 대화의 계약 유형을 GPT 없이 재사용하므로 기본 비활성화 (같은 양식을 반복 낭독하는 환경에서만 켬)
+        self.TYPE_CACHE_ENABLED: bool = os.getenv(
+            "TYPE_CACHE_ENABLED", "false"
+        ).lower() in {"1", "true", "yes"}
+        self.TYPE_CACHE_THRESHOLD: float = float(os.getenv("TYPE_CACHE_THRESHOLD", 0.85))
+        self.TYPE_CACHE_MAX_ENTRIES: int = int(os.getenv("TYPE_CACHE_MAX_ENTRIES", 5000))
+        self.TYPE_CACHE_MIN_TOKENS: int = int(os.getenv("TYPE_CACHE_MIN_TOKENS", 30))
+
+        # 공란 제안 캐시 (Redis, 모든 워커 공유): 자주 비는 (계약 유형, 필드 경로)는 저장된 일반 제안을 쓰고 GPT 요청에서 제외
+        self.SUGGESTION_CACHE_ENABLED: bool = os.getenv(
+            "SUGGESTION_CACHE_ENABLED", "true"
+        ).lower() in {"1", "true", "yes"}
+        # 이 횟수 이상 공란이었던 필드부터 캐시된 제안 사용
+        self.SUGGESTION_CACHE_MIN_COUNT: int = int(os.getenv("SUGGESTION_CACHE_MIN_COUNT", 3))
+        self.SUGGESTION_CACHE_MAX_ENTRIES: int = int(os.getenv("SUGGESTION_CACHE_MAX_ENTRIES", 2000))
+
+        # 공란 제안 라이브러리: 오프라인 구축 JSON (python -m app.prompts.suggestion_library)
+        self.SUGGESTION_LIBRARY_ENABLED: bool = os.getenv(
+            "SUGGESTION_LIBRARY_ENABLED", "true"
+        ).lower() in {"1", "true", "yes"}
+        self.SUGGESTION_LIBRARY_PATH: str = os.getenv(
+            "SUGGESTION_LIBRARY_PATH", "cache/suggestion_library.json"
+        )
+        # 검토 스키마 문장을 라이브러리 기본값으로 사용 (켜면 스키마에 있는 모든 필드가 라이브러리로 채워져 GPT 제안을 쓰지 않음)
+        self.SUGGESTION_LIBRARY_SCHEMA_SEED: bool = os.getenv(
+            "SUGGESTION_LIBRARY_SCHEMA_SEED", "false"
+        ).lower() in {"1", "true", "yes"}
+        # 라이브러리에 없는 공란 필드만 GPT 로 제안 작성 (끄면 공란 제안 GPT 호출 없음)
+        self.SUGGESTION_LLM_REFINEMENT: bool = os.getenv(
+            "SUGGESTION_LLM_REFINEMENT", "true"
+        ).lower() in {"1", "true", "yes"}
+
+        # 프롬프트 토큰 예산: 대화 텍스트가 예산을 넘으면 핵심 문장만 남겨 압축
+        # 압축은 대화 일부를 버리므로 기본 비활성화. 컨텍스트가 작은 모델을 쓸 때만 켜고 예산을 모델에 맞춤
+        self.PROMPT_BUDGET_ENABLED: bool = os.getenv(
+            "PROMPT_BUDGET_ENABLED", "false"
+        ).lower() in {"1", "true", "yes"}
+        # gpt-4(8k) 기준: 지시문·키워드 설명·JSON 출력 분량을 빼고 남는 대화 텍스트 몫
+        self.PROMPT_TRANSCRIPT_TOKEN_BUDGET: int = int(
+            os.getenv("PROMPT_TRANSCRIPT_TOKEN_BUDGET", 4000)
+        )
+
+        # ------------------------------------------------------------------ #
+        # 계약서 생성 파이프라인
+        # ------------------------------------------------------------------ #
+        # True면 asyncio 기반 파이프라인 태스크(process_generation_pipeline_async)로 등록
+        self.GENERATION_ASYNC_PIPELINE: bool = os.getenv(
+            "GENERATION_ASYNC_PIPELINE", "false"
+        ).lower() in {"1", "true", "yes"}
+        # 추측 실행: 분류와 동시에 상위 k개 후보 유형의 필드 추출을 시작 (0이면 비활성화)
+        self.GENERATION_SPECULATIVE_TOP_K: int = int(
+            os.getenv("GENERATION_SPECULATIVE_TOP_K", 0)
+        )
+        # 추측 실행 비용 상한: 후보 추출 프롬프트 길이(문자 수) 합계
+        self.GENERATION_SPECULATIVE_MAX_PROMPT_CHARS: int = int(
+            os.getenv("GENERATION_SPECULATIVE_MAX_PROMPT_CHARS", 40000)
+        )
+        # GPT 응답의 필드가 일부 빠졌을 때 공란으로 채워 사용할 최소 비율 (스키마 키 중 응답에 있는 키의 비율)
+        self.GENERATION_SCHEMA_FILL_MIN_RATIO: float = float(
+            os.getenv("GENERATION_SCHEMA_FILL_MIN_RATIO", 0.5)
+        )
+        # 필드 추출 샤딩: 스키마 최상위 항목을 필드 수가 고르게 최대 N 묶음으로 나눠 동시에 추출 후 병합
+        # (응답 길이가 가장 긴 묶음만큼만 기다림, 0/1 이면 한 번에 추출)
+        self.GENERATION_EXTRACTION_SHARDS: int = int(os.getenv("GENERATION_EXTRACTION_SHARDS", 0))
+        # 말단 필드가 이보다 적은 스키마는 나누지 않음 (요청 수만 늘고 지연 이득이 작음)
+        self.GENERATION_SHARD_MIN_FIELDS: int = int(os.getenv("GENERATION_SHARD_MIN_FIELDS", 24))
+        # 유형 판단 + 필드 추출을 Structured Outputs 한 번의 호출로 처리 (추측 실행보다 우선)
+        self.GENERATION_COMBINED_EXTRACTION: bool = os.getenv(
+            "GENERATION_COMBINED_EXTRACTION", "false"
+        ).lower() in {"1", "true", "yes"}
+        # json_schema 응답 형식을 지원하는 모델이어야 함
+        self.GENERATION_COMBINED_MODEL: str = os.getenv(
+            "GENERATION_COMBINED_MODEL", "gpt-4o-2024-08-06"
+        )
+        # 배치 모드: 급하지 않은 생성 요청(POST /contracts/generate?batch=true)을 모아
+        # 단계별 Batch API 작업(JSONL)으로 제출 (비용 절반, 완료까지 최대 COMPLETION_WINDOW)
+        self.GENERATION_BATCH_ENABLED: bool = os.getenv(
+            "GENERATION_BATCH_ENABLED", "false"
+        ).lower() in {"1", "true", "yes"}
+        # openai: OpenAI Batch API / local: 로컬 대역 (입력 JSONL 을 일반 API 로 바로 처리, 개발‧테스트용)
+        self.GENERATION_BATCH_BACKEND: str = os.getenv("GENERATION_BATCH_BACKEND", "openai")
+        self.GENERATION_BATCH_LOCAL_DIR: str = os.getenv("GENERATION_BATCH_LOCAL_DIR", "cache/batches")
+        self.GENERATION_BATCH_COMPLETION_WINDOW: str = os.getenv(
+            "GENERATION_BATCH_COMPLETION_WINDOW", "24h"
+        )
+        # 배치 작업 하나에 담을 최대 요청 수
+        self.GENERATION_BATCH_MAX_REQUESTS: int = int(os.getenv("GENERATION_BATCH_MAX_REQUESTS", 500))
+        # 대기 요청 제출 / 진행 중인 배치 작업 확인 주기 (Celery beat)
+        self.GENERATION_BATCH_SUBMIT_INTERVAL_SECONDS: int = int(
+            os.getenv("GENERATION_BATCH_SUBMIT_INTERVAL_SECONDS", 300)
+        )
+        self.GENERATION_BATCH_POLL_INTERVAL_SECONDS: int = int(
+            os.getenv("GENERATION_BATCH_POLL_INTERVAL_SECONDS", 60)
+        )
 
         # ------------------------------------------------------------------ #
         # 파일 업로드 경로
@@ -102,6 +301,14 @@ class Settings:
         Path(self.AUDIO_UPLOAD_DIR).mkdir(parents=True, exist_ok=True)
         Path(self.TEXT_UPLOAD_DIR).mkdir(parents=True, exist_ok=True)
 
+        # 대화 텍스트 저장소 (app.core.transcript_store): local / postgres / s3
+        #   API 서버와 워커가 디스크를 공유하지 않으면 postgres 또는 s3 사용
+        self.TRANSCRIPT_STORE_BACKEND: str = os.getenv("TRANSCRIPT_STORE_BACKEND", "local")
+        self.TRANSCRIPT_S3_BUCKET: str = os.getenv("TRANSCRIPT_S3_BUCKET", "")
+        self.TRANSCRIPT_S3_PREFIX: str = os.getenv("TRANSCRIPT_S3_PREFIX", "transcripts/")
+        # S3 호환 저장소 주소 (MinIO 등 로컬 대역, 비우면 AWS S3)
+        self.TRANSCRIPT_S3_ENDPOINT_URL: str = os.getenv("TRANSCRIPT_S3_ENDPOINT_URL", "")
+
         # ------------------------------------------------------------------ #
         # 음성파일 형식 및 크기 제한
         # ------------------------------------------------------------------ #
@@ -114,12 +321,29 @@ class Settings:
         )
 
         # ------------------------------------------------------------------ #
-        # nltk 리소스 경로
+        # Whisper 분할 변환 (긴 녹음을 무음 경계로 나눠 병렬 변환)
         # ------------------------------------------------------------------ #
-        self.NLTK_DATA_PATH: str = os.getenv("NLTK_DATA_PATH", "nltk_data")
+        self.STT_CHUNKING_ENABLED: bool = os.getenv(
+            "STT_CHUNKING_ENABLED", "true"
+        ).lower() in {"1", "true", "yes"}
+        # 16kHz mono 16bit WAV 기준 600초 ≒ 19MB (Whisper 요청당 25MiB 제한 이내)
+        self.STT_CHUNK_MAX_SECONDS: int = int(os.getenv("STT_CHUNK_MAX_SECONDS", 600))
+        self.STT_CHUNK_MIN_SILENCE_MS: int = int(os.getenv("STT_CHUNK_MIN_SILENCE_MS", 400))
+        self.STT_SILENCE_THRESHOLD_DBFS: float = float(
+            os.getenv("STT_SILENCE_THRESHOLD_DBFS", -40)
+        )
+        self.STT_CHUNK_OVERLAP_SECONDS: float = float(
+            os.getenv("STT_CHUNK_OVERLAP_SECONDS", 1.0)
+        )
+        self.STT_MAX_CONCURRENCY: int = int(os.getenv("STT_MAX_CONCURRENCY", 4))
 
-        # 디렉터리 자동 생성(없으면)
-        Path(self.NLTK_DATA_PATH).mkdir(parents=True, exist_ok=True)
+        # ------------------------------------------------------------------ #
+        # 대화 텍스트 불용어 제거 (app.prompts.stopword_filter)
+        # ------------------------------------------------------------------ #
+        # "예를 들면" 같은 여러 토큰 담화 표지도 제거 (선별 목록만, 기본은 단일 토큰 불용어만 제거)
+        self.STOPWORD_MULTI_TOKEN_ENABLED: bool = os.getenv(
+            "STOPWORD_MULTI_TOKEN_ENABLED", "false"
+        ).lower() in {"1", "true", "yes"}
 
         # ------------------------------------------------------------------ #
         # SendGrid (이메일로 비밀번호 찾기 기능 관련)
@@ -2,25 +2,51 @@ from __future__ import annotations
 from app.core.logger import logging
 logger = logging.getLogger(__name__)
 
+import asyncio
+import copy
 import logging
-from typing import List, Dict
-from openai import OpenAI
+import threading
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Protocol
 
 from app.core.config import settings
+from app.core.llm_cache import make_cache_key, response_cache
+from app.core.llm_policy import StagePolicy, arun_hedged, run_hedged, stage_policy
+from app.core.metrics import get_counter, increment
+from app.core.openai_clients import async_chat_client, chat_client
+from app.core.rate_limiter import asend_rate_limited, chat_limiter, send_rate_limited
+from app.prompts.token_budget import count_tokens
 
 
 class GPTCallError(Exception):
     """GPT 호출 실패 시 발생하는 예외."""
 
-# 전역 싱글턴 클라이언트
-_client = OpenAI(
-    api_key=settings.OPENAI_API_KEY,
-    base_url=settings.OPENAI_API_BASE,
-    timeout=settings.OPENAI_TIMEOUT,
-)
 
+class GPTStreamAborted(GPTCallError):
+    """스트리밍 응답이 검증기에 의해 중간에 무효로 판정되어 중단된 경우."""
 
-def call_gpt_api(messages: List[Dict[str, str]]) -> str:
+
+class GPTCallCancelled(GPTCallError):
+    """스트리밍 도중 작업 취소가 확인되어 중단된 경우."""
+
+
+class StreamValidationError(ValueError):
+    """스트림 검증기가 응답을 더 받을 필요 없이 무효라고 판단할 때 발생시키는 예외."""
+
+
+class StreamValidator(Protocol):
+    """스트리밍 응답 조각을 순서대로 받아 무효이면 StreamValidationError 를 발생시킵니다."""
+
+    def feed(self, delta: str) -> None: ...
+
+
+def call_gpt_api(
+    messages: List[Dict[str, str]],
+    *,
+    model: Optional[str] = None,
+    response_format: Optional[dict] = None,
+    stage: Optional[str] = None,
+) -> str:
     """
     OpenAI Chat Completion API를 호출하여 응답 메시지 content를 반환합니다.
 
@@ -28,6 +54,12 @@ def call_gpt_api(messages: List[Dict[str, str]]) -> str:
     ----------
     messages : list[dict[str, str]]
         OpenAI Chat 형식의 message 목록 (role, content).
+    model : str, optional
+        사용할 모델. 생략하면 settings.OPENAI_MODEL.
+    response_format : dict, optional
+        Structured Outputs 등 응답 형식 지정 (``{"type": "json_schema", ...}``).
+    stage : str, optional
+        생성 파이프라인 단계 이름. 단계별 재시도 횟수‧헤지 지연(app.core.llm_policy)을 정합니다.
 
     Returns
     -------
@@ -38,20 +70,409 @@ def call_gpt_api(messages: List[Dict[str, str]]) -> str:
     ------
     GPTCallError
         API 호출 오류, 파싱 오류 등 모든 실패 상황.
+
+    Notes
+    -----
+    LLM_CACHE_ENABLED 인 경우 동일한 (model, temperature, messages, response_format) 요청은
+    캐시된 응답을 반환하고 API를 호출하지 않습니다.
+    """
+    cache_key = _cache_key(messages, model, response_format)
+    if response_cache is not None:
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            logger.debug("GPT 응답 캐시 적중: key=%s", cache_key[:12])
+            return cached
+
+    request = _build_request(messages, model, response_format)
+    policy = stage_policy(stage)
+    logger.debug("GPT 요청 시작: model=%s, 메시지 길이=%d", request["model"], len(messages))
+
+    def attempt(index: int, lost: threading.Event) -> str:
+        try:
+            response = _create(request, policy.retries)
+            logger.debug("GPT 응답 수신 완료")
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.exception("GPT 호출 중 오류 발생: %s", exc)
+            raise GPTCallError("Failed to call GPT API") from exc
+        _record_usage(response)
+        return _extract_content(response)
+
+    content = run_hedged(attempt, policy.hedge_after, stage)
+    if response_cache is not None:
+        response_cache.set(cache_key, content)
+    return content
+
+
+async def acall_gpt_api(
+    messages: List[Dict[str, str]],
+    *,
+    model: Optional[str] = None,
+    response_format: Optional[dict] = None,
+    stage: Optional[str] = None,
+) -> str:
+    """
+    ``call_gpt_api`` 의 비동기 버전. ``AsyncOpenAI`` 클라이언트를 사용하므로
+    응답을 기다리는 동안 같은 이벤트 루프의 다른 생성 작업이 진행됩니다.
+
+    Raises
+    ------
+    GPTCallError
+        API 호출 오류, 파싱 오류 등 모든 실패 상황.
+    """
+    cache_key = _cache_key(messages, model, response_format)
+    if response_cache is not None:
+        cached = await asyncio.to_thread(response_cache.get, cache_key)
+        if cached is not None:
+            logger.debug("GPT 응답 캐시 적중: key=%s", cache_key[:12])
+            return cached
+
+    request = _build_request(messages, model, response_format)
+    policy = stage_policy(stage)
+    logger.debug("GPT 비동기 요청 시작: model=%s, 메시지 길이=%d", request["model"], len(messages))
+
+    async def attempt(index: int) -> str:
+        try:
+            response = await _acreate(request, policy.retries)
+            logger.debug("GPT 비동기 응답 수신 완료")
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.exception("GPT 비동기 호출 중 오류 발생: %s", exc)
+            raise GPTCallError("Failed to call GPT API") from exc
+        _record_usage(response)
+        return _extract_content(response)
+
+    content = await arun_hedged(attempt, policy.hedge_after, stage)
+    if response_cache is not None:
+        await asyncio.to_thread(response_cache.set, cache_key, content)
+    return content
+
+
+def stream_gpt_api(
+    messages: List[Dict[str, str]],
+    *,
+    validator: Optional[StreamValidator] = None,
+    is_cancelled: Optional[Callable[[], bool]] = None,
+    model: Optional[str] = None,
+    response_format: Optional[dict] = None,
+    stage: Optional[str] = None,
+) -> str:
+    """
+    ``call_gpt_api`` 의 스트리밍 버전. 응답 조각이 도착할 때마다 검사해 조기에 중단합니다.
+
+    Parameters
+    ----------
+    validator : StreamValidator, optional
+        응답 조각을 받아 명백히 무효인 출력이면 StreamValidationError 를 발생시키는 검증기.
+        호출마다 새 객체를 넘겨야 합니다(내부 상태를 가짐). 헤지 요청에는 복사본을 사용합니다.
+    is_cancelled : callable, optional
+        작업 취소 여부 확인 함수. 최대 LLM_STREAM_CANCEL_CHECK_SECONDS 간격으로 조각 사이에서 호출합니다.
+    stage : str, optional
+        생성 파이프라인 단계 이름 (재시도‧헤지 예산).
+
+    Raises
+    ------
+    GPTStreamAborted
+        검증기가 응답을 무효로 판정해 스트림을 닫은 경우.
+    GPTCallCancelled
+        스트리밍 도중 작업 취소가 확인된 경우.
+    GPTCallError
+        그 밖의 API 호출 오류.
+    """
+    cache_key = _cache_key(messages, model, response_format)
+    if response_cache is not None:
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            logger.debug("GPT 응답 캐시 적중: key=%s", cache_key[:12])
+            return cached
+
+    request = _build_stream_request(messages, model, response_format)
+    policy = stage_policy(stage)
+    validators = _attempt_validators(validator, policy)
+    logger.debug("GPT 스트리밍 요청 시작: model=%s, 메시지 길이=%d", request["model"], len(messages))
+
+    def attempt(index: int, lost: threading.Event) -> str:
+        return _stream_once(request, policy.retries, validators[index], is_cancelled, lost)
+
+    content = run_hedged(attempt, policy.hedge_after, stage)
+    if response_cache is not None:
+        response_cache.set(cache_key, content)
+    return content
+
+
+async def astream_gpt_api(
+    messages: List[Dict[str, str]],
+    *,
+    validator: Optional[StreamValidator] = None,
+    is_cancelled: Optional[Callable[[], Awaitable[bool]]] = None,
+    model: Optional[str] = None,
+    response_format: Optional[dict] = None,
+    stage: Optional[str] = None,
+) -> str:
+    """``stream_gpt_api`` 의 비동기 버전. ``is_cancelled`` 는 코루틴 함수입니다."""
+    cache_key = _cache_key(messages, model, response_format)
+    if response_cache is not None:
+        cached = await asyncio.to_thread(response_cache.get, cache_key)
+        if cached is not None:
+            logger.debug("GPT 응답 캐시 적중: key=%s", cache_key[:12])
+            return cached
+
+    request = _build_stream_request(messages, model, response_format)
+    policy = stage_policy(stage)
+    validators = _attempt_validators(validator, policy)
+    logger.debug("GPT 비동기 스트리밍 요청 시작: model=%s, 메시지 길이=%d", request["model"], len(messages))
+
+    async def attempt(index: int) -> str:
+        return await _astream_once(request, policy.retries, validators[index], is_cancelled)
+
+    content = await arun_hedged(attempt, policy.hedge_after, stage)
+    if response_cache is not None:
+        await asyncio.to_thread(response_cache.set, cache_key, content)
+    return content
+
+
+def discard_cached_response(
+    messages: List[Dict[str, str]],
+    *,
+    model: Optional[str] = None,
+    response_format: Optional[dict] = None,
+) -> None:
     """
-    logger.debug("GPT 요청 시작. 메시지 길이=%d", settings.OPENAI_MODEL, len(messages))
+    캐시된 응답을 삭제합니다.
 
+    응답이 파싱·검증에 실패한 경우 호출하여, 재시도 시 같은 잘못된 응답이
+    캐시에서 반복 반환되지 않도록 합니다.
+    """
+    if response_cache is not None:
+        response_cache.delete(_cache_key(messages, model, response_format))
+
+
+class _HedgeLost(GPTCallError):
+    """헤지 요청 중 다른 쪽이 먼저 응답해 이 스트림을 끊는 경우 (호출자에게 전달되지 않음)."""
+
+
+def _stream_once(
+    request: dict,
+    retries: int,
+    validator: Optional[StreamValidator],
+    is_cancelled: Optional[Callable[[], bool]],
+    lost: threading.Event,
+) -> str:
     try:
-        response = _client.chat.completions.create(
-            model=settings.OPENAI_MODEL,
-            messages=messages,
-            temperature=settings.OPENAI_TEMPERATURE,
-        )
-        logger.debug("GPT 응답 수신 완료")
+        stream = _create(request, retries)
     except Exception as exc:  # pylint: disable=broad-except
         logger.exception("GPT 호출 중 오류 발생: %s", exc)
         raise GPTCallError("Failed to call GPT API") from exc
 
+    parts: List[str] = []
+    next_check = time.monotonic() + settings.LLM_STREAM_CANCEL_CHECK_SECONDS
+    try:
+        for chunk in stream:
+            delta = _consume_chunk(chunk, parts, validator)
+            if lost.is_set():
+                raise _HedgeLost("hedged request lost")
+            if is_cancelled is not None and delta and time.monotonic() >= next_check:
+                next_check = time.monotonic() + settings.LLM_STREAM_CANCEL_CHECK_SECONDS
+                if is_cancelled():
+                    raise GPTCallCancelled("Generation cancelled during streaming")
+    except StreamValidationError as exc:
+        _log_abort(exc, parts)
+        raise GPTStreamAborted(str(exc)) from exc
+    except _HedgeLost:
+        raise
+    except GPTCallCancelled:
+        increment("llm_stream_cancelled")
+        logger.info("GPT 스트리밍 중 작업 취소 확인, 요청 중단 (수신 %d자)", sum(map(len, parts)))
+        raise
+    except Exception as exc:  # pylint: disable=broad-except
+        logger.exception("GPT 스트리밍 수신 중 오류 발생: %s", exc)
+        raise GPTCallError("Failed to stream GPT API response") from exc
+    finally:
+        stream.close()  # 중단 시 연결을 끊어 남은 토큰 생성을 멈춤
+
+    return _join_stream(parts)
+
+
+async def _astream_once(
+    request: dict,
+    retries: int,
+    validator: Optional[StreamValidator],
+    is_cancelled: Optional[Callable[[], Awaitable[bool]]],
+) -> str:
+    try:
+        stream = await _acreate(request, retries)
+    except Exception as exc:  # pylint: disable=broad-except
+        logger.exception("GPT 비동기 호출 중 오류 발생: %s", exc)
+        raise GPTCallError("Failed to call GPT API") from exc
+
+    parts: List[str] = []
+    next_check = time.monotonic() + settings.LLM_STREAM_CANCEL_CHECK_SECONDS
+    try:
+        async for chunk in stream:
+            delta = _consume_chunk(chunk, parts, validator)
+            if is_cancelled is not None and delta and time.monotonic() >= next_check:
+                next_check = time.monotonic() + settings.LLM_STREAM_CANCEL_CHECK_SECONDS
+                if await is_cancelled():
+                    raise GPTCallCancelled("Generation cancelled during streaming")
+    except StreamValidationError as exc:
+        _log_abort(exc, parts)
+        raise GPTStreamAborted(str(exc)) from exc
+    except GPTCallCancelled:
+        increment("llm_stream_cancelled")
+        logger.info("GPT 스트리밍 중 작업 취소 확인, 요청 중단 (수신 %d자)", sum(map(len, parts)))
+        raise
+    except Exception as exc:  # pylint: disable=broad-except
+        logger.exception("GPT 비동기 스트리밍 수신 중 오류 발생: %s", exc)
+        raise GPTCallError("Failed to stream GPT API response") from exc
+    finally:
+        await stream.close()
+
+    return _join_stream(parts)
+
+
+def _attempt_validators(
+    validator: Optional[StreamValidator], policy: StagePolicy
+) -> List[Optional[StreamValidator]]:
+    """[원 요청용, 헤지 요청용] 검증기. 검증기는 상태를 가지므로 헤지 요청에는 사용 전 복사본을 씀."""
+    if validator is None or policy.hedge_after <= 0:
+        return [validator, validator]
+    return [validator, copy.deepcopy(validator)]
+
+
+def build_chat_request(
+    messages: List[Dict[str, str]],
+    *,
+    model: Optional[str] = None,
+    response_format: Optional[dict] = None,
+) -> dict:
+    """``call_gpt_api`` 가 보내는 것과 같은 Chat Completions 요청 본문 (Batch API 입력 줄의 body)."""
+    return _build_request(messages, model, response_format)
+
+
+def _create(request: dict, max_retries: Optional[int] = None):
+    """레이트 리미터를 거쳐 Chat Completions 요청을 보냅니다 (스트리밍 요청이면 Stream 반환)."""
+    limiter = chat_limiter(request["model"])
+    raw = send_rate_limited(
+        limiter,
+        lambda: chat_client().chat.completions.with_raw_response.create(**request),
+        tokens=_estimate_tokens(request) if limiter is not None else 0,
+        max_retries=max_retries,
+    )
+    return raw.parse()
+
+
+async def _acreate(request: dict, max_retries: Optional[int] = None):
+    limiter = chat_limiter(request["model"])
+    raw = await asend_rate_limited(
+        limiter,
+        lambda: async_chat_client().chat.completions.with_raw_response.create(**request),
+        tokens=_estimate_tokens(request) if limiter is not None else 0,
+        max_retries=max_retries,
+    )
+    return raw.parse()  # with_raw_response 의 parse 는 비동기 클라이언트에서도 동기
+
+
+def _estimate_tokens(request: dict) -> int:
+    """TPM 버킷 차감량: 프롬프트 토큰 수 + 응답 토큰 추정치."""
+    prompt_tokens = sum(count_tokens(m.get("content", "")) for m in request["messages"])
+    return prompt_tokens + settings.LLM_RATE_LIMIT_COMPLETION_TOKENS
+
+
+def _build_request(
+    messages: List[Dict[str, str]],
+    model: Optional[str],
+    response_format: Optional[dict],
+) -> dict:
+    request = {
+        "model": model or settings.OPENAI_MODEL,
+        "messages": messages,
+        "temperature": settings.OPENAI_TEMPERATURE,
+    }
+    if response_format is not None:
+        request["response_format"] = response_format
+    return request
+
+
+def _build_stream_request(
+    messages: List[Dict[str, str]],
+    model: Optional[str],
+    response_format: Optional[dict],
+) -> dict:
+    request = _build_request(messages, model, response_format)
+    request["stream"] = True
+    request["stream_options"] = {"include_usage": True}  # 마지막 조각에 usage 포함
+    return request
+
+
+def _consume_chunk(chunk, parts: List[str], validator: Optional[StreamValidator]) -> Optional[str]:
+    """스트림 조각 하나를 처리하고 새로 받은 content 조각을 반환합니다."""
+    if getattr(chunk, "usage", None) is not None:
+        _record_usage(chunk)
+    if not chunk.choices:
+        return None
+    delta = chunk.choices[0].delta.content
+    if delta:
+        parts.append(delta)
+        if validator is not None:
+            validator.feed(delta)
+    return delta
+
+
+def _join_stream(parts: List[str]) -> str:
+    content = "".join(parts).strip()
+    if not content:
+        logger.error("GPT 스트리밍 응답이 비어 있음")
+        raise GPTCallError("Empty response from GPT API")
+    return content
+
+
+def _log_abort(exc: StreamValidationError, parts: List[str]) -> None:
+    increment("llm_stream_aborted")
+    logger.warning(
+        "GPT 스트리밍 응답 조기 중단: %s (수신 %d자: %.80r)", exc, sum(map(len, parts)), "".join(parts)
+    )
+
+
+def _cache_key(
+    messages: List[Dict[str, str]],
+    model: Optional[str] = None,
+    response_format: Optional[dict] = None,
+) -> str:
+    return make_cache_key(
+        model or settings.OPENAI_MODEL, settings.OPENAI_TEMPERATURE, messages, response_format
+    )
+
+
+def log_token_usage() -> None:
+    """프로세스 누적 프롬프트 토큰 중 공급자 측 프롬프트 캐시 적중 비율을 로그에 남깁니다."""
+    prompt_tokens = get_counter("llm_prompt_tokens")
+    if not prompt_tokens:
+        return
+    cached_tokens = get_counter("llm_prompt_cached_tokens")
+    logger.info(
+        "GPT 토큰 사용량: prompt=%d (cached=%d, uncached=%d, 적중률 %.1f%%), completion=%d",
+        prompt_tokens,
+        cached_tokens,
+        prompt_tokens - cached_tokens,
+        100.0 * cached_tokens / prompt_tokens,
+        get_counter("llm_completion_tokens"),
+    )
+
+
+def _record_usage(response) -> None:
+    """응답의 usage 필드에서 프롬프트(캐시 적중/미적중)·완성 토큰 수를 집계합니다."""
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return
+    prompt_tokens = usage.prompt_tokens or 0
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached_tokens = (getattr(details, "cached_tokens", None) or 0) if details else 0
+    increment("llm_prompt_tokens", prompt_tokens)
+    increment("llm_prompt_cached_tokens", cached_tokens)
+    increment("llm_completion_tokens", usage.completion_tokens or 0)
+    logger.debug("GPT 프롬프트 토큰: 전체=%d, 캐시 적중=%d", prompt_tokens, cached_tokens)
+
+
+def _extract_content(response) -> str:
+    """Chat Completion 응답에서 첫 번째 choice의 content를 꺼냅니다."""
     try:
         return response.choices[0].message.content.strip()  # type: ignore[attr-defined]
     except (AttributeError, IndexError, KeyError) as exc:
@@ -0,0 +1,222 @@
+"""app/core/llm_cache.py
+====================================
+
+GPT 응답 캐시 모듈
+-----------------
+* 키: (model, temperature, messages[, response_format])를 정규화한 JSON의 SHA-256
+* 저장소: Redis(settings.REDIS_URL) 우선, 연결 실패 시 디스크(LLM_CACHE_DIR)로 대체
+* 만료: TTL + 최대 개수 초과 시 가장 오래 사용되지 않은 항목부터 제거(LRU)
+* 적중/실패 횟수는 app.core.metrics 카운터(llm_cache_hit / llm_cache_miss)로 집계
+
+실패한 생성 작업을 재시도할 때 대화 파일이 바뀌지 않았다면 같은 요청이 다시 만들어지므로,
+이미 성공한 단계(유형 판단, 필드 추출)는 API를 다시 호출하지 않습니다.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import redis
+
+from app.core.config import settings
+from app.core.metrics import increment
+
+from app.core.logger import logging
+logger = logging.getLogger(__name__)
+
+_KEY_PREFIX = "llm:resp:"
+_INDEX_KEY = "llm:resp:lru"
+
+# Redis 장애 시 재연결을 시도하지 않고 디스크만 사용하는 시간(초)
+_REDIS_RETRY_COOLDOWN = 30.0
+
+
+def make_cache_key(
+    model: str,
+    temperature: float,
+    messages: List[Dict[str, str]],
+    response_format: Optional[dict] = None,
+) -> str:
+    """요청을 정규화(JSON, key 정렬, 공백 제거)한 뒤 SHA-256 hex digest를 반환합니다."""
+    request = {
+        "model": model,
+        "temperature": temperature,
+        "messages": [
+            {"role": m.get("role", ""), "content": m.get("content", "")}
+            for m in messages
+        ],
+    }
+    # 기존 캐시 키가 바뀌지 않도록 응답 형식 지정이 있을 때만 포함
+    if response_format is not None:
+        request["response_format"] = response_format
+    canonical = json.dumps(
+        request,
+        ensure_ascii=False,
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+# --------------------------------------------------------------------------- #
+# Backends
+# --------------------------------------------------------------------------- #
+
+class _RedisBackend:
+    """값은 TTL이 걸린 문자열 키, 사용 시각은 sorted set(LRU 인덱스)으로 관리합니다."""
+
+    def __init__(self, url: str, ttl_seconds: int, max_entries: int) -> None:
+        self._client = redis.Redis.from_url(
+            url,
+            socket_connect_timeout=0.5,
+            socket_timeout=1.0,
+            decode_responses=True,
+        )
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries
+
+    def get(self, key: str) -> Optional[str]:
+        value = self._client.get(_KEY_PREFIX + key)
+        if value is not None:
+            self._client.zadd(_INDEX_KEY, {key: time.time()})
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        now = time.time()
+        pipe = self._client.pipeline()
+        pipe.set(_KEY_PREFIX + key, value, ex=self._ttl)
+        pipe.zadd(_INDEX_KEY, {key: now})
+        # TTL로 이미 만료된 항목은 인덱스에서도 제거
+        pipe.zremrangebyscore(_INDEX_KEY, "-inf", now - self._ttl)
+        pipe.zcard(_INDEX_KEY)
+        size = pipe.execute()[-1]
+
+        overflow = size - self._max_entries
+        if overflow > 0:
+            evicted = [k for k, _ in self._client.zpopmin(_INDEX_KEY, overflow)]
+            if evicted:
+                self._client.delete(*(_KEY_PREFIX + k for k in evicted))
+                logger.debug("LLM 캐시(Redis) LRU 제거: %d건", len(evicted))
+
+    def delete(self, key: str) -> None:
+        pipe = self._client.pipeline()
+        pipe.delete(_KEY_PREFIX + key)
+        pipe.zrem(_INDEX_KEY, key)
+        pipe.execute()
+
+
+class _DiskBackend:
+    """키마다 JSON 파일 하나. 파일 mtime을 마지막 사용 시각으로 사용합니다."""
+
+    def __init__(self, directory: str, ttl_seconds: int, max_entries: int) -> None:
+        self._dir = Path(directory)
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries
+
+    def _path(self, key: str) -> Path:
+        return self._dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[str]:
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        if time.time() - entry.get("created_at", 0) > self._ttl:
+            path.unlink(missing_ok=True)
+            return None
+
+        os.utime(path)  # LRU: 사용 시각 갱신
+        return entry.get("response")
+
+    def set(self, key: str, value: str) -> None:
+        # 여러 워커 프로세스가 같은 디렉터리를 쓰므로 임시 파일에 쓴 뒤 교체
+        fd, tmp_path = tempfile.mkstemp(dir=self._dir, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"created_at": time.time(), "response": value}, f, ensure_ascii=False)
+        os.replace(tmp_path, self._path(key))
+        self._evict()
+
+    def delete(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+
+    def _evict(self) -> None:
+        entries = list(self._dir.glob("*.json"))
+        overflow = len(entries) - self._max_entries
+        if overflow <= 0:
+            return
+        entries.sort(key=lambda p: p.stat().st_mtime)
+        for path in entries[:overflow]:
+            path.unlink(missing_ok=True)
+        logger.debug("LLM 캐시(디스크) LRU 제거: %d건", overflow)
+
+
+# --------------------------------------------------------------------------- #
+# Public API
+# --------------------------------------------------------------------------- #
+
+class LLMResponseCache:
+    """Redis 우선, 실패 시 디스크로 대체하는 GPT 응답 캐시."""
+
+    def __init__(
+        self,
+        redis_url: str,
+        cache_dir: str,
+        ttl_seconds: int,
+        max_entries: int,
+    ) -> None:
+        self._redis = _RedisBackend(redis_url, ttl_seconds, max_entries) if redis_url else None
+        self._disk = _DiskBackend(cache_dir, ttl_seconds, max_entries)
+        self._redis_down_until = 0.0
+
+    def _call(self, op: str, *args):
+        if self._redis is not None and time.monotonic() >= self._redis_down_until:
+            try:
+                return getattr(self._redis, op)(*args)
+            except redis.RedisError as exc:
+                self._redis_down_until = time.monotonic() + _REDIS_RETRY_COOLDOWN
+                logger.warning("LLM 캐시 Redis 사용 불가, 디스크 캐시로 대체: %s", exc)
+        return getattr(self._disk, op)(*args)
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            value = self._call("get", key)
+        except Exception as exc:  # 캐시 장애가 생성 작업을 실패시키지 않도록
+            logger.warning("LLM 캐시 조회 실패: %s", exc)
+            value = None
+        increment("llm_cache_hit" if value is not None else "llm_cache_miss")
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        try:
+            self._call("set", key, value)
+        except Exception as exc:
+            logger.warning("LLM 캐시 저장 실패: %s", exc)
+
+    def delete(self, key: str) -> None:
+        try:
+            self._call("delete", key)
+        except Exception as exc:
+            logger.warning("LLM 캐시 삭제 실패: %s", exc)
+
+
+# 전역 싱글턴 (비활성화 시 None)
+response_cache: Optional[LLMResponseCache] = (
+    LLMResponseCache(
+        redis_url=settings.REDIS_URL,
+        cache_dir=settings.LLM_CACHE_DIR,
+        ttl_seconds=settings.LLM_CACHE_TTL_SECONDS,
+        max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+    )
+    if settings.LLM_CACHE_ENABLED
+    else None
+)
@@ -0,0 +1,123 @@
+"""
+GPT 호출 단계별 재시도‧헤지 정책
+================================
+생성 파이프라인 단계마다 꼬리 지연과 비용의 균형이 다르므로 호출 예산을 따로 둡니다.
+
+* 재시도: 요청 시작 단계의 연결 오류‧5xx 를 full jitter 지수 백오프로 ``retries`` 번까지 재시도
+  (app.core.rate_limiter.send_rate_limited).
+* 헤지(hedged request): 응답이 ``hedge_after`` 초 안에 끝나지 않으면 같은 요청을 하나 더 보내
+  먼저 성공한 응답을 사용합니다. 짧고 싼 유형 판단은 적극적으로, 긴 추출은 기본적으로 헤지하지 않습니다.
+  진 쪽은 비동기면 태스크 취소로, 스트리밍이면 다음 조각에서 연결을 끊고, 동기 일반 호출은 결과만 버립니다.
+
+단계 이름은 app.core.metrics 의 stage_timer 이름과 같습니다 (classify / classify_extract / extract / annotate).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Awaitable, Callable, List, Optional, TypeVar
+
+from app.core.config import settings
+from app.core.metrics import increment
+
+from app.core.logger import logging
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class StagePolicy:
+    retries: int
+    hedge_after: float  # 초, 0 이면 헤지 안 함
+
+
+def stage_policy(stage: Optional[str]) -> StagePolicy:
+    """단계 이름에 해당하는 호출 예산. 단계가 없거나 설정되지 않았으면 기본값(헤지 없음)."""
+    return StagePolicy(
+        retries=settings.LLM_STAGE_RETRIES.get(stage, settings.OPENAI_MAX_RETRIES),
+        hedge_after=settings.LLM_STAGE_HEDGE_AFTER_SECONDS.get(stage, 0.0),
+    )
+
+
+def run_hedged(
+    attempt: Callable[[int, threading.Event], T],
+    hedge_after: float,
+    stage: Optional[str] = None,
+) -> T:
+    """
+    ``attempt(index, lost)`` 를 실행하고, ``hedge_after`` 초 안에 끝나지 않으면 하나 더 실행해
+    먼저 성공한 결과를 반환합니다. 둘 다 실패하면 먼저 실패한 쪽의 예외를 다시 발생시킵니다.
+
+    ``lost`` 는 다른 시도가 이겼을 때 세워지는 Event 로, 시도 쪽에서 확인해 일찍 멈출 수 있습니다.
+    """
+    if hedge_after <= 0:
+        return attempt(0, threading.Event())
+
+    pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="gpt-hedge")
+    lost: List[threading.Event] = [threading.Event(), threading.Event()]
+    try:
+        futures = {pool.submit(attempt, 0, lost[0]): 0}
+        done, _ = wait(futures, timeout=hedge_after)
+        if not done:
+            increment("llm_hedge_fired")
+            logger.debug("GPT 응답 지연 %.1fs 초과, 헤지 요청 시작: stage=%s", hedge_after, stage)
+            futures[pool.submit(attempt, 1, lost[1])] = 1
+
+        error: Optional[BaseException] = None
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    winner = futures[future]
+                    for index, event in enumerate(lost):
+                        if index != winner:
+                            event.set()
+                    if winner == 1:
+                        increment("llm_hedge_won")
+                    return future.result()
+                error = error or future.exception()
+        raise error
+    finally:
+        # 진 쪽 시도는 기다리지 않음 (스트리밍이면 lost 확인 후 스스로 연결을 끊음)
+        for event in lost:
+            event.set()
+        pool.shutdown(wait=False)
+
+
+async def arun_hedged(
+    attempt: Callable[[int], Awaitable[T]],
+    hedge_after: float,
+    stage: Optional[str] = None,
+) -> T:
+    """``run_hedged`` 의 비동기 버전. 진 쪽 시도는 태스크를 취소해 HTTP 요청을 바로 끊습니다."""
+    if hedge_after <= 0:
+        return await attempt(0)
+
+    tasks = [asyncio.create_task(attempt(0))]
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+        if not done:
+            increment("llm_hedge_fired")
+            logger.debug("GPT 응답 지연 %.1fs 초과, 헤지 요청 시작: stage=%s", hedge_after, stage)
+            tasks.append(asyncio.create_task(attempt(1)))
+
+        error: Optional[BaseException] = None
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is not tasks[0]:
+                        increment("llm_hedge_won")
+                    return task.result()
+                error = error or task.exception()
+        raise error
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,88 @@
+"""app/core/metrics.py
+====================================
+
+프로세스 내부 지표 수집 모듈
+--------------------------
+* record_latency / stage_timer: 파이프라인 단계별 소요 시간 기록
+* latency_summary: 최근 N개 표본 기준 p50 / p95 계산
+* increment / get_counter: 단순 카운터 (추측 실행 적중 등)
+
+외부 모니터링 시스템 없이 워커 로그로 지연 시간 분포를 확인하기 위한 용도이며,
+값은 워커 프로세스마다 따로 집계됩니다.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Iterator
+
+from app.core.logger import logging
+logger = logging.getLogger(__name__)
+
+# 단계별로 보관할 최근 표본 수
+_WINDOW = 500
+
+_lock = threading.Lock()
+_latencies: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=_WINDOW))
+_counters: Dict[str, int] = defaultdict(int)
+
+
+def record_latency(stage: str, seconds: float) -> None:
+    """단계 소요 시간(초)을 기록합니다."""
+    with _lock:
+        _latencies[stage].append(seconds)
+    logger.debug("stage latency: %s=%.3fs", stage, seconds)
+
+
+@contextmanager
+def stage_timer(stage: str) -> Iterator[None]:
+    """``with`` 블록의 실행 시간을 ``stage`` 이름으로 기록합니다. (예외 발생 시에도 기록)"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_latency(stage, time.perf_counter() - started)
+
+
+def latency_summary(stage: str) -> Dict[str, float]:
+    """최근 표본의 개수와 p50 / p95 (초)를 반환합니다."""
+    with _lock:
+        samples = sorted(_latencies.get(stage, ()))
+    if not samples:
+        return {"count": 0, "p50": 0.0, "p95": 0.0}
+    return {
+        "count": len(samples),
+        "p50": _percentile(samples, 0.50),
+        "p95": _percentile(samples, 0.95),
+    }
+
+
+def increment(name: str, amount: int = 1) -> None:
+    with _lock:
+        _counters[name] += amount
+
+
+def get_counter(name: str) -> int:
+    with _lock:
+        return _counters.get(name, 0)
+
+
+def log_latency_summary(*stages: str) -> None:
+    """여러 단계의 p50 / p95를 한 줄로 로그에 남깁니다."""
+    parts = []
+    for stage in stages:
+        summary = latency_summary(stage)
+        if summary["count"]:
+            parts.append(
+                f"{stage}(n={summary['count']}, p50={summary['p50']:.2f}s, p95={summary['p95']:.2f}s)"
+            )
+    if parts:
+        logger.info("stage latency: %s", ", ".join(parts))
+
+
+def _percentile(sorted_samples: list[float], q: float) -> float:
+    index = min(len(sorted_samples) - 1, int(round(q * (len(sorted_samples) - 1))))
+    return sorted_samples[index]
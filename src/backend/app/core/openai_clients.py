@@ -0,0 +1,144 @@
+"""app/core/openai_clients.py
+====================================
+
+OpenAI 클라이언트 공용 생성기
+----------------------------
+* GPT(app.core.llm)와 Whisper(app.core.stt)가 프로세스당 httpx 연결 풀 하나를 함께 씁니다.
+  같은 호스트이므로 한쪽에서 연 연결(TLS 세션)을 다른 쪽도 재사용합니다.
+* 풀 크기는 워커 동시성 × 태스크당 동시 요청 수(app.core.worker_pool), 쉬는 연결은
+  OPENAI_KEEPALIVE_EXPIRY_SECONDS 동안 유지합니다. h2 패키지가 있으면 HTTP/2 로 요청을 한 연결에 다중화합니다.
+* ``warm_up`` 은 워커 프로세스 시작 시(celery_app 의 worker_process_init) 연결을 미리 열어,
+  worker_max_tasks_per_child 로 자식 프로세스가 바뀔 때마다 첫 태스크가 TLS 핸드셰이크를 기다리지 않게 합니다.
+* prefork 자식 프로세스는 부모의 소켓을 물려받으면 안 되므로 pid 가 바뀌면 클라이언트를 새로 만듭니다.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient, OpenAI
+
+from app.core.config import settings
+from app.core.worker_pool import openai_connection_limits
+
+from app.core.logger import logging
+logger = logging.getLogger(__name__)
+
+# 태스크 하나가 동시에 보내는 GPT 요청 수 (추측 실행 시 후보 유형별 추출 + 유형 판단, 샤딩 시 샤드 수).
+# 헤지를 쓰면 헤지 요청과, 결과만 버려지고 아직 끝나지 않은 동기 호출의 진 쪽 요청까지 3배
+_CHAT_REQUESTS_PER_TASK = max(
+    1 + settings.GENERATION_SPECULATIVE_TOP_K, settings.GENERATION_EXTRACTION_SHARDS
+) * (
+    3 if any(after > 0 for after in settings.LLM_STAGE_HEDGE_AFTER_SECONDS.values()) else 1
+)
+# 워커 슬롯 하나는 생성 또는 전사 태스크 중 하나만 실행
+_REQUESTS_PER_TASK = max(_CHAT_REQUESTS_PER_TASK, settings.STT_MAX_CONCURRENCY)
+
+_lock = threading.RLock()  # 클라이언트 생성 중 httpx 풀 생성을 다시 요청
+_pid: Optional[int] = None
+_clients: Dict[str, object] = {}
+
+
+def _http2_enabled() -> bool:
+    return settings.OPENAI_HTTP2 and importlib.util.find_spec("h2") is not None
+
+
+def _http_options() -> dict:
+    return {"limits": openai_connection_limits(_REQUESTS_PER_TASK), "http2": _http2_enabled()}
+
+
+def _get(name: str, factory):
+    global _pid
+    with _lock:
+        if _pid != os.getpid():
+            _clients.clear()  # fork 이후: 부모의 연결은 버림 (닫으면 부모 쪽 소켓까지 끊김)
+            _pid = os.getpid()
+        if name not in _clients:
+            _clients[name] = factory()
+        return _clients[name]
+
+
+def _http_client() -> httpx.Client:
+    return _get("http", lambda: DefaultHttpxClient(**_http_options()))
+
+
+def _async_http_client() -> httpx.AsyncClient:
+    return _get("async_http", lambda: DefaultAsyncHttpxClient(**_http_options()))
+
+
+def _openai(http_client: httpx.Client) -> OpenAI:
+    return OpenAI(
+        api_key=settings.OPENAI_API_KEY,
+        base_url=settings.OPENAI_API_BASE,
+        timeout=settings.OPENAI_TIMEOUT,
+        max_retries=0,  # 재시도는 app.core.rate_limiter 에서 (429 시 모든 워커가 함께 대기)
+        http_client=http_client,
+    )
+
+
+def chat_client() -> OpenAI:
+    """GPT 호출용 동기 클라이언트."""
+    return _get("chat", lambda: _openai(_http_client()))
+
+
+def whisper_client() -> OpenAI:
+    """Whisper STT 용 동기 클라이언트 (GPT 와 같은 연결 풀)."""
+    return _get("whisper", lambda: _openai(_http_client()))
+
+
+def async_chat_client() -> AsyncOpenAI:
+    """asyncio 파이프라인용 비동기 클라이언트 (app.core.async_runner 의 프로세스 단일 이벤트 루프에서만 사용)."""
+    return _get("async_chat", lambda: AsyncOpenAI(
+        api_key=settings.OPENAI_API_KEY,
+        base_url=settings.OPENAI_API_BASE,
+        timeout=settings.OPENAI_TIMEOUT,
+        max_retries=0,
+        http_client=_async_http_client(),
+    ))
+
+
+# --------------------------------------------------------------------------- #
+# 연결 예열
+# --------------------------------------------------------------------------- #
+
+def _uses_async_client() -> bool:
+    return settings.GENERATION_ASYNC_PIPELINE or settings.GENERATION_SPECULATIVE_TOP_K > 0
+
+
+def warm_up() -> None:
+    """
+    OpenAI 호스트로 연결을 OPENAI_WARMUP_CONNECTIONS 개 열어 연결 풀에 남겨 둡니다.
+
+    응답 내용과 상태 코드는 보지 않으며(인증‧과금 없는 HEAD 요청), 실패해도 경고만 남깁니다.
+    """
+    count = min(settings.OPENAI_WARMUP_CONNECTIONS, openai_connection_limits(_REQUESTS_PER_TASK).max_connections)
+    if count <= 0:
+        return
+    if _http2_enabled():
+        count = 1  # HTTP/2 는 연결 하나로 다중화
+    url = settings.OPENAI_API_BASE
+    started = time.perf_counter()
+    try:
+        client = _http_client()
+        if count == 1:
+            client.head(url)
+        else:
+            with ThreadPoolExecutor(max_workers=count) as pool:
+                list(pool.map(lambda _: client.head(url), range(count)))
+
+        if _uses_async_client():
+            from app.core.async_runner import run_coroutine
+            run_coroutine(_async_http_client().head(url))
+    except httpx.HTTPError as exc:
+        logger.warning("OpenAI 연결 예열 실패, 첫 요청에서 연결: %s", exc)
+        return
+    logger.debug(
+        "OpenAI 연결 예열 완료: pid=%d, 연결 %d개, http2=%s, %.0fms",
+        os.getpid(), count, _http2_enabled(), (time.perf_counter() - started) * 1000,
+    )
@@ -0,0 +1,411 @@
+"""
+OpenAI 호출 분산 레이트 리미터
+==============================
+여러 워커 프로세스가 같은 OpenAI 한도(요청 수/분, 토큰 수/분)를 나눠 쓰므로,
+Redis 에 모델별 토큰 버킷을 두고 모든 호출이 요청 전에 버킷을 통과하게 합니다.
+
+* 버킷: 요청 버킷(RPM)과 토큰 버킷(TPM) 두 개를 Lua 스크립트 하나로 원자적으로 확인‧차감.
+  시각은 Redis 서버 시각(TIME)을 써서 워커 간 시계 차이의 영향을 받지 않습니다.
+* 적응형 조정: 응답 헤더(x-ratelimit-remaining-*/reset-*)가 알려주는 실제 잔량이
+  버킷보다 적으면 버킷을 낮추고, 잔량이 0이면 reset 까지 모든 워커의 요청을 멈춥니다.
+* 429: Retry-After(-ms) 헤더(없으면 지수 백오프)만큼 모든 워커를 함께 멈춘 뒤 재시도합니다.
+* 연결 오류‧5xx: full jitter 지수 백오프로 호출마다 지정한 횟수(단계별 예산)만큼 재시도합니다.
+* Redis 장애 시에는 잠시 리미터 없이 진행하고(fail-open), 429 대기만 프로세스 안에서 적용합니다.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import random
+import re
+import time
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional
+
+import openai
+import redis
+
+from app.core.config import settings
+from app.core.metrics import increment
+
+from app.core.logger import logging
+logger = logging.getLogger(__name__)
+
+
+class RateLimitTimeout(RuntimeError):
+    """레이트 리미터 대기 시간이 LLM_RATE_LIMIT_MAX_WAIT_SECONDS 를 넘은 경우."""
+
+
+# Redis 장애 시 재연결을 시도하지 않는 시간(초)
+_REDIS_RETRY_COOLDOWN = 30.0
+# 버킷 키 유지 시간 (1분 창 + 여유)
+_BUCKET_TTL = 120
+
+# KEYS: 요청 버킷, 토큰 버킷, 차단 시각 / ARGV: rpm, tpm, 이번 요청 토큰 수
+# 반환: 기다려야 하는 초 (문자열, 0 이면 차감 완료)
+_ACQUIRE_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local blocked = tonumber(redis.call('GET', KEYS[3]) or '0')
+if blocked > now then return tostring(blocked - now) end
+
+local function level(key, limit)
+  local v = redis.call('HMGET', key, 'tokens', 'ts')
+  local tokens = tonumber(v[1])
+  if tokens == nil then return limit end
+  return math.min(limit, tokens + (now - tonumber(v[2])) * limit / 60)
+end
+
+local rpm = tonumber(ARGV[1])
+local tpm = tonumber(ARGV[2])
+local cost = math.min(tonumber(ARGV[3]), tpm)
+local wait = 0
+local req = 0
+local tok = 0
+if rpm > 0 then
+  req = level(KEYS[1], rpm)
+  if req < 1 then wait = math.max(wait, (1 - req) * 60 / rpm) end
+end
+if tpm > 0 then
+  tok = level(KEYS[2], tpm)
+  if tok < cost then wait = math.max(wait, (cost - tok) * 60 / tpm) end
+end
+if wait > 0 then return tostring(wait) end
+
+if rpm > 0 then
+  redis.call('HSET', KEYS[1], 'tokens', req - 1, 'ts', now)
+  redis.call('EXPIRE', KEYS[1], ARGV[4])
+end
+if tpm > 0 then
+  redis.call('HSET', KEYS[2], 'tokens', tok - cost, 'ts', now)
+  redis.call('EXPIRE', KEYS[2], ARGV[4])
+end
+return '0'
+"""
+
+# KEYS: 요청 버킷, 토큰 버킷, 차단 시각 / ARGV: rpm, tpm, 남은 요청 수, 남은 토큰 수, 차단 초 (-1: 정보 없음)
+_SYNC_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+
+local function sync(key, limit, remaining)
+  if limit <= 0 or remaining < 0 then return end
+  local v = redis.call('HMGET', key, 'tokens', 'ts')
+  local tokens = tonumber(v[1])
+  local cur = limit
+  if tokens ~= nil then cur = math.min(limit, tokens + (now - tonumber(v[2])) * limit / 60) end
+  if remaining < cur then
+    redis.call('HSET', key, 'tokens', remaining, 'ts', now)
+    redis.call('EXPIRE', key, ARGV[6])
+  end
+end
+
+sync(KEYS[1], tonumber(ARGV[1]), tonumber(ARGV[3]))
+sync(KEYS[2], tonumber(ARGV[2]), tonumber(ARGV[4]))
+
+local block = tonumber(ARGV[5])
+if block > 0 then
+  local until_ts = now + block
+  local current = tonumber(redis.call('GET', KEYS[3]) or '0')
+  if until_ts > current then
+    redis.call('SET', KEYS[3], tostring(until_ts), 'PX', math.ceil(block * 1000))
+  end
+end
+return 'ok'
+"""
+
+_DURATION = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """OpenAI reset 헤더 형식("1s", "6m0s", "20ms")을 초로 변환합니다."""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION.findall(value)
+    if not parts:
+        return None
+    return sum(float(num) * _DURATION_UNITS[unit] for num, unit in parts)
+
+
+def retry_after_seconds(headers: Mapping[str, str]) -> Optional[float]:
+    """429 응답 헤더에서 다시 시도할 때까지의 시간(초)을 읽습니다."""
+    retry_ms = headers.get("retry-after-ms")
+    if retry_ms:
+        try:
+            return float(retry_ms) / 1000
+        except ValueError:
+            pass
+    retry_after = parse_duration(headers.get("retry-after"))
+    if retry_after is not None:
+        return retry_after
+    resets = [
+        parse_duration(headers.get(name))
+        for name in ("x-ratelimit-reset-requests", "x-ratelimit-reset-tokens")
+    ]
+    resets = [r for r in resets if r is not None]
+    return max(resets) if resets else None
+
+
+def _header_int(headers: Mapping[str, str], name: str) -> int:
+    try:
+        return int(headers.get(name, -1))
+    except (TypeError, ValueError):
+        return -1
+
+
+class RateLimiter:
+    """모델(또는 API) 하나의 RPM/TPM 버킷. ``rpm``/``tpm`` 이 0 이면 해당 한도는 적용하지 않습니다."""
+
+    def __init__(self, name: str, rpm: int, tpm: int, client: Optional[redis.Redis] = None) -> None:
+        self.name = name
+        self._rpm = rpm
+        self._tpm = tpm
+        prefix = f"ratelimit:{name}:"
+        self._keys = [prefix + "requests", prefix + "tokens", prefix + "blocked"]
+        self._client = client or redis.Redis.from_url(
+            settings.REDIS_URL,
+            socket_connect_timeout=0.5,
+            socket_timeout=1.0,
+            decode_responses=True,
+        )
+        self._acquire = self._client.register_script(_ACQUIRE_SCRIPT)
+        self._sync = self._client.register_script(_SYNC_SCRIPT)
+        self._redis_down_until = 0.0
+        self._local_blocked_until = 0.0
+
+    # ------------------------------------------------------------------ #
+    # 버킷 통과
+    # ------------------------------------------------------------------ #
+
+    def try_acquire(self, tokens: int = 0) -> float:
+        """버킷에서 차감을 시도합니다. 차감했으면 0, 아니면 기다려야 하는 초."""
+        local_wait = self._local_blocked_until - time.monotonic()
+        if local_wait > 0:
+            return local_wait
+        if time.monotonic() < self._redis_down_until:
+            return 0.0
+        try:
+            return float(self._acquire(
+                keys=self._keys, args=[self._rpm, self._tpm, max(0, tokens), _BUCKET_TTL]
+            ))
+        except redis.RedisError as exc:
+            self._redis_down(exc)
+            return 0.0
+
+    def acquire(self, tokens: int = 0) -> float:
+        """버킷을 통과할 때까지 기다립니다. 기다린 시간(초)을 반환합니다."""
+        waited = 0.0
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait <= 0:
+                self._record_wait(waited)
+                return waited
+            wait = self._check_budget(waited, wait)
+            time.sleep(wait)
+            waited += wait
+
+    async def aacquire(self, tokens: int = 0) -> float:
+        """``acquire`` 의 비동기 버전 (Redis 호출은 스레드에서 실행)."""
+        waited = 0.0
+        while True:
+            wait = await asyncio.to_thread(self.try_acquire, tokens)
+            if wait <= 0:
+                self._record_wait(waited)
+                return waited
+            wait = self._check_budget(waited, wait)
+            await asyncio.sleep(wait)
+            waited += wait
+
+    # ------------------------------------------------------------------ #
+    # 응답 헤더 반영
+    # ------------------------------------------------------------------ #
+
+    def observe(self, headers: Mapping[str, str]) -> None:
+        """성공 응답의 x-ratelimit-* 헤더로 버킷을 공급자 잔량에 맞춥니다."""
+        remaining_requests = _header_int(headers, "x-ratelimit-remaining-requests")
+        remaining_tokens = _header_int(headers, "x-ratelimit-remaining-tokens")
+        if remaining_requests < 0 and remaining_tokens < 0:
+            return
+        block = 0.0
+        if remaining_requests == 0:
+            block = max(block, parse_duration(headers.get("x-ratelimit-reset-requests")) or 0.0)
+        if remaining_tokens == 0:
+            block = max(block, parse_duration(headers.get("x-ratelimit-reset-tokens")) or 0.0)
+        self._apply(remaining_requests, remaining_tokens, block)
+
+    def penalize(self, headers: Mapping[str, str], attempt: int) -> float:
+        """429 응답 후 모든 워커의 요청을 멈출 시간(초)을 정해 적용하고 반환합니다."""
+        delay = retry_after_seconds(headers)
+        if delay is None:
+            delay = backoff_seconds(attempt, 1.0, settings.LLM_RATE_LIMIT_BACKOFF_MAX_SECONDS)
+        self._local_blocked_until = max(self._local_blocked_until, time.monotonic() + delay)
+        self._apply(0 if self._rpm else -1, -1, delay)
+        return delay
+
+    # ------------------------------------------------------------------ #
+    # Internal
+    # ------------------------------------------------------------------ #
+
+    def _apply(self, remaining_requests: int, remaining_tokens: int, block: float) -> None:
+        if time.monotonic() < self._redis_down_until:
+            return
+        try:
+            self._sync(
+                keys=self._keys,
+                args=[self._rpm, self._tpm, remaining_requests, remaining_tokens, block, _BUCKET_TTL],
+            )
+        except redis.RedisError as exc:
+            self._redis_down(exc)
+
+    def _check_budget(self, waited: float, wait: float) -> float:
+        if waited + wait > settings.LLM_RATE_LIMIT_MAX_WAIT_SECONDS:
+            raise RateLimitTimeout(
+                f"{self.name}: rate limit wait exceeded {settings.LLM_RATE_LIMIT_MAX_WAIT_SECONDS}s"
+            )
+        # 같은 시각에 풀린 워커들이 한꺼번에 재시도하지 않도록 약간 흩뜨림
+        return wait + random.uniform(0, 0.05)
+
+    def _record_wait(self, waited: float) -> None:
+        if waited > 0:
+            increment("rate_limit_waits")
+            logger.debug("레이트 리미터 대기: %s, %.2fs", self.name, waited)
+
+    def _redis_down(self, exc: Exception) -> None:
+        self._redis_down_until = time.monotonic() + _REDIS_RETRY_COOLDOWN
+        logger.warning("레이트 리미터 Redis 사용 불가, 일시적으로 제한 없이 진행: %s", exc)
+
+
+# --------------------------------------------------------------------------- #
+# 호출 래퍼 (버킷 통과 → 요청 → 헤더 반영, 429·일시 오류 재시도)
+# --------------------------------------------------------------------------- #
+
+# 공급자 쪽 일시 오류 (OpenAI SDK 기본 재시도 대상과 같음)
+_TRANSIENT_ERRORS = (openai.APIConnectionError, openai.InternalServerError, openai.ConflictError)
+
+
+def backoff_seconds(attempt: int, base: float, cap: float) -> float:
+    """full jitter 지수 백오프: 0 ~ min(cap, base × 2^attempt) 사이 임의 값 (재시도가 한 시각에 몰리지 않도록)."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def _retry_delay(
+    exc: Exception, limiter: Optional[RateLimiter], attempt: int, max_retries: int
+) -> Optional[float]:
+    """재시도할 경우 대기 시간, 재시도하지 않을 예외면 None."""
+    if isinstance(exc, openai.RateLimitError):
+        if attempt >= settings.LLM_RATE_LIMIT_MAX_RETRIES:
+            return None
+        increment("rate_limit_429")
+        if limiter is not None:
+            delay = limiter.penalize(exc.response.headers, attempt)
+        else:
+            delay = retry_after_seconds(exc.response.headers) or backoff_seconds(
+                attempt, 1.0, settings.LLM_RATE_LIMIT_BACKOFF_MAX_SECONDS
+            )
+        logger.warning("OpenAI 429 (%d회째), %.1fs 후 재시도", attempt + 1, delay)
+        # 리미터가 있으면 대기는 다음 acquire 에서 (다른 워커와 같은 차단 시각 기준)
+        return 0.0 if limiter is not None else delay
+    if isinstance(exc, _TRANSIENT_ERRORS):
+        if attempt >= max_retries:
+            return None
+        increment("llm_retries")
+        delay = backoff_seconds(attempt, settings.LLM_RETRY_BASE_SECONDS, settings.LLM_RETRY_MAX_SECONDS)
+        logger.warning("OpenAI 일시 오류 (%s), %.1fs 후 재시도", type(exc).__name__, delay)
+        return delay
+    return None
+
+
+def send_rate_limited(
+    limiter: Optional[RateLimiter],
+    send: Callable[[], Any],
+    *,
+    tokens: int = 0,
+    max_retries: Optional[int] = None,
+    before_retry: Optional[Callable[[], None]] = None,
+) -> Any:
+    """
+    ``send`` (OpenAI ``with_raw_response`` 호출)를 레이트 리미터 아래에서 실행하고 raw 응답을 반환합니다.
+
+    Parameters
+    ----------
+    tokens : int
+        이번 요청이 쓸 것으로 추정되는 토큰 수 (TPM 버킷 차감량).
+    max_retries : int, optional
+        연결 오류‧5xx 재시도 횟수. 생략하면 OPENAI_MAX_RETRIES.
+    before_retry : callable, optional
+        재시도 전에 호출 (업로드 파일 되감기 등).
+    """
+    for attempt in itertools.count():
+        if limiter is not None:
+            limiter.acquire(tokens)
+        try:
+            raw = send()
+        except Exception as exc:
+            delay = _retry_delay(exc, limiter, attempt, _max_retries(max_retries))
+            if delay is None:
+                raise
+            time.sleep(delay)
+            if before_retry is not None:
+                before_retry()
+            continue
+        if limiter is not None:
+            limiter.observe(raw.headers)
+        return raw
+
+
+async def asend_rate_limited(
+    limiter: Optional[RateLimiter],
+    send: Callable[[], Awaitable[Any]],
+    *,
+    tokens: int = 0,
+    max_retries: Optional[int] = None,
+) -> Any:
+    """``send_rate_limited`` 의 비동기 버전."""
+    for attempt in itertools.count():
+        if limiter is not None:
+            await limiter.aacquire(tokens)
+        try:
+            raw = await send()
+        except Exception as exc:
+            delay = _retry_delay(exc, limiter, attempt, _max_retries(max_retries))
+            if delay is None:
+                raise
+            await asyncio.sleep(delay)
+            continue
+        if limiter is not None:
+            limiter.observe(raw.headers)
+        return raw
+
+
+def _max_retries(max_retries: Optional[int]) -> int:
+    return settings.OPENAI_MAX_RETRIES if max_retries is None else max_retries
+
+
+# --------------------------------------------------------------------------- #
+# 모델별 리미터 (프로세스 단위 싱글턴)
+# --------------------------------------------------------------------------- #
+
+_limiters: Dict[str, RateLimiter] = {}
+
+
+def chat_limiter(model: str) -> Optional[RateLimiter]:
+    """Chat Completions 모델별 리미터 (LLM_RATE_LIMIT_ENABLED 가 꺼져 있으면 None)."""
+    if not settings.LLM_RATE_LIMIT_ENABLED:
+        return None
+    if model not in _limiters:
+        _limiters[model] = RateLimiter(f"chat:{model}", settings.OPENAI_RPM_LIMIT, settings.OPENAI_TPM_LIMIT)
+    return _limiters[model]
+
+
+def whisper_limiter() -> Optional[RateLimiter]:
+    """Whisper 리미터 (요청 수만 제한)."""
+    if not settings.LLM_RATE_LIMIT_ENABLED:
+        return None
+    if "whisper" not in _limiters:
+        _limiters["whisper"] = RateLimiter("whisper", settings.WHISPER_RPM_LIMIT, 0)
+    return _limiters["whisper"]
@@ -0,0 +1,67 @@
+"""app/core/shared_cache.py
+====================================
+
+워커 공용 Redis 캐시 접근
+------------------------
+* 여러 워커 프로세스가 함께 쓰는 작은 색인‧집계(app.prompts.type_cache, app.prompts.suggestion_cache)가
+  같은 연결 설정과 장애 처리를 쓰도록 모은 헬퍼입니다. 프로세스별 파일과 달리 모든 워커의 기록이 한곳에 합쳐집니다.
+* 이 캐시들은 GPT 호출을 줄이는 최적화일 뿐이므로, Redis 장애 시 예외 대신 기본값(캐시 없음)을 돌려주고
+  _REDIS_RETRY_COOLDOWN 동안 재연결을 시도하지 않습니다.
+* 동기 클라이언트이므로 asyncio 경로에서는 ``asyncio.to_thread`` 로 호출합니다.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable, Optional, TypeVar
+
+import redis
+
+from app.core.config import settings
+
+from app.core.logger import logging
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Redis 장애 시 재연결을 시도하지 않고 캐시 없이 진행하는 시간(초)
+_REDIS_RETRY_COOLDOWN = 30.0
+
+
+class SharedCache:
+    """키 접두어 하나를 쓰는 Redis 캐시. ``run`` 으로 감싼 연산만 Redis 에 접근합니다."""
+
+    def __init__(self, prefix: str) -> None:
+        self._prefix = prefix
+        self._client: Optional[redis.Redis] = None
+        self._down_until = 0.0
+        self._lock = threading.Lock()
+
+    def key(self, *parts: object) -> str:
+        return self._prefix + ":".join(str(part) for part in parts)
+
+    def run(self, operation: Callable[[redis.Redis], T], default: T) -> T:
+        """``operation(client)`` 결과. Redis 를 쓸 수 없으면 ``default``."""
+        if time.monotonic() < self._down_until:
+            return default
+        try:
+            return operation(self._get_client())
+        except redis.RedisError as exc:
+            self._down_until = time.monotonic() + _REDIS_RETRY_COOLDOWN
+            logger.warning(
+                "Redis 캐시(%s) 사용 불가, %.0f초 동안 캐시 없이 진행: %s",
+                self._prefix, _REDIS_RETRY_COOLDOWN, exc,
+            )
+            return default
+
+    def _get_client(self) -> redis.Redis:
+        with self._lock:
+            if self._client is None:
+                self._client = redis.Redis.from_url(
+                    settings.REDIS_URL,
+                    socket_connect_timeout=0.5,
+                    socket_timeout=1.0,
+                    decode_responses=True,
+                )
+            return self._client
@@ -1,10 +1,22 @@
 from __future__ import annotations
 
-import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from openai import OpenAI, OpenAIError
+from typing import Iterator
+from openai import OpenAIError
 
 from app.core.config import settings  # type: ignore
+from app.core.rate_limiter import send_rate_limited, whisper_limiter
+from app.core.openai_clients import whisper_client
+from app.core.audio_chunker import (
+    AudioDecodeError,
+    can_decode,
+    export_wav,
+    find_chunk_bounds,
+    load_pcm,
+    merge_transcript_stream,
+    overlap_token_window,
+)
 
 from app.core.logger import logging
 logger = logging.getLogger(__name__)
@@ -17,43 +29,27 @@ class STTCallError(RuntimeError):
     """Raised when a Whisper STT API call fails."""
 
 
-# --------------------------------------------------------------------------- #
-# OpenAI Whisper Client (global singleton)
-# --------------------------------------------------------------------------- #
-
-_client: OpenAI | None = None
-
-
-def _get_client() -> OpenAI:
-    """Create (once) and return an OpenAI client instance."""
-    global _client
-    if _client is None:
-        _client = OpenAI(
-            api_key=settings.OPENAI_API_KEY,  # loaded from .env
-            base_url=settings.OPENAI_API_BASE,
-            timeout=settings.OPENAI_TIMEOUT,
-        )
-        logger.debug("OpenAI client initialized for Whisper STT")
-    return _client
-
-
 # --------------------------------------------------------------------------- #
 # Internal API
 # --------------------------------------------------------------------------- #
 
-def transcribe_audio(audio_filename: str) -> str:
+def transcribe_audio_stream(audio_filename: str) -> Iterator[str]:
     """
-    Convert an audio file to text using OpenAI Whisper.
+    Convert an audio file to text using OpenAI Whisper, yielding text segments in order.
+
+    긴 녹음은 구간별로 동시에 변환하되, 앞 구간부터 완료되는 대로 바로 내보내므로
+    호출 측(전처리)은 마지막 구간을 기다리지 않고 처리를 시작할 수 있습니다.
+    중간 결과 파일은 만들지 않습니다.
 
     Parameters
     ----------
-    path : str
-        Absolute or project-relative path to an ``.mp3``/``.wav`` file stored on disk.
+    audio_filename : str
+        ``AUDIO_UPLOAD_DIR`` 아래에 저장된 ``.mp3``/``.wav`` 파일 이름.
 
-    Returns
-    -------
+    Yields
+    ------
     str
-        The transcribed text.
+        겹침 구간 중복이 제거된 변환 텍스트 조각.
 
     Raises
     ------
@@ -65,33 +61,111 @@ def transcribe_audio(audio_filename: str) -> str:
         logger.warning("Whisper 입력 파일 없음: %s", input_path)
         raise STTCallError(f"Audio file not found: {input_path}")
 
-    client = _get_client()
-
     try:
         logger.debug("Starting Whisper transcription for %s", input_path)
-        # NOTE: ``file`` must be a binary file object
-        # NOTE: Whisper API는 동기식 파일 객체만 받음
-        with open(input_path, "rb") as fh:
-            response = client.audio.transcriptions.create(
-                model="whisper-1",
-                file=fh,
-                response_format="text",
+        total_chars = 0
+        if _should_chunk(input_path):
+            segments = merge_transcript_stream(
+                _iter_chunk_transcripts(input_path),
+                max_overlap_tokens=overlap_token_window(settings.STT_CHUNK_OVERLAP_SECONDS),
             )
+        else:
+            # NOTE: ``file`` must be a binary file object
+            # NOTE: Whisper API는 동기식 파일 객체만 받음
+            with open(input_path, "rb") as fh:
+                segments = iter([_transcribe_file(fh)])
+
+        for segment in segments:
+            total_chars += len(segment)
+            yield segment
+        logger.debug("Finished Whisper transcription (%d chars)", total_chars)
+
+    except STTCallError:
+        raise
+    except (OpenAIError, Exception) as exc:  # noqa: BLE001
+        logger.exception("Whisper STT API call failed: %s", exc)
+        raise STTCallError("Whisper STT API call failed") from exc
 
-        text_out: str = response.strip() if isinstance(response, str) else response.text  # type: ignore[attr-defined]
-        logger.debug("Finished Whisper transcription (%d chars)", len(text_out))
 
-        # UUID filename 생성
-        text_uuid = str(uuid.uuid4())
-        output_filename = f"{text_uuid}.txt"
-        output_path = Path(settings.TEXT_UPLOAD_DIR) / output_filename
+# --------------------------------------------------------------------------- #
+# Internal helpers
+# --------------------------------------------------------------------------- #
 
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(text_out)
-            
-        logger.info("Whisper 결과 저장 완료: 파일=%s", output_path)
-        return output_filename
+def _transcribe_file(file) -> str:
+    """Whisper API 단일 호출. ``file`` 은 파일 객체 또는 (이름, bytes, MIME) 튜플."""
+    raw = send_rate_limited(
+        whisper_limiter(),
+        lambda: whisper_client().audio.transcriptions.with_raw_response.create(
+            model="whisper-1",
+            file=file,
+            response_format="text",
+        ),
+        # 재시도 시 파일 객체는 처음부터 다시 읽어야 함
+        before_retry=getattr(file, "seek", None) and (lambda: file.seek(0)),
+    )
+    response = raw.parse()
+    return response.strip() if isinstance(response, str) else response.text  # type: ignore[attr-defined]
+
+
+def _should_chunk(input_path: Path) -> bool:
+    """분할 변환 대상 여부. 업로드 제한을 넘는 파일은 분할할 수 없으면 실패 처리합니다."""
+    if not settings.STT_CHUNKING_ENABLED:
+        return False
+    if can_decode(input_path):
+        return True
+    if input_path.stat().st_size > settings.MAX_UPLOAD_SIZE_BYTES:
+        raise STTCallError(
+            f"Audio file exceeds {settings.MAX_UPLOAD_SIZE_BYTES} bytes "
+            f"and {input_path.suffix} cannot be split (pydub not installed)"
+        )
+    return False
 
-    except (OpenAIError, Exception) as exc:  # noqa: BLE001
-        logger.exception("Whisper STT API call failed: %s", exc)
-        raise STTCallError("Whisper STT API call failed") from exc
+
+def _iter_chunk_transcripts(input_path: Path) -> Iterator[str]:
+    """
+    무음 경계로 나눈 구간들을 제한된 스레드 풀에서 동시에 변환하고, 결과를 구간 순서대로 내보냅니다.
+
+    구간이 하나뿐이면(짧은 녹음) 원본 파일을 그대로 한 번에 올립니다.
+    """
+    try:
+        pcm = load_pcm(input_path)
+    except AudioDecodeError as exc:
+        raise STTCallError(f"Failed to decode audio for chunking: {input_path}") from exc
+
+    bounds = find_chunk_bounds(
+        pcm,
+        max_chunk_seconds=settings.STT_CHUNK_MAX_SECONDS,
+        min_silence_ms=settings.STT_CHUNK_MIN_SILENCE_MS,
+        silence_threshold_dbfs=settings.STT_SILENCE_THRESHOLD_DBFS,
+        overlap_seconds=settings.STT_CHUNK_OVERLAP_SECONDS,
+    )
+    if len(bounds) == 1 and input_path.stat().st_size <= settings.MAX_UPLOAD_SIZE_BYTES:
+        with open(input_path, "rb") as fh:
+            yield _transcribe_file(fh)
+        return
+
+    logger.info(
+        "Whisper 분할 변환: 파일=%s, 구간 수=%d, 동시 요청=%d",
+        input_path.name, len(bounds), settings.STT_MAX_CONCURRENCY
+    )
+
+    def _transcribe_chunk(bound) -> str:
+        payload = (f"{input_path.stem}_{bound.index}.wav", export_wav(pcm, bound), "audio/wav")
+        text = _transcribe_file(payload)
+        logger.debug(
+            "Whisper 구간 변환 완료: %d (%.1fs~%.1fs, %d chars)",
+            bound.index, bound.start_seconds, bound.end_seconds, len(text)
+        )
+        return text
+
+    pool = ThreadPoolExecutor(
+        max_workers=max(1, settings.STT_MAX_CONCURRENCY),
+        thread_name_prefix="whisper-chunk",
+    )
+    try:
+        futures = [pool.submit(_transcribe_chunk, bound) for bound in bounds]
+        for future in futures:
+            yield future.result()
+    finally:
+        # 중간에 실패하거나 소비가 중단되면 아직 시작하지 않은 구간은 취소
+        pool.shutdown(wait=False, cancel_futures=True)
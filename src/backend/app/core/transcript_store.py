@@ -0,0 +1,242 @@
+"""app/core/transcript_store.py
+====================================
+
+대화 텍스트 저장소
+------------------
+* STT 전처리 결과(Transcription.script_file 이름의 대화 텍스트)를 쓰고 읽고 지우는 저장소입니다.
+  API 서버와 워커가 서로 다른 호스트에서 실행돼도 같은 본문을 보도록 TRANSCRIPT_STORE_BACKEND 로 고릅니다.
+
+  - ``local``   : TEXT_UPLOAD_DIR 의 파일 (기본값, 모든 프로세스가 같은 디스크를 볼 때)
+  - ``postgres``: contracts_transcription_scripts 테이블 (긴 본문은 TOAST 로 압축 저장)
+  - ``s3``      : S3 호환 객체 저장소 (boto3 필요). TRANSCRIPT_S3_ENDPOINT_URL 을 MinIO 같은
+    로컬 대역으로 두면 AWS 없이 테스트할 수 있습니다.
+* ``cached_transcripts()`` 범위 안에서는 읽은 본문을 메모리에 두고 다시 읽지 않습니다 (태스크 단위 read-through 캐시).
+  asyncio 태스크는 컨텍스트를 복사해 실행되므로 같은 이벤트 루프의 다른 생성 작업과 캐시가 섞이지 않습니다.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+from contextvars import ContextVar, Token
+from pathlib import Path
+from typing import Dict, Optional, Protocol
+
+try:
+    import boto3  # 선택 의존성
+    from botocore.exceptions import ClientError
+except ImportError:  # pragma: no cover - 설치 여부에 따라 다름
+    boto3 = None
+    ClientError = None
+
+from sqlalchemy import delete
+
+from app.core.config import settings
+from app.core.metrics import increment
+
+from app.core.logger import logging
+logger = logging.getLogger(__name__)
+
+
+class TranscriptNotFound(FileNotFoundError):
+    """저장소에 해당 이름의 대화 텍스트가 없는 경우."""
+
+
+class TranscriptStore(Protocol):
+    def write(self, name: str, text: str) -> None:
+        ...
+
+    def read(self, name: str) -> str:
+        """없으면 ``TranscriptNotFound``."""
+        ...
+
+    def delete(self, name: str) -> None:
+        """없으면 무시합니다."""
+        ...
+
+
+class LocalTranscriptStore:
+    def __init__(self, directory: str) -> None:
+        self._dir = Path(directory)
+
+    def write(self, name: str, text: str) -> None:
+        path = self._dir / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # 쓰는 도중 실패해도 일부만 기록된 파일을 남기지 않음
+        tmp_path = path.with_name(f"{path.name}.tmp")
+        tmp_path.write_text(text, encoding="utf-8")
+        tmp_path.replace(path)
+
+    def read(self, name: str) -> str:
+        try:
+            return (self._dir / name).read_text(encoding="utf-8")
+        except FileNotFoundError as exc:
+            raise TranscriptNotFound(name) from exc
+
+    def delete(self, name: str) -> None:
+        (self._dir / name).unlink(missing_ok=True)
+
+
+class PostgresTranscriptStore:
+    def write(self, name: str, text: str) -> None:
+        from app.db.session import get_sync_session
+        from app.models.transcription_script import TranscriptionScript
+
+        session = get_sync_session()
+        try:
+            session.merge(TranscriptionScript(name=name, content=text))
+            session.commit()
+        finally:
+            session.close()
+
+    def read(self, name: str) -> str:
+        from app.db.session import get_sync_session
+        from app.models.transcription_script import TranscriptionScript
+
+        session = get_sync_session()
+        try:
+            script = session.get(TranscriptionScript, name)
+        finally:
+            session.close()
+        if script is None:
+            raise TranscriptNotFound(name)
+        return script.content
+
+    def delete(self, name: str) -> None:
+        from app.db.session import get_sync_session
+        from app.models.transcription_script import TranscriptionScript
+
+        session = get_sync_session()
+        try:
+            session.execute(delete(TranscriptionScript).where(TranscriptionScript.name == name))
+            session.commit()
+        finally:
+            session.close()
+
+
+class S3TranscriptStore:
+    def __init__(self, bucket: str, prefix: str, endpoint_url: Optional[str]) -> None:
+        if boto3 is None:
+            raise RuntimeError("TRANSCRIPT_STORE_BACKEND=s3 에는 boto3 가 필요합니다 (pip install boto3)")
+        if not bucket:
+            raise ValueError("TRANSCRIPT_S3_BUCKET 이 설정되지 않았습니다")
+        self._bucket = bucket
+        self._prefix = prefix
+        # 자격 증명‧리전은 boto3 기본 방식(AWS_* 환경 변수 등)을 따름
+        self._client = boto3.client("s3", endpoint_url=endpoint_url or None)
+
+    def write(self, name: str, text: str) -> None:
+        self._client.put_object(
+            Bucket=self._bucket,
+            Key=self._prefix + name,
+            Body=text.encode("utf-8"),
+            ContentType="text/plain; charset=utf-8",
+        )
+
+    def read(self, name: str) -> str:
+        try:
+            response = self._client.get_object(Bucket=self._bucket, Key=self._prefix + name)
+        except ClientError as exc:
+            if exc.response.get("Error", {}).get("Code") in {"NoSuchKey", "404"}:
+                raise TranscriptNotFound(name) from exc
+            raise
+        return response["Body"].read().decode("utf-8")
+
+    def delete(self, name: str) -> None:
+        self._client.delete_object(Bucket=self._bucket, Key=self._prefix + name)
+
+
+def _create_store() -> TranscriptStore:
+    backend = settings.TRANSCRIPT_STORE_BACKEND
+    if backend == "local":
+        return LocalTranscriptStore(settings.TEXT_UPLOAD_DIR)
+    if backend == "postgres":
+        return PostgresTranscriptStore()
+    if backend == "s3":
+        return S3TranscriptStore(
+            settings.TRANSCRIPT_S3_BUCKET,
+            settings.TRANSCRIPT_S3_PREFIX,
+            settings.TRANSCRIPT_S3_ENDPOINT_URL,
+        )
+    raise ValueError(f"Unknown TRANSCRIPT_STORE_BACKEND: {backend}")
+
+
+_store: Optional[TranscriptStore] = None
+_store_pid: Optional[int] = None
+_store_lock = threading.Lock()
+
+
+def transcript_store() -> TranscriptStore:
+    """프로세스 공용 저장소. prefork 자식 프로세스는 부모의 연결을 물려받지 않도록 새로 만듭니다."""
+    global _store, _store_pid
+    with _store_lock:
+        if _store is None or _store_pid != os.getpid():
+            _store, _store_pid = _create_store(), os.getpid()
+        return _store
+
+
+# --------------------------------------------------------------------------- #
+# 태스크 단위 read-through 캐시
+# --------------------------------------------------------------------------- #
+_cache: ContextVar[Optional[Dict[str, str]]] = ContextVar("transcript_cache", default=None)
+
+
+class _CacheScope:
+    """``with`` / ``async with`` 공용. 이미 캐시 범위 안이면 바깥 캐시를 그대로 씁니다."""
+
+    def __init__(self) -> None:
+        self._token: Optional[Token] = None
+
+    def __enter__(self) -> None:
+        if _cache.get() is None:
+            self._token = _cache.set({})
+
+    def __exit__(self, *exc_info) -> None:
+        if self._token is not None:
+            _cache.reset(self._token)
+            self._token = None
+
+    async def __aenter__(self) -> None:
+        self.__enter__()
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.__exit__(*exc_info)
+
+
+def cached_transcripts() -> _CacheScope:
+    return _CacheScope()
+
+
+def read_transcript(name: str) -> str:
+    cache = _cache.get()
+    if cache is not None and name in cache:
+        increment("transcript_cache_hit")
+        return cache[name]
+    text = transcript_store().read(name)
+    if cache is not None:
+        cache[name] = text
+    return text
+
+
+async def aread_transcript(name: str) -> str:
+    """``read_transcript`` 의 비동기 버전 (저장소 I/O 는 스레드에서 실행)."""
+    cache = _cache.get()
+    if cache is not None and name in cache:
+        increment("transcript_cache_hit")
+        return cache[name]
+    text = await asyncio.to_thread(transcript_store().read, name)
+    if cache is not None:
+        cache[name] = text
+    return text
+
+
+def write_transcript(name: str, text: str) -> None:
+    transcript_store().write(name, text)
+
+
+def delete_transcript(name: str) -> None:
+    cache = _cache.get()
+    if cache is not None:
+        cache.pop(name, None)
+    transcript_store().delete(name)
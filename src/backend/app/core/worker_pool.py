@@ -0,0 +1,102 @@
+"""app/core/worker_pool.py
+====================================
+
+Celery 워커 풀 종류에 맞춘 자원 설정
+-----------------------------------
+* GPT 단계는 대부분 네트워크 대기이므로 gevent/eventlet 풀(green thread)로 한 프로세스에서
+  많은 태스크를 동시에 돌릴 수 있습니다. 이때 연결 풀 크기는 프로세스 하나의 동시 실행 수에 맞춰야 합니다.
+* prefork 풀은 프로세스당 태스크 하나만 실행하므로 연결 풀을 최소로 둡니다.
+* ``settings.CELERY_WORKER_POOL`` 은 실제 ``celery worker -P`` 옵션과 같아야 합니다
+  (monkey patch 는 -P 옵션으로만 적용되므로, 불일치는 ``warn_if_unpatched`` 가 경고).
+"""
+
+from __future__ import annotations
+
+import sys
+from typing import Any, Dict
+
+import httpx
+
+from app.core.config import settings
+
+from app.core.logger import logging
+logger = logging.getLogger(__name__)
+
+GREEN_POOLS = frozenset({"gevent", "eventlet"})
+
+
+def is_green_pool() -> bool:
+    return settings.CELERY_WORKER_POOL in GREEN_POOLS
+
+
+def worker_concurrency() -> int:
+    """한 프로세스에서 동시에 실행될 수 있는 태스크 수."""
+    if settings.CELERY_WORKER_POOL == "prefork":
+        return 1
+    return max(1, settings.CELERY_POOL_CONCURRENCY)
+
+
+def sync_engine_pool_options() -> Dict[str, Any]:
+    """``create_engine`` 연결 풀 옵션."""
+    if settings.CELERY_WORKER_POOL == "prefork":
+        return {"pool_size": 1, "max_overflow": 2, "pool_timeout": settings.SYNC_DB_POOL_TIMEOUT}
+    # 태스크는 긴 GPT 호출 동안 연결을 반납하므로(트랜잭션 종료) 동시성보다 작은 풀로 충분
+    return {
+        "pool_size": min(settings.SYNC_DB_POOL_SIZE, worker_concurrency()),
+        "max_overflow": settings.SYNC_DB_MAX_OVERFLOW,
+        "pool_timeout": settings.SYNC_DB_POOL_TIMEOUT,
+    }
+
+
+def openai_connection_limits(requests_per_task: int = 1) -> httpx.Limits:
+    """
+    OpenAI 클라이언트(httpx) 연결 한도.
+
+    Parameters
+    ----------
+    requests_per_task : int
+        태스크 하나가 동시에 보낼 수 있는 요청 수 (추측 실행 후보 수, Whisper 구간 동시 변환 수 등).
+    """
+    max_connections = settings.OPENAI_MAX_CONNECTIONS or worker_concurrency() * max(1, requests_per_task)
+    return httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_connections,
+        keepalive_expiry=settings.OPENAI_KEEPALIVE_EXPIRY_SECONDS,
+    )
+
+
+def patch_green_db_driver() -> None:
+    """green thread 풀에서 psycopg2 가 이벤트 허브를 막지 않도록 대기 콜백을 설치합니다 (psycogreen, 선택)."""
+    if not is_green_pool():
+        return
+    try:
+        if settings.CELERY_WORKER_POOL == "gevent":
+            from psycogreen.gevent import patch_psycopg
+        else:
+            from psycogreen.eventlet import patch_psycopg
+    except ImportError:
+        logger.warning(
+            "psycogreen 미설치: %s 풀에서 DB 쿼리 동안 다른 태스크가 멈춥니다 (pip install psycogreen)",
+            settings.CELERY_WORKER_POOL
+        )
+        return
+    patch_psycopg()
+    logger.debug("psycopg2 green 대기 콜백 설치 (%s)", settings.CELERY_WORKER_POOL)
+
+
+def warn_if_unpatched() -> None:
+    """CELERY_WORKER_POOL 이 green 풀인데 -P 옵션 없이 실행되어 monkey patch 가 안 된 경우 경고."""
+    if not is_green_pool():
+        return
+    patched = False
+    if settings.CELERY_WORKER_POOL == "gevent" and "gevent.monkey" in sys.modules:
+        from gevent import monkey
+        patched = monkey.is_module_patched("socket")
+    elif settings.CELERY_WORKER_POOL == "eventlet" and "eventlet.patcher" in sys.modules:
+        from eventlet import patcher
+        patched = patcher.is_monkey_patched("socket")
+    if not patched:
+        logger.warning(
+            "CELERY_WORKER_POOL=%s 이지만 monkey patch 되지 않음: celery worker -P %s 로 실행하세요",
+            settings.CELERY_WORKER_POOL, settings.CELERY_WORKER_POOL
+        )
@@ -8,6 +8,8 @@ from app.models import (  # noqa: F401
     transcription, # noqa
     generation,    # noqa
     suggestion,    # noqa
+    generation_batch,  # noqa
+    transcription_script,  # noqa
 )
 
 from app.db.session import engine
@@ -0,0 +1,48 @@
+from sqlmodel import SQLModel, Field
+from uuid import UUID
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Dict, Optional
+
+from sqlalchemy import Column, DateTime
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
+
+
+class GenerationBatchStage(str, Enum):
+    classify = "classify"
+    extract = "extract"
+    annotate = "annotate"
+
+
+class GenerationBatchItem(SQLModel, table=True):
+    """배치 모드 generation 의 진행 상태 (다음에 제출할 단계와 앞 단계 결과)."""
+
+    __tablename__ = "contracts_generation_batch_items"
+
+    generation_id: UUID = Field(foreign_key="contracts_generations.id", primary_key=True)
+
+    stage: GenerationBatchStage = Field(default=GenerationBatchStage.classify, nullable=False, index=True)
+    # 제출된 배치 작업 id (None 이면 다음 제출 대기)
+    batch_id: Optional[str] = Field(default=None, nullable=True, index=True)
+
+    contract_type: Optional[str] = Field(default=None, nullable=True)
+    fields: Optional[Dict] = Field(default=None, sa_column=Column(JSONB, nullable=True))
+
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(
+            DateTime(timezone=True),
+            server_default=func.now(),
+            nullable=False
+        ),
+    )
+    updated_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(
+            DateTime(timezone=True),
+            server_default=func.now(),
+            onupdate=func.now(),
+            nullable=False
+        )
+    )
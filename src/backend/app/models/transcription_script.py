@@ -0,0 +1,27 @@
+from sqlmodel import SQLModel, Field
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, DateTime, Text
+from sqlalchemy.sql import func
+
+
+class TranscriptionScript(SQLModel, table=True):
+    """대화 텍스트 본문 (TRANSCRIPT_STORE_BACKEND=postgres).
+
+    text 컬럼은 기본 저장 방식(EXTENDED)이라 약 2KB 를 넘는 본문은 TOAST 로 압축되어 별도 저장됩니다.
+    """
+
+    __tablename__ = "contracts_transcription_scripts"
+
+    # Transcription.script_file 과 같은 값
+    name: str = Field(primary_key=True)
+    content: str = Field(sa_column=Column(Text, nullable=False))
+
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(
+            DateTime(timezone=True),
+            server_default=func.now(),
+            nullable=False
+        ),
+    )
@@ -1,7 +1,15 @@
+import asyncio
 import json
-from typing import Callable, List, Dict
+from typing import Awaitable, Callable, List, Dict
 
-from app.prompts.review_schema import contract_review_schema
+from app.prompts.review_schema import get_compiled_review_schema
+from app.prompts.suggestion_cache import suggestion_cache
+from app.prompts.suggestion_library import library_suggestions
+from app.prompts.templates import get_annotation_template
+from app.prompts.json_repair import loads_tolerant
+from app.core.config import settings
+from app.core.llm import discard_cached_response
+from app.core.metrics import increment
 
 # 입력 매개변수로 필요한 것 - 계약서 유형, 계약서 생성 모듈의 출력 json 결과
 def annotate_contract_text(
@@ -9,96 +17,137 @@ def annotate_contract_text(
     contract_fields: dict,
     gpt_caller: Callable[[List[Dict[str, str]]], str] # dict들의 리스트를 인자로 받아 문자열을 리턴하는 함수
 ) -> dict:
-    
-    schema = contract_review_schema.get(contract_type, {})
-
-    # selected_keys 생성
-    selected_keys = []
-    def extract_keys(prefix, d):
-        for k, v in d.items():
-            full_key = f"{prefix}.{k}" if prefix else k
-            if isinstance(v, dict):
-                extract_keys(full_key, v)
-            else:
-                selected_keys.append(full_key)
-    extract_keys("", schema)
-
-    # keyword_descriptions 생성, 반환값 정제
-    def flatten(prefix, d):
-        flat = {}
-        for k, v in d.items():
-            full_key = f"{prefix}.{k}" if prefix else k
-            if isinstance(v, dict):
-                flat.update(flatten(full_key, v))
-            else:
-                flat[full_key] = v
-        return flat
-
-    keyword_descriptions = flatten("", schema)
-    keyword_review_info = "\n".join(
-        f"- `{key}`: {desc}" for key, desc in keyword_descriptions.items() if key in selected_keys
-    )
-    
-    filtered_fields = {}
-    for key_path in selected_keys:
-        parts = key_path.split(".")
-        sub_data = contract_fields
-        sub_result = filtered_fields
-
-        for i, part in enumerate(parts):
-            if isinstance(sub_data, dict) and part in sub_data:
-                if i == len(parts) - 1:
-                    # 마지막 키라면 값 할당
-                    sub_result[part] = sub_data[part]
-                else:
-                    if part not in sub_result:
-                        sub_result[part] = {}
-                    sub_result = sub_result[part]
-                    sub_data = sub_data[part]
-            else:
-                break  # 키가 없으면 무시
-
-    prompt = f"""
-        다음은 작성된 계약서에서 추출된 중요 키워드의 JSON 형식입니다. 
-
-        각 항목의 값이 공란("")일 경우에만 법률적 관점에서 검토하고, 그에 따른 간단한 문제 설명을 작성해 주세요.
-        값이 비어있지 않은 항목은 응답에서 빈 문자열("")로 남겨두고, 절대 코멘트하지 마세요.
-
-        ❗주의사항:
-        - 반드시 JSON 형식으로 출력하세요.
-        - 모든 키(key)와 문자열 값(value)은 **이중 따옴표(")** 를 사용하세요.
-        - **단일 따옴표(')** 는 절대 사용하지 마세요.
-        - 응답에는 JSON 외의 설명, 해석, 안내 문구를 포함하지 마세요.
-        - JSON 구조는 입력과 동일하게 유지해 주세요.
-
-        [검토 대상 키워드]
-        {json.dumps(filtered_fields, indent=2, ensure_ascii=False)}
-
-        [각 키워드의 법적 의미 및 목적]
-        {keyword_review_info}
-
-        [지시사항]
-        - 공란("")인 항목에 대해서만, 해당 키워드의 법적 의미를 참고해 발생할 수 있는 문제를 간단히 작성해 주세요.
-        - 비어있지 않은 값은 빈 문자열("")로 출력하고, 관련 코멘트는 하지 마세요.
-    """
-
-    messages = [
-        {
-            "role": "system", 
-            "content": (
-                "당신은 법률 문서를 검토하는 전문가입니다. "
-            )
-        },
-        {
-            "role": "user", 
-            "content": prompt
-        }
-    ]
-    
+
+    # 공란이 없거나 모두 라이브러리‧캐시된 제안으로 채울 수 있으면 GPT 호출 생략
+    field_paths = pending_annotation_paths(contract_type, contract_fields)
+    if not field_paths:
+        increment("annotation_skipped")
+        return merge_suggestions(contract_type, contract_fields, {})
+
+    messages = build_annotation_messages(contract_type, field_paths)
     result = gpt_caller(messages)
-    
     try:
-        suggestions = json.loads(result)
-        return flatten("", suggestions)
-    except json.JSONDecodeError as e:
-        raise ValueError(f"GPT 응답에서 JSON 파싱 실패:\n{result}\n\n에러: {e}")
\ No newline at end of file
+        suggestions = parse_suggestions(result)
+    except ValueError:
+        discard_cached_response(messages)
+        raise
+    return merge_suggestions(contract_type, contract_fields, suggestions)
+
+
+# 공란 제안 생성 (asyncio 파이프라인용)
+async def aannotate_contract_text(
+    contract_type: str,
+    contract_fields: dict,
+    agpt_caller: Callable[[List[Dict[str, str]]], Awaitable[str]]
+) -> dict:
+
+    # 공란 제안 캐시(Redis) 조회‧기록은 이벤트 루프를 막지 않도록 스레드에서 실행
+    field_paths = await asyncio.to_thread(pending_annotation_paths, contract_type, contract_fields)
+    if not field_paths:
+        increment("annotation_skipped")
+        return await asyncio.to_thread(merge_suggestions, contract_type, contract_fields, {})
+
+    messages = build_annotation_messages(contract_type, field_paths)
+    result = await agpt_caller(messages)
+    try:
+        suggestions = parse_suggestions(result)
+    except ValueError:
+        discard_cached_response(messages)
+        raise
+    return await asyncio.to_thread(merge_suggestions, contract_type, contract_fields, suggestions)
+
+
+# 검토 대상 필드 중 값이 공란("")인 필드 경로 (스키마 순서)
+def blank_field_paths(contract_type: str, contract_fields: dict) -> List[str]:
+    # 검토 키 경로는 스키마 컴파일 시 미리 나눠 둔 것을 사용
+    compiled = get_compiled_review_schema(contract_type)
+
+    blanks = []
+    for key, parts in zip(compiled.keys, compiled.key_parts):
+        value = contract_fields
+        for part in parts:
+            if not isinstance(value, dict) or part not in value:
+                value = None  # 키가 없으면 무시
+                break
+            value = value[part]
+        if isinstance(value, str) and not value.strip():
+            blanks.append(key)
+    return blanks
+
+
+# GPT 에 물어야 하는 공란 필드 경로 (라이브러리 항목이나 캐시된 일반 제안이 있는 필드는 제외)
+def pending_annotation_paths(contract_type: str, contract_fields: dict) -> List[str]:
+    # GPT 정제 단계가 꺼져 있으면 라이브러리에 없는 필드는 제안 없이 둠
+    if not settings.SUGGESTION_LLM_REFINEMENT:
+        return []
+    blanks = blank_field_paths(contract_type, contract_fields)
+    covered = library_suggestions(contract_type, blanks)
+    blanks = [path for path in blanks if path not in covered]
+    if suggestion_cache is None or not blanks:
+        return blanks
+    cached = suggestion_cache.lookup(contract_type, blanks)
+    return [path for path in blanks if path not in cached]
+
+
+# 공란 검토 프롬프트 메시지 구성 (field_paths: 제안이 필요한 공란 필드 경로)
+def build_annotation_messages(
+    contract_type: str,
+    field_paths: List[str]
+) -> List[Dict[str, str]]:
+
+    blank_fields = {}
+    for path in field_paths:
+        parts = path.split(".")
+        sub_result = blank_fields
+        for part in parts[:-1]:
+            sub_result = sub_result.setdefault(part, {})
+        sub_result[parts[-1]] = ""
+
+    # 정적 접두부(지시문 + 검토 키워드 설명)는 계약 유형별로 미리 렌더링된 것을 사용
+    return get_annotation_template(contract_type).render(
+        fields_json=json.dumps(blank_fields, indent=2, ensure_ascii=False)
+    )
+
+
+# 공란 필드별 제안 평탄화 맵 구성
+#   라이브러리 > GPT 제안 > 캐시된 일반 제안 순으로 채우고, 값이 있는 필드와 응답에 없는 키는 빈 문자열로 둠
+def merge_suggestions(contract_type: str, contract_fields: dict, suggestions: dict) -> dict:
+    compiled = get_compiled_review_schema(contract_type)
+    blanks = blank_field_paths(contract_type, contract_fields)
+    library = library_suggestions(contract_type, blanks)
+    uncovered = [path for path in blanks if path not in library]
+
+    cached = {}
+    if suggestion_cache is not None and uncovered:
+        cached = suggestion_cache.lookup(contract_type, uncovered)
+        suggestion_cache.record(contract_type, uncovered, suggestions)
+
+    merged = dict.fromkeys(compiled.keys, "")
+    merged.update(library)
+    for path in uncovered:
+        text = suggestions.get(path)
+        merged[path] = text if isinstance(text, str) and text.strip() else cached.get(path, "")
+    return merged
+
+
+# GPT 응답 JSON 파싱(형식 오류는 복구) 및 평탄화
+def parse_suggestions(result: str) -> dict:
+    try:
+        suggestions = loads_tolerant(result)
+    except ValueError as e:
+        raise ValueError(f"GPT 응답에서 JSON 파싱 실패:\n{result}\n\n에러: {e}")
+    if not isinstance(suggestions, dict):
+        raise ValueError(f"GPT 응답이 JSON 객체가 아님:\n{result}")
+    return _flatten("", suggestions)
+
+
+# GPT 응답(제안 JSON) 평탄화
+def _flatten(prefix, d):
+    flat = {}
+    for k, v in d.items():
+        full_key = f"{prefix}.{k}" if prefix else k
+        if isinstance(v, dict):
+            flat.update(_flatten(full_key, v))
+        else:
+            flat[full_key] = v
+    return flat
@@ -0,0 +1,130 @@
+# 계약 유형 판단 + 필드 추출 통합 모듈 (GENERATION_COMBINED_EXTRACTION)
+#
+# 유형 판단과 필드 추출을 GPT 호출 한 번으로 처리합니다.
+# 응답 형식은 OpenAI Structured Outputs(json_schema, strict)로 강제하며, 스키마는 keyword_schema 의
+# 모든 계약 유형을 판별 필드(type)로 구분하는 합집합(anyOf)으로 모듈 로드 시 자동 생성합니다.
+#
+#   {"result": {"type": "임대차", "fields": {...임대차 필드 구조...}}}
+#
+# 필드 구조를 스키마가 보장하므로 프롬프트에는 키워드 설명 블록을 넣지 않습니다(설명은 스키마 description).
+
+from typing import Awaitable, Callable, Dict, List, Tuple
+
+from app.core.config import settings
+from app.core.llm import discard_cached_response
+from app.core.transcript_store import aread_transcript, read_transcript
+from app.prompts.json_repair import loads_tolerant
+from app.prompts.keyword_schema import keyword_schema
+from app.prompts.templates import COMBINED_TEMPLATE
+from app.prompts.token_budget import fit_transcript
+from app.prompts.type_classifier import TYPE_CUES
+
+
+# keyword_schema 의 중첩 dict → strict JSON 스키마 객체 (말단은 설명이 붙은 문자열)
+def _object_schema(d: dict) -> dict:
+    properties = {
+        key: _object_schema(value) if isinstance(value, dict)
+        else {"type": "string", "description": value}
+        for key, value in d.items()
+    }
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": list(properties),
+        "additionalProperties": False,
+    }
+
+
+def build_combined_json_schema(schemas: Dict[str, dict]) -> dict:
+    """계약 유형별 필드 스키마를 type 필드로 구분되는 합집합 스키마로 만듭니다."""
+    variants = [
+        {
+            "type": "object",
+            "properties": {
+                "type": {"type": "string", "enum": [contract_type]},
+                "fields": _object_schema(schema),
+            },
+            "required": ["type", "fields"],
+            "additionalProperties": False,
+        }
+        for contract_type, schema in schemas.items()
+    ]
+    # Structured Outputs 는 최상위에 anyOf 를 허용하지 않으므로 result 로 한 번 감쌈
+    return {
+        "type": "object",
+        "properties": {"result": {"anyOf": variants}},
+        "required": ["result"],
+        "additionalProperties": False,
+    }
+
+
+COMBINED_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "contract_extraction",
+        "strict": True,
+        "schema": build_combined_json_schema(keyword_schema),
+    },
+}
+
+_ALL_CUES = [cue for cues in TYPE_CUES.values() for cue in cues]
+
+
+# 대화 내용에서 계약 유형과 계약서 필드를 함께 추출하기
+def extract_combined(
+    script_filename: str,
+    gpt_caller: Callable[..., str]
+) -> Tuple[str, dict]:
+
+    conversation_text = read_transcript(script_filename)
+
+    messages = build_combined_messages(conversation_text)
+    result = gpt_caller(
+        messages,
+        model=settings.GENERATION_COMBINED_MODEL,
+        response_format=COMBINED_RESPONSE_FORMAT,
+    )
+    return parse_combined_result(result, messages)
+
+
+# 유형 판단 + 필드 추출 (asyncio 파이프라인용)
+async def aextract_combined(
+    script_filename: str,
+    agpt_caller: Callable[..., Awaitable[str]]
+) -> Tuple[str, dict]:
+
+    conversation_text = await aread_transcript(script_filename)
+
+    messages = build_combined_messages(conversation_text)
+    result = await agpt_caller(
+        messages,
+        model=settings.GENERATION_COMBINED_MODEL,
+        response_format=COMBINED_RESPONSE_FORMAT,
+    )
+    return parse_combined_result(result, messages)
+
+
+def build_combined_messages(conversation_text: str) -> List[Dict[str, str]]:
+    conversation_text = fit_transcript(conversation_text, keywords=_ALL_CUES)
+    return COMBINED_TEMPLATE.render(conversation_text=conversation_text)
+
+
+# 응답에서 (계약 유형, 필드) 추출. 형식이 어긋난 응답은 캐시에서 제거 후 ValueError
+def parse_combined_result(
+    result: str,
+    messages: List[Dict[str, str]]
+) -> Tuple[str, dict]:
+    try:
+        payload = loads_tolerant(result)["result"]
+        contract_type = payload["type"]
+        fields = payload["fields"]
+        if not isinstance(contract_type, str) or not isinstance(fields, dict):
+            raise TypeError("unexpected result structure")
+    except (ValueError, KeyError, TypeError) as e:
+        discard_cached_response(
+            messages,
+            model=settings.GENERATION_COMBINED_MODEL,
+            response_format=COMBINED_RESPONSE_FORMAT,
+        )
+        raise ValueError(f"GPT 통합 추출 응답 파싱 실패:\n{result}\n\n에러: {e}")
+    return contract_type, fields
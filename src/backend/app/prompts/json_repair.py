@@ -0,0 +1,195 @@
+# GPT 응답 JSON 복구 파서
+#
+# GPT 가 JSON 앞뒤에 마크다운 코드 펜스(```json)나 설명 문장을 붙이거나, 단일 따옴표·후행 쉼표를 쓰거나,
+# 응답이 중간에 잘리는 경우에도 생성 작업 전체를 다시 돌리지 않도록 응답을 복구합니다.
+#
+# - loads_tolerant: json.loads 를 먼저 시도하고, 실패하면 문자열을 한 번 훑으면서
+#   가장 바깥 객체만 잘라내고 단일 따옴표 문자열 → 이중 따옴표, 후행 쉼표 제거,
+#   True/False/None → true/false/null, 닫히지 않은 문자열·괄호 닫기를 적용한 뒤 다시 파싱
+# - conform_to_schema: 스키마 키 경로 기준으로 빠진 필드는 공란("")으로 채우고 스키마에 없는 키는 버림
+
+import json
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from app.core.logger import logging
+logger = logging.getLogger(__name__)
+
+_PYTHON_LITERALS = {"True": "true", "False": "false", "None": "null"}
+_CLOSING = {"{": "}", "[": "]"}
+
+
+def loads_tolerant(text: str) -> Any:
+    """JSON 문자열을 파싱합니다. 형식이 조금 어긋난 GPT 응답은 복구해서 파싱하고, 불가능하면 ValueError."""
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError as e:
+        first_error = e
+
+    repaired = repair_json(text)
+    if repaired is None:
+        raise ValueError(f"JSON 객체를 찾을 수 없음: {first_error}")
+    try:
+        value = json.loads(repaired)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"JSON 복구 실패: {e}") from first_error
+    logger.debug("GPT 응답 JSON 복구 적용 (원본 오류: %s)", first_error)
+    return value
+
+
+def repair_json(text: str) -> Optional[str]:
+    """
+    text 에서 가장 바깥 JSON 객체를 찾아 표준 JSON 문자열로 정규화합니다. 객체가 없으면 None.
+
+    코드 펜스·앞뒤 설명은 첫 '{' 이전과 짝이 맞는 '}' 이후를 버리는 것으로 함께 제거됩니다.
+    """
+    start = text.find("{")
+    if start < 0:
+        return None
+
+    out = []
+    stack = []        # 열린 괄호
+    quote = None      # 현재 문자열의 따옴표 문자 (문자열 밖이면 None)
+    i = start
+    n = len(text)
+    while i < n:
+        ch = text[i]
+
+        if quote is not None:
+            if ch == "\\" and i + 1 < n:
+                nxt = text[i + 1]
+                # 단일 따옴표 문자열 안의 \' 는 JSON 에서 불필요한 이스케이프
+                out.append(nxt if (quote == "'" and nxt == "'") else ch + nxt)
+                i += 2
+                continue
+            if ch == quote:
+                out.append('"')
+                quote = None
+            elif ch == '"':          # 단일 따옴표 문자열 안의 이중 따옴표
+                out.append('\\"')
+            elif ch == "\n":
+                out.append("\\n")
+            else:
+                out.append(ch)
+            i += 1
+            continue
+
+        if ch in "\"'":
+            quote = ch
+            out.append('"')
+        elif ch in "{[":
+            stack.append(ch)
+            out.append(ch)
+        elif ch in "}]":
+            _strip_trailing_comma(out)
+            if stack:
+                stack.pop()
+            out.append(ch)
+            if not stack:
+                break                 # 가장 바깥 객체 끝
+        elif ch.isalpha():
+            j = i
+            while j < n and (text[j].isalnum() or text[j] == "_"):
+                j += 1
+            word = text[i:j]
+            out.append(_PYTHON_LITERALS.get(word, word))
+            i = j
+            continue
+        else:
+            out.append(ch)
+        i += 1
+
+    # 응답이 중간에 잘린 경우: 열린 문자열과 괄호를 닫음
+    if quote is not None:
+        out.append('"')
+    if stack:
+        _strip_dangling(out)
+        for opener in reversed(stack):
+            _strip_trailing_comma(out)
+            out.append(_CLOSING[opener])
+    return "".join(out)
+
+
+def _strip_trailing_comma(out: list) -> None:
+    while out and out[-1].isspace():
+        out.pop()
+    if out and out[-1].rstrip().endswith(","):
+        out[-1] = out[-1].rstrip()[:-1]
+
+
+# 잘린 위치가 '"key":' 또는 '"key"' 뒤라면 값이 없으므로 해당 키를 버림
+def _strip_dangling(out: list) -> None:
+    text = "".join(out).rstrip()
+    if text.endswith(":"):
+        text = text[:-1].rstrip()
+        key_start = text.rfind('"', 0, len(text) - 1)
+        text = text[:key_start] if key_start >= 0 else text
+    elif text.endswith('"'):
+        # 객체 안의 값 없는 키인지 판단: 직전 구분자가 '{' 또는 ','
+        key_start = text.rfind('"', 0, len(text) - 1)
+        before = text[:key_start].rstrip()
+        if key_start >= 0 and before.endswith(("{", ",")) and _in_object(before):
+            text = before
+    out[:] = [text]
+
+
+def _in_object(prefix: str) -> bool:
+    depth = []
+    quote = False
+    escaped = False
+    for ch in prefix:
+        if quote:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                quote = False
+        elif ch == '"':
+            quote = True
+        elif ch in "{[":
+            depth.append(ch)
+        elif ch in "}]" and depth:
+            depth.pop()
+    return bool(depth) and depth[-1] == "{"
+
+
+def conform_to_schema(
+    payload: Dict[str, Any],
+    key_parts: Sequence[Tuple[str, ...]],
+) -> Tuple[Dict[str, Any], int, int]:
+    """
+    스키마 키 경로 순서대로 payload 를 다시 구성합니다.
+
+    Returns
+    -------
+    tuple[dict, int, int]
+        (스키마와 key 구조가 같은 dict, 공란으로 채운 키 수, 버린 키 수)
+    """
+    result: Dict[str, Any] = {}
+    missing = 0
+    used = 0
+    for parts in key_parts:
+        node: Any = payload
+        for part in parts:
+            node = node.get(part) if isinstance(node, dict) else None
+            if node is None:
+                break
+        if node is None or isinstance(node, (dict, list)):
+            node = ""
+            missing += 1
+        else:
+            used += 1
+
+        target = result
+        for part in parts[:-1]:
+            target = target.setdefault(part, {})
+        target[parts[-1]] = node
+
+    dropped = _count_leaves(payload) - used
+    return result, missing, max(dropped, 0)
+
+
+def _count_leaves(d: Any) -> int:
+    if not isinstance(d, dict):
+        return 1
+    return sum(_count_leaves(v) for v in d.values())
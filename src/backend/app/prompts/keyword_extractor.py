@@ -1,10 +1,20 @@
 # 계약서 키워드 추출 모듈
 
-import json, os
-from typing import Callable, List, Dict
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, List, Dict, Sequence
 
-from app.prompts.keyword_schema import keyword_schema
+from app.prompts.keyword_schema import get_compiled_keyword_schema, matches_schema
+from app.prompts.json_repair import conform_to_schema, loads_tolerant
+from app.prompts.templates import ExtractionShard, get_extraction_shards, get_extraction_template
+from app.prompts.token_budget import fit_transcript
+from app.prompts.type_classifier import TYPE_CUES
 from app.core.config import settings
+from app.core.llm import discard_cached_response
+from app.core.transcript_store import aread_transcript, read_transcript
+
+from app.core.logger import logging
+logger = logging.getLogger(__name__)
     
 # 대화 내용에서 계약서 필드를 JSON 형식으로 추출하기
 def extract_fields(
@@ -12,74 +22,141 @@ def extract_fields(
     contract_type: str,
     gpt_caller: Callable[[List[Dict[str, str]]], str]
 ) -> dict:
-    
-    schema = keyword_schema.get(contract_type, {})
-    
-    # selected_keys 생성
-    selected_keys = []
-    def extract_keys(prefix, d):
-        for k, v in d.items():
-            full_key = f"{prefix}.{k}" if prefix else k
-            if isinstance(v, dict):
-                extract_keys(full_key, v)
-            else:
-                selected_keys.append(full_key)
-    extract_keys("", schema)
-    
-    # keyword_descriptions 생성
-    def flatten_descriptions(prefix, d):
-        flat = {}
-        for k, v in d.items():
-            full_key = f"{prefix}.{k}" if prefix else k
-            if isinstance(v, dict):
-                flat.update(flatten_descriptions(full_key, v))
-            else:
-                flat[full_key] = v
-        return flat
-
-    keyword_descriptions = flatten_descriptions("", schema)
-    keyword_info = "\n".join(
-        f"- `{key}`: {desc}" for key, desc in keyword_descriptions.items() if key in selected_keys
-    )
 
-    file_path = os.path.join(settings.TEXT_UPLOAD_DIR, script_filename)
-    with open(file_path, 'r', encoding='utf-8') as f:
-        conversation_text = f.read()
+    conversation_text = read_transcript(script_filename)
+
+    # 큰 스키마는 최상위 항목 묶음별 요청을 동시에 보내고 병합
+    shards = get_extraction_shards(contract_type)
+    if shards:
+        messages_list = build_shard_messages(conversation_text, contract_type)
+        with ThreadPoolExecutor(max_workers=len(messages_list), thread_name_prefix="extract-shard") as pool:
+            results = list(pool.map(gpt_caller, messages_list))
+        return merge_shard_fields(results, messages_list, shards, contract_type)
+
+    messages = build_extraction_messages(conversation_text, contract_type)
+    result = gpt_caller(messages)
+    return parse_checked_fields(result, messages, contract_type)
 
-    prompt = f"""
-        다음은 작성된 계약에 관한 대화입니다.
 
-        ## 대화 내용:
-        {conversation_text}
+# 계약서 필드 추출 (asyncio 파이프라인용)
+async def aextract_fields(
+    script_filename: str,
+    contract_type: str,
+    agpt_caller: Callable[[List[Dict[str, str]]], Awaitable[str]]
+) -> dict:
 
-        ## 각 키워드의 의미:
-        {keyword_info}
+    conversation_text = await aread_transcript(script_filename)
 
-        아래 지시사항에 따라 단계적으로 사고하고, 최종 결과는 반드시 위 JSON 구조와 동일한 형식으로 작성하세요.
+    shards = get_extraction_shards(contract_type)
+    if shards:
+        messages_list = build_shard_messages(conversation_text, contract_type)
+        tasks = [asyncio.ensure_future(agpt_caller(messages)) for messages in messages_list]
+        try:
+            results = await asyncio.gather(*tasks)
+        finally:
+            # 한 샤드가 실패하면 나머지 요청도 끊음
+            for task in tasks:
+                task.cancel()
+        return merge_shard_fields(results, messages_list, shards, contract_type)
 
-        ## 1단계: 대화 내용을 해석하여 핵심 사실을 파악합니다.
-        - 누가 누구에게 무엇을 제공하는지, 금액, 기한, 조건 등을 이해합니다.
+    messages = build_extraction_messages(conversation_text, contract_type)
+    result = await agpt_caller(messages)
+    return parse_checked_fields(result, messages, contract_type)
 
-        ## 2단계: 각 키워드 의미를 기준으로 대화에서 필요한 정보를 도출합니다.
-        - 대화 내용과 키워드 의미를 비교하며, 해당하는 정보를 찾습니다.
 
-        ## 3단계: 최종 결과를 아래 조건에 맞게 JSON 구조로 출력합니다.
-        - 출력 결과는 반드시 위에 정의된 JSON 구조(계층, 필드명, 형식 포함)를 그대로 따라야 합니다.
-        - 대화에 없는 값은 공란("")으로 채웁니다.
-        - 반드시 JSON 형식으로만 출력하세요.
-        - 모든 key와 value는 이중 따옴표(")를 사용합니다.
-        - 단일 따옴표(')는 절대 사용하지 않습니다.
-        - JSON 외의 설명, 해석, 단계 내용, 안내 문구는 절대 포함하지 않습니다.
-        - 오직 JSON 결과만 출력하세요.
-        - JSON 이외의 텍스트가 포함되면 계약서로서 무효입니다.
-        - 날짜는 반드시 'YYYY-MM-DD' 형식으로 작성합니다. '오늘' 같은 표현은 허용하지 않습니다.
-        """
+# 필드 추출 프롬프트 메시지 구성
+def build_extraction_messages(
+    conversation_text: str,
+    contract_type: str
+) -> List[Dict[str, str]]:
+
+    conversation_text = fit_transcript(conversation_text, keywords=TYPE_CUES.get(contract_type, ()))
+
+    # 정적 접두부(지시문 + 키워드 설명)는 계약 유형별로 미리 렌더링된 것을 사용
+    return get_extraction_template(contract_type).render(conversation_text=conversation_text)
 
-    messages = [{"role": "system", "content": "당신은 계약서를 분석하는 법률 전문가 AI입니다."},
-                {"role": "user", "content": prompt}]
-    result = gpt_caller(messages)
 
+# 샤드별 필드 추출 프롬프트 메시지 구성 (대화 텍스트 압축은 한 번만, 모든 샤드가 같은 접미부 사용)
+def build_shard_messages(
+    conversation_text: str,
+    contract_type: str
+) -> List[List[Dict[str, str]]]:
+
+    conversation_text = fit_transcript(conversation_text, keywords=TYPE_CUES.get(contract_type, ()))
+    return [
+        shard.template.render(conversation_text=conversation_text)
+        for shard in get_extraction_shards(contract_type)
+    ]
+
+
+# 샤드 응답을 정의 순서대로 병합 (각 응답에서 맡은 최상위 항목만 사용) 후 전체 스키마로 검증‧보정
+def merge_shard_fields(
+    results: Sequence[str],
+    messages_list: Sequence[List[Dict[str, str]]],
+    shards: Sequence[ExtractionShard],
+    contract_type: str
+) -> dict:
+    fields: dict = {}
+    for result, messages, shard in zip(results, messages_list, shards):
+        try:
+            part = parse_fields(result)
+        except ValueError:
+            discard_cached_response(messages)
+            raise
+        for section in shard.sections:
+            if section in part:
+                fields[section] = part[section]
+
+    if not matches_schema(contract_type, fields):
+        fields = fill_from_schema(fields, contract_type)
+        if not matches_schema(contract_type, fields):
+            for messages in messages_list:
+                discard_cached_response(messages)
+    return fields
+
+
+# GPT 응답 JSON 파싱 (코드 펜스, 단일 따옴표, 후행 쉼표, 잘린 응답 등은 복구)
+def parse_fields(result: str) -> dict:
+    try:
+        fields = loads_tolerant(result)
+    except ValueError as e:
+        raise ValueError(f"GPT 응답에서 JSON 파싱 실패:\n{result}\n\n에러: {e}")
+    if not isinstance(fields, dict):
+        raise ValueError(f"GPT 응답이 JSON 객체가 아님:\n{result}")
+    return fields
+
+
+# 스키마와 key 구조가 다르면 빠진 필드를 공란으로 채워 맞춤 (응답에 있는 키가 너무 적으면 그대로 반환)
+def fill_from_schema(fields: dict, contract_type: str) -> dict:
+    compiled = get_compiled_keyword_schema(contract_type)
+    if not compiled.keys:
+        return fields
+    conformed, missing, dropped = conform_to_schema(fields, compiled.key_parts)
+    present_ratio = 1 - missing / len(compiled.keys)
+    if present_ratio < settings.GENERATION_SCHEMA_FILL_MIN_RATIO:
+        logger.warning(
+            "필드 보정 생략: type='%s', 응답에 있는 키 비율 %.2f", contract_type, present_ratio
+        )
+        return fields
+    logger.info(
+        "스키마 기준 필드 보정: type='%s', 공란 채움 %d개, 제거 %d개", contract_type, missing, dropped
+    )
+    return conformed
+
+
+# 파싱 실패 또는 보정 후에도 스키마 불일치인 응답은 GPT 응답 캐시에서 제거 (재시도 시 새로 호출되도록)
+def parse_checked_fields(
+    result: str,
+    messages: List[Dict[str, str]],
+    contract_type: str
+) -> dict:
     try:
-        return json.loads(result)
-    except json.JSONDecodeError as e:
-        raise ValueError(f"GPT 응답에서 JSON 파싱 실패:\n{result}\n\n에러: {e}")
\ No newline at end of file
+        fields = parse_fields(result)
+    except ValueError:
+        discard_cached_response(messages)
+        raise
+    if not matches_schema(contract_type, fields):
+        fields = fill_from_schema(fields, contract_type)
+        if not matches_schema(contract_type, fields):
+            discard_cached_response(messages)
+    return fields
@@ -1,3 +1,7 @@
+from typing import Iterable, Set
+
+from app.prompts.schema_compiler import EMPTY_SCHEMA, CompiledSchema, compile_schemas
+
 # 평탄화 key set 추출 함수
 def flatten_keys(d: dict, prefix: str = "") -> set[str]:
     keys = set()
@@ -15,13 +19,17 @@ def is_supported_contract_type(contract_type: str) -> bool:
 
 def matches_schema(contract_type: str, payload_contents: dict) -> bool:
     """대상 계약서 JSON이 keyword_schema와 key 구조가 모두 일치하는지 검증"""
-    schema_keys = _schema_keys.get(contract_type, set())
+    schema_keys = _schema_keys.get(contract_type, frozenset())
     payload_keys = flatten_keys(payload_contents)
     return schema_keys == payload_keys
 
 def is_valid_field_path(contract_type: str, field_path: str) -> bool:
     """대상 key 경로가 keyword_schema에 유효한지 검증"""
-    return field_path in _schema_keys.get(contract_type, set())
+    return field_path in _schema_keys.get(contract_type, frozenset())
+
+def invalid_field_paths(contract_type: str, field_paths: Iterable[str]) -> Set[str]:
+    """대상 key 경로들 중 keyword_schema에 없는 것 (미리 계산한 key 집합과 차집합 한 번으로 검증)"""
+    return set(field_paths) - _schema_keys.get(contract_type, frozenset())
 
 
 keyword_schema = {
@@ -429,7 +437,14 @@ keyword_schema = {
     }
 }
 
+# 계약 유형별 컴파일 산출물 (모듈 로드 시 한 번만 순회)
+compiled_keyword_schema = compile_schemas(keyword_schema)
+
 _schema_keys = {
-    contract_type: flatten_keys(schema)
-    for contract_type, schema in keyword_schema.items()
-}
\ No newline at end of file
+    contract_type: compiled.key_set
+    for contract_type, compiled in compiled_keyword_schema.items()
+}
+
+
+def get_compiled_keyword_schema(contract_type: str) -> CompiledSchema:
+    return compiled_keyword_schema.get(contract_type, EMPTY_SCHEMA)
@@ -6,12 +6,13 @@ import librosa
 import soundfile as sf
 '''
 
-import os
+from itertools import chain
+from typing import Iterable, Iterator
+
 # from hanspell import spell_checker
-from nltk.tokenize import word_tokenize
 
-from app.core.config import settings
-from app.prompts.stopwords import stopwords_set
+from app.core.transcript_store import write_transcript
+from app.prompts.stopword_filter import korean_stopword_filter, tokenize
 
 '''
 # 화자 분리 및 음성 추출 매칭
@@ -134,66 +135,17 @@ def diarized_transcription(audio_nfile, txt_nfile):
             f.write(f"{speaker}: {text}\n")
 '''
 
-'''
-서버 초기화 모듈 또는 배포 과정에서 로드
-# nltk 불용어 다운로드
-## nltk는 한국어 불용어를 제공하지 않음
-## 따로 불용어 리스트를 txt 파일로 지정해둠
-nltk.download('punkt')
-nltk.download('punkt_tab')
-nltk.download('stopwords')
-'''
+# 변환 텍스트 조각 단위 전처리 (STT 결과가 도착하는 대로 처리)
+## 조각 경계를 넘는 여러 토큰 불용어도 제거되도록 하나의 토큰 스트림으로 이어서 필터링
+def preprocess_segments(segments: Iterable[str]) -> Iterator[str]:
+    tokens = chain.from_iterable(tokenize(segment) for segment in segments)
+    return korean_stopword_filter.filter_tokens(tokens)
 
-# 텍스트 전처리
-def text_preprocess(
-    script_filename: str,
-    output_filename: str
-):
-    input_path = os.path.join(settings.TEXT_UPLOAD_DIR, script_filename)
-    output_path = os.path.join(settings.TEXT_UPLOAD_DIR, output_filename)
 
-    with open(input_path, "r", encoding="utf-8") as f:
-        original_text = f.read()
-        
-    '''
-    서버 환경에서는 py-hanspell 맞춤법 검사 비활성화:
-    네이버 API가 불안정하어 장애 가능성이 높아 현재로써는 사용 어려움'''
-    corrected = original_text
-    '''
-    # 맞춤법 교정
-    ### KeyError 예외 처리 및 큰 텍스트 분할 처리
-    try:
-        # 긴 텍스트는 여러 청크로 나누어 처리
-        chunk_size = 500  # 한 번에 처리할 최대 글자 수
-        chunks = [original_text[i:i+chunk_size] for i in range(0, len(original_text), chunk_size)]
-        
-        corrected_chunks = []
-        for chunk in chunks:
-            try:
-                # 각 청크에 대해 맞춤법 검사 수행
-                corrected_chunk = spell_checker.check(chunk)
-                corrected_chunks.append(corrected_chunk.checked)
-            except KeyError:
-                # KeyError가 발생하면 원래 청크를 사용
-                print(f"맞춤법 검사 중 KeyError 발생, 원문 사용: {chunk[:30]}...")
-                corrected_chunks.append(chunk)
-            except Exception as e:
-                # 기타 예외 처리
-                print(f"맞춤법 검사 중 예외 발생: {e}")
-                corrected_chunks.append(chunk)
-                
-        corrected = ' '.join(corrected_chunks)
-    except Exception as e:
-        print(f"맞춤법 검사 전체 과정 중 오류 발생: {e}")
-        corrected = original_text  # 오류 발생 시 원본 텍스트 사용
-    '''
-    
-    # 불용어 제거
-    ## words_token으로 변경 하여 토큰화
-    word_tokens=word_tokenize(corrected)
-    filtered = [word for word in word_tokens if word not in stopwords_set]
-    processed_text = " ".join(filtered)
-    
-    # 결과 저장
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write(processed_text)
+# STT 스트림을 도착하는 대로 전처리하여 결과만 저장소에 기록 (전처리 전 텍스트를 저장하지 않음)
+## 스트림이 끝난 뒤 한 번에 기록하므로 실패 시 일부만 기록된 결과가 남지 않음
+def stream_preprocess(
+    segments: Iterable[str],
+    output_filename: str
+) -> None:
+    write_transcript(output_filename, " ".join(preprocess_segments(segments)))
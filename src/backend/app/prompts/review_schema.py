@@ -1,3 +1,5 @@
+from app.prompts.schema_compiler import EMPTY_SCHEMA, CompiledSchema, compile_schemas
+
 contract_review_schema = {
     # 8가지
     "증여": {
@@ -185,3 +187,10 @@ contract_review_schema = {
     }
 
 }
+
+# 계약 유형별 컴파일 산출물 (모듈 로드 시 한 번만 순회)
+compiled_review_schema = compile_schemas(contract_review_schema)
+
+
+def get_compiled_review_schema(contract_type: str) -> CompiledSchema:
+    return compiled_review_schema.get(contract_type, EMPTY_SCHEMA)
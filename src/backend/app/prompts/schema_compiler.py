@@ -0,0 +1,81 @@
+# 계약 스키마 컴파일 모듈
+#
+# keyword_schema / contract_review_schema 같은 중첩 dict 스키마를 모듈 로드 시 한 번만 순회해
+# 계약 유형별 불변(frozen) 산출물로 바꿔 둡니다. 프롬프트 구성·검증 경로에서는 스키마를 다시 순회하지 않습니다.
+#
+# - keys: 말단 필드 경로("tenant.name")의 정의 순서 튜플
+# - key_parts: keys 를 "." 으로 나눈 튜플 (계약서 JSON 에서 값을 찾아갈 때 사용)
+# - key_set: matches_schema / is_valid_field_path / invalid_field_paths 용 frozenset
+# - descriptions: 경로 → 설명 읽기 전용 매핑
+# - info_block: 프롬프트에 들어가는 "- `경로`: 설명" 블록 문자열
+#
+# split_sections 는 필드 추출을 여러 요청으로 나눌 때(샤딩) 최상위 항목을 묶는 데 씁니다.
+
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, FrozenSet, Iterator, Mapping, Tuple
+
+
+@dataclass(frozen=True)
+class CompiledSchema:
+    keys: Tuple[str, ...]
+    key_parts: Tuple[Tuple[str, ...], ...]
+    key_set: FrozenSet[str]
+    descriptions: Mapping[str, str]
+    info_block: str
+
+
+def _iter_leaves(d: dict, prefix: str = "") -> Iterator[Tuple[str, str]]:
+    for k, v in d.items():
+        full_key = f"{prefix}.{k}" if prefix else k
+        if isinstance(v, dict):
+            yield from _iter_leaves(v, full_key)
+        else:
+            yield full_key, v
+
+
+def compile_schema(schema: dict) -> CompiledSchema:
+    descriptions = dict(_iter_leaves(schema))
+    keys = tuple(descriptions)
+    return CompiledSchema(
+        keys=keys,
+        key_parts=tuple(tuple(key.split(".")) for key in keys),
+        key_set=frozenset(keys),
+        descriptions=MappingProxyType(descriptions),
+        info_block="\n".join(f"- `{key}`: {desc}" for key, desc in descriptions.items()),
+    )
+
+
+def compile_schemas(schemas: Dict[str, dict]) -> Mapping[str, CompiledSchema]:
+    """계약 유형별 스키마 dict 전체를 컴파일합니다."""
+    return MappingProxyType(
+        {contract_type: compile_schema(schema) for contract_type, schema in schemas.items()}
+    )
+
+
+def split_sections(schema: dict, shards: int) -> Tuple[dict, ...]:
+    """
+    최상위 항목(섹션)을 정의 순서대로 말단 필드 수가 고르게 최대 ``shards`` 묶음으로 나눕니다.
+
+    섹션은 쪼개지 않으며, 각 섹션은 누적 필드 수의 중간 지점이 속하는 묶음에 들어갑니다.
+    """
+    sizes = [
+        (key, value, sum(1 for _ in _iter_leaves(value)) if isinstance(value, dict) else 1)
+        for key, value in schema.items()
+    ]
+    total = sum(size for _, _, size in sizes)
+    if shards <= 1 or total == 0:
+        return (schema,)
+
+    target = total / shards
+    groups: list = [{} for _ in range(shards)]
+    filled = 0
+    for key, value, size in sizes:
+        index = min(shards - 1, int((filled + size / 2) / target))
+        groups[index][key] = value
+        filled += size
+    return tuple(group for group in groups if group)
+
+
+# 스키마에 없는 계약 유형용 빈 산출물
+EMPTY_SCHEMA = compile_schema({})
@@ -0,0 +1,115 @@
+# 한국어 불용어 제거 엔진
+#
+# - tokenize: 정규식 기반 토크나이저 (NLTK word_tokenize 대체, 단어/숫자 덩어리와 문장부호를 분리)
+# - StopwordFilter: 불용어 목록을 토큰열 패턴으로 바꿔 Aho–Corasick 자동자를 한 번만 구성하고,
+#   토큰 스트림을 한 번 훑으면서 "예를 들면" 같은 여러 토큰 불용어와 단일 토큰 불용어를 함께 제거
+#
+# 토큰 단위로 동작하므로 "예를"이 "예를 들면"의 일부일 때만 지워지고, 단어 내부 부분 문자열은 지우지 않습니다.
+# 기본 필터(korean_stopword_filter)는 기존처럼 띄어쓰기 없는 불용어만 지우고, 여러 토큰 불용어는
+# STOPWORD_MULTI_TOKEN_ENABLED 일 때 선별 목록(multi_token_stopwords)만 지웁니다.
+
+import re
+from collections import deque
+from typing import Dict, Iterable, Iterator, List
+
+from app.core.config import settings
+from app.prompts.stopwords import multi_token_stopwords, stopwords_set
+
+# 단어·숫자 덩어리("4,200만", "2024-05-01", "9시부터")와 그 외 기호 한 글자를 토큰으로 분리
+_TOKEN_PATTERN = re.compile(r"\w+(?:[.,:\-]\w+)*|[^\w\s]")
+
+
+def tokenize(text: str) -> Iterator[str]:
+    for match in _TOKEN_PATTERN.finditer(text):
+        yield match.group()
+
+
+class StopwordFilter:
+    """토큰열 Aho–Corasick 자동자. 상태 전이표는 상태별 dict(토큰 → 다음 상태)."""
+
+    def __init__(self, stopwords: Iterable[str]) -> None:
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._match_len: List[int] = [0]  # 해당 상태에서 끝나는 가장 긴 불용어의 토큰 수
+        self.max_len = 0
+
+        for stopword in stopwords:
+            pattern = list(tokenize(stopword))
+            if pattern:
+                self._add_pattern(pattern)
+        self._build_failure_links()
+
+    def _add_pattern(self, pattern: List[str]) -> None:
+        state = 0
+        for token in pattern:
+            next_state = self._goto[state].get(token)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][token] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._match_len.append(0)
+            state = next_state
+        self._match_len[state] = max(self._match_len[state], len(pattern))
+        self.max_len = max(self.max_len, len(pattern))
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(token, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                # 실패 링크로 이어지는 더 짧은 불용어도 이 상태에서 끝남
+                self._match_len[next_state] = max(
+                    self._match_len[next_state], self._match_len[self._fail[next_state]]
+                )
+
+    def _step(self, state: int, token: str) -> int:
+        while state and token not in self._goto[state]:
+            state = self._fail[state]
+        return self._goto[state].get(token, 0)
+
+    def filter_tokens(self, tokens: Iterable[str]) -> Iterator[str]:
+        """
+        불용어에 해당하지 않는 토큰만 순서대로 내보냅니다.
+
+        여러 토큰 불용어가 뒤에서 완성될 수 있으므로 최근 (max_len - 1)개 토큰은
+        판정이 끝날 때까지 보류했다가 내보냅니다.
+        """
+        state = 0
+        pending: deque = deque()  # [token, removed]
+        hold = max(self.max_len - 1, 0)
+
+        for token in tokens:
+            state = self._step(state, token)
+            pending.append([token, False])
+            for i in range(1, self._match_len[state] + 1):
+                pending[-i][1] = True
+            while len(pending) > hold:
+                token_out, removed = pending.popleft()
+                if not removed:
+                    yield token_out
+
+        for token_out, removed in pending:
+            if not removed:
+                yield token_out
+
+    def filter_text(self, text: str) -> str:
+        return " ".join(self.filter_tokens(tokenize(text)))
+
+
+def _default_stopwords() -> List[str]:
+    # stopwords_set 의 띄어쓰기가 있는 항목은 부정 표현 등이 섞여 있어 제외 (stopwords.multi_token_stopwords 참고)
+    stopwords = [stopword for stopword in stopwords_set if len(stopword.split()) == 1]
+    if settings.STOPWORD_MULTI_TOKEN_ENABLED:
+        stopwords.extend(multi_token_stopwords)
+    return stopwords
+
+
+# 모듈 로드 시 한 번만 구성
+korean_stopword_filter = StopwordFilter(_default_stopwords())
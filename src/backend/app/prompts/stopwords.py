@@ -681,3 +681,18 @@ stopwords_set: set = {
     "그러시군요",
     "뭐",
 }
+
+# 여러 토큰 불용어 (STOPWORD_MULTI_TOKEN_ENABLED 일 때만 제거)
+# stopwords_set 의 띄어쓰기가 있는 항목은 토큰별 조회로는 지워진 적이 없고, "하지 않도록", "할 줄 안다"처럼
+# 부정‧조건‧능력을 나타내는 표현이 많아 그대로 지우면 대화의 의미가 바뀜. 의미 없는 담화 표지만 골라 둠.
+multi_token_stopwords: tuple = (
+    "예를 들면",
+    "예를 들자면",
+    "다시 말하자면",
+    "바꾸어서 말하면",
+    "바꿔 말하면",
+    "대해 말하자면",
+    "상대적으로 말하자면",
+    "총적으로 말하면",
+    "총적으로 보면",
+)
@@ -0,0 +1,106 @@
+# GPT 스트리밍 응답 검증기 (app.core.llm.stream_gpt_api 의 validator)
+#
+# 응답 조각을 도착 순서대로 받아, 끝까지 받아 봐야 결과가 무효인 것이 명백해지면
+# StreamValidationError 를 발생시켜 남은 토큰 생성을 멈춥니다. 검증기는 상태를 가지므로 호출마다 새로 만듭니다.
+#
+# - TypeAnswerValidator: 유형 판단 응답이 더 이상 어떤 유형 이름('기타' 포함)의 앞부분도 될 수 없으면 중단
+#   (유형 이름으로 이어지는 동안은 길이와 관계없이 끝까지 받음)
+# - SchemaKeyOrderValidator: 필드 추출 JSON 의 키 경로를 점진적으로 읽어 스키마에 없는 키나
+#   스키마 정의 순서를 거스르는 키가 누적되면 중단 (조금 어긋난 정도는 json_repair 보정에 맡김)
+
+from typing import Dict, List, Optional
+
+from app.core.config import settings
+from app.core.llm import StreamValidationError
+from app.prompts.keyword_schema import get_compiled_keyword_schema
+from app.prompts.type_classifier import is_type_answer_prefix
+
+
+class TypeAnswerValidator:
+    def __init__(self) -> None:
+        self._parts: List[str] = []
+
+    def feed(self, delta: str) -> None:
+        self._parts.append(delta)
+        answer = "".join(self._parts)
+        if not is_type_answer_prefix(answer):
+            raise StreamValidationError(f"유형 판단 응답이 계약 유형 이름이 아님 ('{answer[:20]}')")
+
+
+class JsonKeyScanner:
+    """JSON 텍스트 조각을 이어 받아, 객체 키가 완성될 때마다 점(.)으로 이은 키 경로를 돌려줍니다."""
+
+    def __init__(self) -> None:
+        self._stack: List[List[Optional[str]]] = []  # [컨테이너 종류, 현재 키]
+        self._in_string = False
+        self._escape = False
+        self._buffer: List[str] = []
+        self._last_string: Optional[str] = None
+
+    def feed(self, chunk: str) -> List[str]:
+        paths = []
+        for ch in chunk:
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                    self._buffer.append(ch)
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    self._last_string = "".join(self._buffer)
+                else:
+                    self._buffer.append(ch)
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                self._buffer = []
+            elif ch in "{[":
+                self._stack.append([ch, None])
+                self._last_string = None
+            elif ch in "}]":
+                if self._stack:
+                    self._stack.pop()
+                self._last_string = None
+            elif ch == ":" and self._stack and self._stack[-1][0] == "{" and self._last_string is not None:
+                self._stack[-1][1] = self._last_string
+                paths.append(".".join(key for kind, key in self._stack if kind == "{" and key is not None))
+                self._last_string = None
+            elif ch == ",":
+                self._last_string = None
+        return paths
+
+
+class SchemaKeyOrderValidator:
+    def __init__(self, contract_type: str, max_divergence: Optional[int] = None) -> None:
+        compiled = get_compiled_keyword_schema(contract_type)
+        self._leaf_index: Dict[str, int] = {key: i for i, key in enumerate(compiled.keys)}
+        # 중간 노드 경로("tenant")까지 포함한 유효 경로 집합
+        self._valid_paths = {
+            ".".join(parts[:depth])
+            for parts in compiled.key_parts
+            for depth in range(1, len(parts) + 1)
+        }
+        self._max_divergence = (
+            max_divergence if max_divergence is not None else settings.LLM_STREAM_MAX_KEY_DIVERGENCE
+        )
+        self._scanner = JsonKeyScanner()
+        self._last_index = -1
+        self._divergence = 0
+
+    def feed(self, delta: str) -> None:
+        if not self._leaf_index:
+            return
+        for path in self._scanner.feed(delta):
+            if path not in self._valid_paths:
+                self._divergence += 1
+            elif path in self._leaf_index:
+                index = self._leaf_index[path]
+                if index < self._last_index:
+                    self._divergence += 1
+                self._last_index = max(self._last_index, index)
+            if self._divergence > self._max_divergence:
+                raise StreamValidationError(
+                    f"필드 추출 응답이 스키마 키 구조에서 벗어남 (마지막 키 '{path}')"
+                )
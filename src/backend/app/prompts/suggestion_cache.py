@@ -0,0 +1,99 @@
+# 공란 제안 캐시 모듈 (자주 비는 필드의 일반 제안 재사용)
+#
+# 공란 검토 프롬프트에는 대화 내용 없이 비어 있는 필드 경로만 들어가므로, 같은 (계약 유형, 필드 경로)에 대한
+# GPT 제안은 계약마다 표현만 조금 다를 뿐 사실상 일반적인 설명입니다.
+# 필드 경로별로 공란 횟수와 마지막 GPT 제안을 기록해 두고, 공란 횟수가 SUGGESTION_CACHE_MIN_COUNT 이상인
+# (= 자주 비는) 필드는 저장된 제안을 그대로 사용해 GPT 요청에서 뺍니다.
+#
+# 항목은 Redis(app.core.shared_cache)에 두어 모든 워커의 공란 횟수가 한곳에 합쳐집니다.
+#   suggest:counts 정렬셋 "<계약 유형>/<필드 경로>" → 공란 횟수 (최대 개수를 넘으면 횟수가 가장 적은 항목부터 제거)
+#   suggest:texts  해시   "<계약 유형>/<필드 경로>" → 마지막 GPT 제안
+# Redis 호출은 동기이므로 asyncio 경로(annotater.aannotate_contract_text)는 asyncio.to_thread 로 부릅니다.
+
+from typing import Dict, Iterable, List, Optional
+
+from app.core.config import settings
+from app.core.metrics import increment
+from app.core.shared_cache import SharedCache
+
+from app.core.logger import logging
+logger = logging.getLogger(__name__)
+
+
+class SuggestionCache:
+    """(계약 유형, 필드 경로) → 공란 횟수, 일반 제안."""
+
+    def __init__(self, min_count: int, max_entries: int) -> None:
+        self._min_count = min_count
+        self._max_entries = max_entries
+        self._cache = SharedCache("suggest:")
+        self._counts_key = self._cache.key("counts")
+        self._texts_key = self._cache.key("texts")
+
+    def lookup(self, contract_type: str, field_paths: Iterable[str]) -> Dict[str, str]:
+        """자주 비는 필드 중 제안이 저장된 것만 {필드 경로: 제안} 으로 반환합니다."""
+        paths = list(field_paths)
+        if not paths:
+            return {}
+        members = [_member(contract_type, path) for path in paths]
+
+        def _lookup(client) -> List:
+            pipe = client.pipeline()
+            for member in members:
+                pipe.zscore(self._counts_key, member)
+            pipe.hmget(self._texts_key, members)
+            return pipe.execute()
+
+        results = self._cache.run(_lookup, None)
+        if results is None:
+            return {}
+        counts, texts = results[:-1], results[-1]
+        found = {
+            path: text
+            for path, count, text in zip(paths, counts, texts)
+            if count is not None and count >= self._min_count and text
+        }
+        increment("suggestion_cache_hit", len(found))
+        return found
+
+    def record(
+        self, contract_type: str, blank_paths: Iterable[str], suggestions: Dict[str, str]
+    ) -> None:
+        """이번 계약의 공란 필드 횟수를 세고, GPT 가 새로 작성한 제안을 저장합니다."""
+        paths = list(blank_paths)
+        if not paths:
+            return
+
+        def _record(client) -> None:
+            pipe = client.pipeline()
+            for path in paths:
+                member = _member(contract_type, path)
+                pipe.zincrby(self._counts_key, 1, member)
+                text = suggestions.get(path)
+                if isinstance(text, str) and text.strip():
+                    pipe.hset(self._texts_key, member, text.strip())
+            pipe.zcard(self._counts_key)
+            size = pipe.execute()[-1]
+
+            overflow = size - self._max_entries
+            if overflow > 0:
+                evicted = [member for member, _ in client.zpopmin(self._counts_key, overflow)]
+                if evicted:
+                    client.hdel(self._texts_key, *evicted)
+
+        self._cache.run(_record, None)
+
+
+def _member(contract_type: str, field_path: str) -> str:
+    return f"{contract_type}/{field_path}"
+
+
+# 전역 싱글턴 (비활성화 시 None)
+suggestion_cache: Optional[SuggestionCache] = (
+    SuggestionCache(
+        min_count=settings.SUGGESTION_CACHE_MIN_COUNT,
+        max_entries=settings.SUGGESTION_CACHE_MAX_ENTRIES,
+    )
+    if settings.SUGGESTION_CACHE_ENABLED
+    else None
+)
@@ -0,0 +1,129 @@
+# 공란 제안 라이브러리 모듈 (오프라인 구축, (계약 유형, 필드 경로) → 제안 문구)
+#
+# contract_review_schema 의 키워드 설명은 이미 필드별 법적 위험 문장이고, 저장된 GptSuggestion 대부분은
+# 그 문장을 조금 바꿔 쓴 것입니다. 그래서 공란 필드의 제안은 라이브러리에서 바로 꺼내 쓰고,
+# 라이브러리에 없는 필드만 GPT 로 작성합니다(SUGGESTION_LLM_REFINEMENT, app.prompts.annotater).
+#
+# 라이브러리는 오프라인으로 구축한 JSON 파일(SUGGESTION_LIBRARY_PATH)에서 읽습니다. 파일은 저장된 제안 중
+# 필드별로 가장 자주 나온 문구로 만들므로, 충분히 쌓이지 않은 필드는 라이브러리에 없고 GPT 가 작성합니다:
+#
+#     python -m app.prompts.suggestion_library [--output PATH] [--min-count 3] [--include-schema]
+#
+# 검토 스키마 문장은 모든 필드를 덮으므로 기본값으로 쓰지 않습니다. SUGGESTION_LIBRARY_SCHEMA_SEED 를 켜거나
+# --include-schema 로 구축하면 스키마 문장이 라이브러리에 들어가고, 그 필드는 GPT 제안을 쓰지 않습니다.
+
+import argparse
+import json
+from collections import Counter, defaultdict
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, Iterable, Mapping
+
+from app.core.config import settings
+from app.prompts.review_schema import compiled_review_schema
+
+from app.core.logger import logging
+logger = logging.getLogger(__name__)
+
+
+# 검토 스키마 문장으로 만든 라이브러리 (SUGGESTION_LIBRARY_SCHEMA_SEED / --include-schema)
+def _schema_library() -> Dict[str, Dict[str, str]]:
+    return {
+        contract_type: dict(compiled.descriptions)
+        for contract_type, compiled in compiled_review_schema.items()
+    }
+
+
+def _load_library(path: str, schema_seed: bool) -> Mapping[str, Mapping[str, str]]:
+    library = _schema_library() if schema_seed else {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        for contract_type, entries in data.items():
+            library.setdefault(contract_type, {}).update(
+                {k: v for k, v in entries.items() if isinstance(v, str) and v.strip()}
+            )
+        logger.info("공란 제안 라이브러리 로드: %s", path)
+    except FileNotFoundError:
+        pass
+    except (json.JSONDecodeError, ValueError, TypeError, AttributeError) as exc:
+        logger.warning("공란 제안 라이브러리 파일 손상, 무시: %s", exc)
+    return MappingProxyType(
+        {contract_type: MappingProxyType(entries) for contract_type, entries in library.items()}
+    )
+
+
+# 전역 라이브러리 (비활성화 시 빈 매핑)
+suggestion_library: Mapping[str, Mapping[str, str]] = (
+    _load_library(settings.SUGGESTION_LIBRARY_PATH, settings.SUGGESTION_LIBRARY_SCHEMA_SEED)
+    if settings.SUGGESTION_LIBRARY_ENABLED
+    else MappingProxyType({})
+)
+
+
+def library_suggestions(contract_type: str, field_paths: Iterable[str]) -> Dict[str, str]:
+    """라이브러리에 항목이 있는 필드만 {필드 경로: 제안} 으로 반환합니다."""
+    entries = suggestion_library.get(contract_type, {})
+    return {path: entries[path] for path in field_paths if path in entries}
+
+
+# --------------------------------------------------------------------------- #
+# 오프라인 구축
+# --------------------------------------------------------------------------- #
+def _stored_suggestions(min_count: int) -> Dict[str, Dict[str, str]]:
+    """저장된 GptSuggestion 에서 (계약 유형, 필드 경로)별 가장 자주 나온 문구 (min_count 회 이상)."""
+    from sqlalchemy import select
+
+    from app.db.session import get_sync_session
+    from app.models.contract import Contract
+    from app.models.suggestion import GptSuggestion
+
+    counts: Dict[tuple, Counter] = defaultdict(Counter)
+    session = get_sync_session()
+    try:
+        rows = session.execute(
+            select(Contract.contract_type, GptSuggestion.field_path, GptSuggestion.suggestion_text)
+            .join(Contract, Contract.id == GptSuggestion.contract_id)
+        )
+        for contract_type, field_path, text in rows:
+            counts[(contract_type, field_path)][text.strip()] += 1
+    finally:
+        session.close()
+
+    library: Dict[str, Dict[str, str]] = defaultdict(dict)
+    for (contract_type, field_path), counter in counts.items():
+        compiled = compiled_review_schema.get(contract_type)
+        if compiled is None or field_path not in compiled.key_set:
+            continue
+        text, count = counter.most_common(1)[0]
+        if text and count >= min_count:
+            library[contract_type][field_path] = text
+    return library
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="공란 제안 라이브러리 JSON 구축")
+    parser.add_argument("--output", type=Path, default=Path(settings.SUGGESTION_LIBRARY_PATH))
+    parser.add_argument("--min-count", type=int, default=3, help="저장된 제안 문구를 채택할 최소 등장 횟수")
+    parser.add_argument(
+        "--include-schema", action="store_true",
+        help="검토 스키마 문장을 기본값으로 포함 (모든 필드가 라이브러리로 채워져 GPT 제안을 쓰지 않음)",
+    )
+    args = parser.parse_args()
+
+    library = _schema_library() if args.include_schema else {}
+    adopted = 0
+    for contract_type, entries in _stored_suggestions(args.min_count).items():
+        library.setdefault(contract_type, {}).update(entries)
+        adopted += len(entries)
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = args.output.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(library, indent=2, ensure_ascii=False), encoding="utf-8")
+    tmp_path.replace(args.output)
+    total = sum(len(entries) for entries in library.values())
+    print(f"라이브러리 저장: {args.output} (항목 {total}개, 저장된 제안 채택 {adopted}개)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+# 프롬프트 템플릿 모듈
+#
+# 각 프롬프트를 "정적 접두부(system 메시지) + 가변 접미부(user 메시지)"로 나눠 둡니다.
+# - 정적 접두부: 지시문과 계약 유형별 키워드 설명 블록. 모듈 로드 시 계약 유형마다 한 번 렌더링하고
+#   sys.intern 으로 공유하므로 호출마다 큰 상수 문자열을 다시 만들지 않습니다.
+# - 가변 접미부: 대화 텍스트, 계약서 필드 JSON 등 호출마다 바뀌는 내용만 담고 항상 마지막에 위치합니다.
+#
+# 요청의 앞부분이 항상 같으므로 OpenAI 프롬프트 캐싱(동일 접두부 1024 토큰 이상)이 적용되어
+# 캐시 적중분 과금 할인과 첫 토큰 지연 단축을 기대할 수 있습니다. 적중량은 app.core.llm 의
+# 사용량 집계(llm_prompt_cached_tokens)로 확인합니다.
+
+import sys
+import textwrap
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Tuple
+
+from app.core.config import settings
+from app.prompts.keyword_schema import compiled_keyword_schema, keyword_schema
+from app.prompts.review_schema import compiled_review_schema
+from app.prompts.schema_compiler import EMPTY_SCHEMA, compile_schema, split_sections
+
+
+@dataclass(frozen=True)
+class PromptTemplate:
+    system: str  # 정적 접두부
+    suffix: str  # 가변 접미부 (str.format 형식)
+
+    def render(self, **variables: str) -> List[Dict[str, str]]:
+        return [
+            {"role": "system", "content": self.system},
+            {"role": "user", "content": self.suffix.format(**variables)},
+        ]
+
+
+# 여러 줄 블록(키워드 설명 등)은 dedent 이후에 채워 넣어야 들여쓰기가 깨지지 않음
+def _static(text: str, **blocks: str) -> str:
+    return sys.intern(textwrap.dedent(text).strip().format(**blocks))
+
+
+# --------------------------------------------------------------------------- #
+# 계약 유형 판단
+# --------------------------------------------------------------------------- #
+# 유형 판단 기준 (유형 판단 / 통합 추출 프롬프트 공용)
+_TYPE_CRITERIA = """
+    - 증여: 무상으로 재산을 이전하는 계약.
+    - 매매: 일방이 부동산의 소유권을 이전하고, 상대방이 그 대금을 지급하기로 약정하는 계약.
+    - 교환: 쌍방이 서로 부동산의 소유권을 맞교환 하는 계약.
+    - 소비대차: 일방이 금전 또는 대체물을 빌려주고, 상대방이 동일한 종류와 품질, 수량의 물건을 반환하기로 약정하는 계약.
+    - 사용대차: 일방이 금전 외의 물건을 무상으로 빌려주고, 상대방이 사용·수익한 후 원물 그대로 반환하기로 약정하는 계약.
+    - 임대차: 일방이 부동산을 유상으로 빌려주고, 상대방이 차임을 지급하며 사용·수익한 후 반환하기로 약정하는 계약.
+    - 고용: 근로자와 사용자 간에 근로 제공 및 보수 지급 등 근로 조건을 정하는 계약.
+    - 도급: 일방이 건설공사를 완성할 것을 약정하고, 상대방이 이에 대한 보수를 지급하기로 하는 계약.
+"""
+
+_TYPE_SYSTEM = """
+    당신은 대화 내용을 분석하여 계약 유형을 정확히 판단하는 법률 전문가 AI입니다.
+    사용자 메시지로 계약에 관한 대화 내용이 주어집니다. 아래 단계에 따라 판단하세요.
+
+    ## 1단계: 대화 내용을 분석하여 핵심 사실을 정리하세요.
+    - 누가 무엇을 제공합니까?
+    - 상대방은 어떤 대가를 지급하거나 반환하기로 약정합니까?
+    - 제공되는 것은 재산, 금전, 근로, 결과물 중 무엇입니까?
+    - 거래가 무상인지 유상인지 구분하세요.
+
+    ## 2단계: 위에서 정리한 사실을 바탕으로 법적 의미를 해석하세요.
+    - 당사자들의 약정이 가져오는 법적 효과(소유권 이전, 사용권 부여, 근로 제공 등)를 명확히 합니다.
+    - 당사자들이 기대하는 실질적 목적(소유, 이용, 보수 수취 등)을 파악합니다.
+
+    ## 3단계: 아래 계약 유형 기준과 비교하여 가장 일치하는 유형을 선택하세요.
+    {type_criteria}
+
+    ## 4단계: 최종 답변 출력
+    - 반드시 위 유형 중 하나를 한 단어로만 출력하세요.
+    - 해당하지 않으면 '기타'라고만 답하세요.
+    - 그 외의 설명, 해석, 다른 표현은 절대 하지 마세요.
+"""
+
+TYPE_TEMPLATE = PromptTemplate(
+    system=_static(_TYPE_SYSTEM, type_criteria=_static(_TYPE_CRITERIA)),
+    suffix="## 대화 내용:\n{conversation_text}\n\n👉 최종 답변 (한 단어로):",
+)
+
+
+# --------------------------------------------------------------------------- #
+# 계약서 필드 추출
+# --------------------------------------------------------------------------- #
+_EXTRACTION_SYSTEM = """
+    당신은 계약서를 분석하는 법률 전문가 AI입니다.
+    사용자 메시지로 작성된 계약에 관한 대화 내용이 주어집니다.
+
+    ## 각 키워드의 의미:
+    {keyword_info}
+
+    아래 지시사항에 따라 단계적으로 사고하고, 최종 결과는 반드시 위 키워드 구조와 동일한 JSON 형식으로 작성하세요.
+
+    ## 1단계: 대화 내용을 해석하여 핵심 사실을 파악합니다.
+    - 누가 누구에게 무엇을 제공하는지, 금액, 기한, 조건 등을 이해합니다.
+
+    ## 2단계: 각 키워드 의미를 기준으로 대화에서 필요한 정보를 도출합니다.
+    - 대화 내용과 키워드 의미를 비교하며, 해당하는 정보를 찾습니다.
+
+    ## 3단계: 최종 결과를 아래 조건에 맞게 JSON 구조로 출력합니다.
+    - 출력 결과는 반드시 위에 정의된 키워드 구조(계층, 필드명, 형식 포함)를 그대로 따라야 합니다.
+    - 대화에 없는 값은 공란("")으로 채웁니다.
+    - 반드시 JSON 형식으로만 출력하세요.
+    - 모든 key와 value는 이중 따옴표(")를 사용합니다.
+    - 단일 따옴표(')는 절대 사용하지 않습니다.
+    - JSON 외의 설명, 해석, 단계 내용, 안내 문구는 절대 포함하지 않습니다.
+    - 오직 JSON 결과만 출력하세요.
+    - JSON 이외의 텍스트가 포함되면 계약서로서 무효입니다.
+    - 날짜는 반드시 'YYYY-MM-DD' 형식으로 작성합니다. '오늘' 같은 표현은 허용하지 않습니다.
+"""
+
+_EXTRACTION_SUFFIX = "## 대화 내용:\n{conversation_text}"
+
+EXTRACTION_TEMPLATES: Mapping[str, PromptTemplate] = {
+    contract_type: PromptTemplate(
+        system=_static(_EXTRACTION_SYSTEM, keyword_info=compiled.info_block),
+        suffix=_EXTRACTION_SUFFIX,
+    )
+    for contract_type, compiled in compiled_keyword_schema.items()
+}
+_EMPTY_EXTRACTION_TEMPLATE = PromptTemplate(
+    system=_static(_EXTRACTION_SYSTEM, keyword_info=EMPTY_SCHEMA.info_block),
+    suffix=_EXTRACTION_SUFFIX,
+)
+
+
+# 필드 추출 샤드: 최상위 항목 묶음별 템플릿 (GENERATION_EXTRACTION_SHARDS, 나누지 않는 유형은 없음)
+@dataclass(frozen=True)
+class ExtractionShard:
+    sections: Tuple[str, ...]  # 이 샤드가 맡는 최상위 항목
+    template: PromptTemplate
+
+
+def _extraction_shards(schema: dict) -> Tuple[ExtractionShard, ...]:
+    return tuple(
+        ExtractionShard(
+            sections=tuple(section),
+            template=PromptTemplate(
+                system=_static(_EXTRACTION_SYSTEM, keyword_info=compile_schema(section).info_block),
+                suffix=_EXTRACTION_SUFFIX,
+            ),
+        )
+        for section in split_sections(schema, settings.GENERATION_EXTRACTION_SHARDS)
+    )
+
+
+EXTRACTION_SHARDS: Mapping[str, Tuple[ExtractionShard, ...]] = {
+    contract_type: shards
+    for contract_type, shards in (
+        (contract_type, _extraction_shards(keyword_schema[contract_type]))
+        for contract_type, compiled in compiled_keyword_schema.items()
+        if len(compiled.keys) >= settings.GENERATION_SHARD_MIN_FIELDS
+    )
+    if len(shards) > 1
+}
+
+
+# --------------------------------------------------------------------------- #
+# 유형 판단 + 필드 추출 통합 (Structured Outputs)
+# --------------------------------------------------------------------------- #
+# 유형별 필드 구조와 키워드 의미는 응답 JSON 스키마(app.prompts.combined_extractor)에 담기므로
+# 프롬프트에는 판단 기준과 작성 규칙만 둠
+_COMBINED_SYSTEM = """
+    당신은 계약서를 분석하는 법률 전문가 AI입니다.
+    사용자 메시지로 작성된 계약에 관한 대화 내용이 주어집니다.
+
+    ## 1단계: 대화 내용을 해석하여 핵심 사실을 파악합니다.
+    - 누가 누구에게 무엇을 제공하는지, 대가가 있는지, 금액, 기한, 조건 등을 이해합니다.
+
+    ## 2단계: 아래 계약 유형 기준과 비교하여 가장 일치하는 유형을 선택합니다.
+    {type_criteria}
+    - 기타: 위 유형 중 어느 것에도 해당하지 않는 계약.
+
+    ## 3단계: 선택한 유형의 필드 구조에 맞춰 대화에서 필요한 정보를 채웁니다.
+    - 응답 스키마의 result.type 에 선택한 유형을, result.fields 에 해당 유형의 필드를 작성합니다.
+    - 각 필드의 의미는 응답 스키마의 description 을 따릅니다.
+    - 대화에 없는 값은 공란("")으로 채웁니다.
+    - 날짜는 반드시 'YYYY-MM-DD' 형식으로 작성합니다. '오늘' 같은 표현은 허용하지 않습니다.
+"""
+
+COMBINED_TEMPLATE = PromptTemplate(
+    system=_static(_COMBINED_SYSTEM, type_criteria=_static(_TYPE_CRITERIA)),
+    suffix=_EXTRACTION_SUFFIX,
+)
+
+
+# --------------------------------------------------------------------------- #
+# 공란 검토 제안
+# --------------------------------------------------------------------------- #
+_ANNOTATION_SYSTEM = """
+    당신은 법률 문서를 검토하는 전문가입니다.
+    사용자 메시지로 작성된 계약서에서 값이 공란("")으로 남은 중요 키워드의 JSON 형식이 주어집니다.
+
+    주어진 각 항목을 법률적 관점에서 검토하고, 그에 따른 간단한 문제 설명을 작성해 주세요.
+
+    ❗주의사항:
+    - 반드시 JSON 형식으로 출력하세요.
+    - 모든 키(key)와 문자열 값(value)은 **이중 따옴표(")** 를 사용하세요.
+    - **단일 따옴표(')** 는 절대 사용하지 마세요.
+    - 응답에는 JSON 외의 설명, 해석, 안내 문구를 포함하지 마세요.
+    - JSON 구조는 입력과 동일하게 유지해 주세요.
+
+    [각 키워드의 법적 의미 및 목적]
+    {keyword_review_info}
+
+    [지시사항]
+    - 주어진 모든 항목에 대해, 해당 키워드의 법적 의미를 참고해 발생할 수 있는 문제를 간단히 작성해 주세요.
+    - 입력에 없는 키워드는 응답에 추가하지 마세요.
+"""
+
+_ANNOTATION_SUFFIX = "[검토 대상 키워드]\n{fields_json}"
+
+ANNOTATION_TEMPLATES: Mapping[str, PromptTemplate] = {
+    contract_type: PromptTemplate(
+        system=_static(_ANNOTATION_SYSTEM, keyword_review_info=compiled.info_block),
+        suffix=_ANNOTATION_SUFFIX,
+    )
+    for contract_type, compiled in compiled_review_schema.items()
+}
+_EMPTY_ANNOTATION_TEMPLATE = PromptTemplate(
+    system=_static(_ANNOTATION_SYSTEM, keyword_review_info=EMPTY_SCHEMA.info_block),
+    suffix=_ANNOTATION_SUFFIX,
+)
+
+
+def get_extraction_template(contract_type: str) -> PromptTemplate:
+    return EXTRACTION_TEMPLATES.get(contract_type, _EMPTY_EXTRACTION_TEMPLATE)
+
+
+def get_extraction_shards(contract_type: str) -> Tuple[ExtractionShard, ...]:
+    """샤딩 대상 유형이면 샤드 목록, 아니면 빈 튜플."""
+    return EXTRACTION_SHARDS.get(contract_type, ())
+
+
+def get_annotation_template(contract_type: str) -> PromptTemplate:
+    return ANNOTATION_TEMPLATES.get(contract_type, _EMPTY_ANNOTATION_TEMPLATE)
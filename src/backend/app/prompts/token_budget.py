@@ -0,0 +1,155 @@
+# 프롬프트 토큰 예산 관리 모듈
+#
+# 대화 텍스트를 프롬프트에 넣기 전에 토큰 수를 로컬에서 계산하고, 예산(PROMPT_TRANSCRIPT_TOKEN_BUDGET)을
+# 넘으면 핵심 문장만 남기는 추출식 압축을 적용합니다.
+#
+# - count_tokens: tiktoken(선택 의존성)이 있으면 모델 토크나이저로, 없으면 문자 종류별 추정치로 계산
+# - dedupe_sentences: Whisper 반복 출력, 같은 내용 재확인 등으로 두 번 이상 나온 문장을 한 번만 남김
+# - compress_transcript: 숫자·날짜·금액·당사자 호칭·계약 단서가 들어간 문장을 우선해 예산 안에서 선택,
+#   선택된 문장은 원래 순서대로 이어 붙임
+# - fit_transcript: 위 단계를 묶은 진입점 (프롬프트 빌더에서 사용)
+#
+# 결과는 입력에 대해 결정적이므로 GPT 응답 캐시 키도 그대로 유지됩니다.
+
+import re
+from functools import lru_cache
+from typing import Callable, Iterable, List, Optional
+
+try:
+    import tiktoken  # 선택 의존성
+except ImportError:  # pragma: no cover - 설치 여부에 따라 다름
+    tiktoken = None
+
+from app.core.config import settings
+from app.core.metrics import increment
+
+from app.core.logger import logging
+logger = logging.getLogger(__name__)
+
+# 문장 경계: 문장부호 뒤 공백 또는 줄바꿈
+_SENTENCE_SPLIT = re.compile(r"(?<=[.?!。])\s+|\n+")
+# 문장부호 없이 이어지는 전사 결과는 이 토큰 수 단위로 잘라 문장처럼 취급
+_MAX_SENTENCE_WORDS = 40
+# 이보다 짧은 문장("네 .", "아 그래요 ?")은 반복되어도 대화 흐름상 남겨 둠
+_DEDUPE_MIN_WORDS = 3
+
+_DIGIT = re.compile(r"\d")
+_DATE = re.compile(r"\d+\s*(?:년|월|일|시|분)|오늘|내일|모레|다음\s*달|이번\s*달|요일|까지|부터|기간|만기")
+_AMOUNT = re.compile(r"(?:만|억|천|백)\s*원|금액|대금|보증금|월세|이자")
+_PARTY = re.compile(r"\w+\s*(?:씨|님|대표|사장|선생|과장|부장|소장)|성함|이름|저는|제가|주식회사|\(주\)")
+
+
+@lru_cache(maxsize=1)
+def _get_encoder():
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(settings.OPENAI_MODEL)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as exc:  # BPE 파일 다운로드 불가 등
+        logger.warning("tiktoken 인코더 로드 실패, 토큰 수를 추정치로 계산: %s", exc)
+        return None
+
+
+# 토큰 수 계산 (tiktoken 미설치 시 ASCII 4자당 1토큰, 그 외 문자(한글 등) 1자당 1토큰으로 추정)
+def count_tokens(text: str) -> int:
+    encoder = _get_encoder()
+    if encoder is not None:
+        return len(encoder.encode(text, disallowed_special=()))
+    ascii_chars = sum(1 for ch in text if ch.isascii() and not ch.isspace())
+    other_chars = sum(1 for ch in text if not ch.isascii())
+    return ascii_chars // 4 + other_chars
+
+
+def split_sentences(text: str) -> List[str]:
+    sentences = []
+    for part in _SENTENCE_SPLIT.split(text):
+        words = part.split()
+        for i in range(0, len(words), _MAX_SENTENCE_WORDS):
+            sentences.append(" ".join(words[i:i + _MAX_SENTENCE_WORDS]))
+    return sentences
+
+
+def dedupe_sentences(sentences: Iterable[str]) -> List[str]:
+    seen = set()
+    result = []
+    for sentence in sentences:
+        words = sentence.split()
+        if len(words) >= _DEDUPE_MIN_WORDS:
+            key = " ".join(words)
+            if key in seen:
+                continue
+            seen.add(key)
+        result.append(sentence)
+    return result
+
+
+def _score(sentence: str, keywords: Iterable[str]) -> int:
+    score = 0
+    if _DIGIT.search(sentence):
+        score += 3
+    if _DATE.search(sentence):
+        score += 2
+    if _AMOUNT.search(sentence):
+        score += 2
+    if _PARTY.search(sentence):
+        score += 2
+    score += sum(1 for keyword in keywords if keyword in sentence)
+    return score
+
+
+def compress_transcript(
+    sentences: List[str],
+    budget_tokens: int,
+    keywords: Iterable[str] = (),
+    counter: Callable[[str], int] = count_tokens,
+) -> List[str]:
+    """
+    점수가 높은 문장부터 예산이 찰 때까지 고르고, 고른 문장을 원래 순서로 돌려줍니다.
+
+    점수가 같으면 앞쪽 문장(당사자 소개, 계약 대상 언급이 주로 나오는 부분)을 우선합니다.
+    """
+    keywords = tuple(keywords)
+    ranked = sorted(
+        range(len(sentences)),
+        key=lambda i: (-_score(sentences[i], keywords), i),
+    )
+    selected = []
+    used = 0
+    for i in ranked:
+        cost = counter(sentences[i]) + 1  # 문장 사이 공백
+        if used + cost > budget_tokens:
+            continue
+        selected.append(i)
+        used += cost
+    return [sentences[i] for i in sorted(selected)]
+
+
+def fit_transcript(
+    conversation_text: str,
+    keywords: Iterable[str] = (),
+    budget_tokens: Optional[int] = None,
+) -> str:
+    """중복 문장을 제거하고, 토큰 예산을 넘으면 핵심 문장만 남긴 대화 텍스트를 반환합니다."""
+    if not settings.PROMPT_BUDGET_ENABLED:
+        return conversation_text
+    if budget_tokens is None:
+        budget_tokens = settings.PROMPT_TRANSCRIPT_TOKEN_BUDGET
+
+    sentences = dedupe_sentences(split_sentences(conversation_text))
+    deduped_text = " ".join(sentences)
+    original_tokens = count_tokens(conversation_text)
+    tokens = count_tokens(deduped_text)
+    if tokens <= budget_tokens:
+        if tokens < original_tokens:
+            increment("prompt_transcript_deduped")
+        return deduped_text
+
+    compressed = " ".join(compress_transcript(sentences, budget_tokens, keywords))
+    increment("prompt_transcript_compressed")
+    logger.info(
+        "대화 텍스트 압축: %d → %d 토큰 (예산 %d)",
+        original_tokens, count_tokens(compressed), budget_tokens,
+    )
+    return compressed
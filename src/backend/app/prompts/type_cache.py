@@ -0,0 +1,147 @@
+# 계약 유형 판단 결과 캐시 모듈 (유사 대화 재사용)
+#
+# 전처리된 대화 텍스트(stream_preprocess 출력, 공백으로 구분된 토큰)의 MinHash 서명을 저장해 두고,
+# 새 대화와의 추정 Jaccard 유사도가 임계값 이상이면 저장된 계약 유형을 그대로 반환합니다.
+# 표준 임대차 양식을 소리 내어 읽는 경우처럼 거의 같은 대화가 반복될 때 분류 GPT 호출을 생략합니다.
+#
+# 색인은 Redis(app.core.shared_cache)에 두어 모든 워커가 함께 쓰고 채웁니다. 외부 벡터 DB는 사용하지 않습니다.
+#   typecache:entries      해시   번호 → [서명, 계약 유형]
+#   typecache:order        정렬셋 저장 순서 (최대 개수를 넘으면 오래된 번호부터 제거)
+#   typecache:band:<i>:<h> 집합   LSH 밴드 값이 같은 번호들
+# 후보 검색은 LSH 밴딩(서명을 _BANDS개 구간으로 나눠 구간이 하나라도 같으면 후보)으로 전체 비교를 피합니다.
+# Redis 호출은 동기이므로 asyncio 경로(type_classifier.aclassify_text)는 asyncio.to_thread 로 부릅니다.
+
+import hashlib
+import json
+import random
+from typing import List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import increment
+from app.core.shared_cache import SharedCache
+
+from app.core.logger import logging
+logger = logging.getLogger(__name__)
+
+_NUM_PERM = 64
+_BANDS = 16
+_ROWS = _NUM_PERM // _BANDS
+_MERSENNE_PRIME = (1 << 61) - 1
+
+# 서명 호환성을 위해 고정 시드로 해시 계수 생성 (바꾸면 저장된 색인과 비교 불가)
+_rng = random.Random(20240601)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(_NUM_PERM)
+]
+
+
+# 토큰 bigram 집합의 MinHash 서명
+def minhash(tokens: List[str]) -> Tuple[int, ...]:
+    features = (
+        {f"{a} {b}" for a, b in zip(tokens, tokens[1:])} if len(tokens) > 1 else set(tokens)
+    )
+    hashes = [
+        int.from_bytes(hashlib.blake2b(f.encode("utf-8"), digest_size=8).digest(), "big")
+        for f in features
+    ]
+    return tuple(
+        min(((a * h + b) % _MERSENNE_PRIME for h in hashes), default=_MERSENNE_PRIME)
+        for a, b in _PERMUTATIONS
+    )
+
+
+# 두 서명의 일치 비율 = Jaccard 유사도 추정치
+def similarity(a: Tuple[int, ...], b: Tuple[int, ...]) -> float:
+    return sum(x == y for x, y in zip(a, b)) / _NUM_PERM
+
+
+def _bands(signature: Tuple[int, ...]) -> List[Tuple[int, Tuple[int, ...]]]:
+    return [(i, signature[i * _ROWS:(i + 1) * _ROWS]) for i in range(_BANDS)]
+
+
+class ContractTypeCache:
+    """MinHash 서명 → 계약 유형 색인. 최대 개수를 넘으면 오래된 항목부터 제거합니다."""
+
+    def __init__(self, threshold: float, max_entries: int, min_tokens: int) -> None:
+        self._threshold = threshold
+        self._max_entries = max_entries
+        self._min_tokens = min_tokens
+        self._cache = SharedCache("typecache:")
+        self._seq_key = self._cache.key("seq")
+        self._entries_key = self._cache.key("entries")
+        self._order_key = self._cache.key("order")
+
+    def lookup(self, conversation_text: str) -> Optional[str]:
+        tokens = conversation_text.split()
+        if len(tokens) < self._min_tokens:
+            return None
+
+        signature = minhash(tokens)
+
+        def _candidates(client) -> List[Optional[str]]:
+            numbers = client.sunion([self._band_key(band) for band in _bands(signature)])
+            return client.hmget(self._entries_key, list(numbers)) if numbers else []
+
+        best: Optional[Tuple[float, str]] = None
+        for value in self._cache.run(_candidates, []):
+            if value is None:  # 제거된 항목이 밴드 집합에 남은 경우
+                continue
+            stored_signature, contract_type = json.loads(value)
+            score = similarity(signature, tuple(stored_signature))
+            if best is None or score > best[0]:
+                best = (score, contract_type)
+
+        if best is not None and best[0] >= self._threshold:
+            increment("type_cache_hit")
+            logger.debug("유사 대화 캐시 적중: type='%s', similarity=%.3f", best[1], best[0])
+            return best[1]
+
+        increment("type_cache_miss")
+        return None
+
+    def store(self, conversation_text: str, contract_type: str) -> None:
+        tokens = conversation_text.split()
+        if len(tokens) < self._min_tokens:
+            return
+
+        signature = minhash(tokens)
+
+        def _store(client) -> None:
+            number = client.incr(self._seq_key)
+            pipe = client.pipeline()
+            pipe.hset(self._entries_key, number, json.dumps([list(signature), contract_type], ensure_ascii=False))
+            pipe.zadd(self._order_key, {number: number})
+            for band in _bands(signature):
+                pipe.sadd(self._band_key(band), number)
+            pipe.zcard(self._order_key)
+            size = pipe.execute()[-1]
+
+            overflow = size - self._max_entries
+            if overflow > 0:
+                evicted = [n for n, _ in client.zpopmin(self._order_key, overflow)]
+                pipe = client.pipeline()
+                for n, value in zip(evicted, client.hmget(self._entries_key, evicted)):
+                    if value is not None:
+                        for band in _bands(tuple(json.loads(value)[0])):
+                            pipe.srem(self._band_key(band), n)
+                pipe.hdel(self._entries_key, *evicted)
+                pipe.execute()
+
+        self._cache.run(_store, None)
+
+    def _band_key(self, band: Tuple[int, Tuple[int, ...]]) -> str:
+        index, rows = band
+        return self._cache.key("band", index, "-".join(format(v, "x") for v in rows))
+
+
+# 전역 싱글턴 (비활성화 시 None)
+type_cache: Optional[ContractTypeCache] = (
+    ContractTypeCache(
+        threshold=settings.TYPE_CACHE_THRESHOLD,
+        max_entries=settings.TYPE_CACHE_MAX_ENTRIES,
+        min_tokens=settings.TYPE_CACHE_MIN_TOKENS,
+    )
+    if settings.TYPE_CACHE_ENABLED
+    else None
+)
@@ -1,71 +1,141 @@
 # 계약서 유형 타입 추출 모듈
 
-import os
-from typing import Callable, List, Dict
-from app.core.config import settings
+import asyncio
+from typing import Awaitable, Callable, List, Dict
+
+from app.core.llm import GPTStreamAborted
+from app.core.transcript_store import aread_transcript, read_transcript
+from app.prompts.type_cache import type_cache
+from app.prompts.token_budget import fit_transcript
+from app.prompts.templates import TYPE_TEMPLATE
 
 # 사전 정의된 계약 유형 리스트
 CONTRACT_TYPES = [
     "증여", "매매", "교환", "소비대차", "사용대차", "임대차", "고용", "도급"
 ]
 
+# 답변 앞뒤에 붙을 수 있는 공백‧따옴표‧마침표 (유형 판단 시 무시)
+_ANSWER_STRIP_CHARS = " \t\r\n'\"`.。"
+
+# 계약 유형별 대화 단서 (추측 실행 후보 선정용, GPT 판단을 대체하지 않음)
+## 단서는 해당 유형에서만 쓰이는 두 글자 이상의 표현으로 한정
+## ("팔", "하자", "반환"처럼 다른 단어의 일부이거나 여러 유형에 두루 나오는 표현은 후보를 흐리므로 제외)
+TYPE_CUES = {
+    "증여": ["증여", "무상으로 주", "무상으로 드", "물려주", "물려받"],
+    "매매": ["매매", "매도", "매수", "잔금", "중도금", "소유권 이전", "이전등기"],
+    "교환": ["교환", "맞바꾸", "맞교환", "보충금"],
+    "소비대차": ["소비대차", "대여금", "차용", "원금", "상환", "이자율"],
+    "사용대차": ["사용대차", "무상으로 빌려", "공짜로 빌려", "무상 사용"],
+    "임대차": ["임대", "임차", "보증금", "월세", "전세", "차임", "관리비"],
+    "고용": ["근로", "근무", "연봉", "월급", "임금", "출근", "수당"],
+    "도급": ["도급", "공사대금", "시공", "착공", "준공", "하자보수", "하자 보수"],
+}
+
 #계약 유형 추출
 def get_contract_type(
     script_filename: str,
     gpt_caller: Callable[[List[Dict[str, str]]], str]
 ) -> str:
     
-    file_path = os.path.join(settings.TEXT_UPLOAD_DIR, script_filename)
-    with open(file_path, 'r', encoding='utf-8') as f:
-        conversation_text = f.read()
-
-    type_prompt=f"""
-        당신은 대화 내용을 분석하여 계약 유형을 정확히 판단하는 법률 전문가 AI입니다. 
-
-        ## 1단계: 대화 내용을 분석하여 핵심 사실을 정리하세요.
-        - 누가 무엇을 제공합니까?
-        - 상대방은 어떤 대가를 지급하거나 반환하기로 약정합니까?
-        - 제공되는 것은 재산, 금전, 근로, 결과물 중 무엇입니까?
-        - 거래가 무상인지 유상인지 구분하세요.
-
-        ## 대화 내용:
-        {conversation_text}
-
-        ## 2단계: 위에서 정리한 사실을 바탕으로 법적 의미를 해석하세요.
-        - 당사자들의 약정이 가져오는 법적 효과(소유권 이전, 사용권 부여, 근로 제공 등)를 명확히 합니다.
-        - 당사자들이 기대하는 실질적 목적(소유, 이용, 보수 수취 등)을 파악합니다.
-
-        ## 3단계: 아래 계약 유형 기준과 비교하여 가장 일치하는 유형을 선택하세요.
-        - 증여: 무상으로 재산을 이전하는 계약.
-        - 매매: 일방이 부동산의 소유권을 이전하고, 상대방이 그 대금을 지급하기로 약정하는 계약.
-        - 교환: 쌍방이 서로 부동산의 소유권을 맞교환 하는 계약.
-        - 소비대차: 일방이 금전 또는 대체물을 빌려주고, 상대방이 동일한 종류와 품질, 수량의 물건을 반환하기로 약정하는 계약.
-        - 사용대차: 일방이 금전 외의 물건을 무상으로 빌려주고, 상대방이 사용·수익한 후 원물 그대로 반환하기로 약정하는 계약.
-        - 임대차: 일방이 부동산을 유상으로 빌려주고, 상대방이 차임을 지급하며 사용·수익한 후 반환하기로 약정하는 계약.
-        - 고용: 근로자와 사용자 간에 근로 제공 및 보수 지급 등 근로 조건을 정하는 계약. 
-        - 도급: 일방이 건설공사를 완성할 것을 약정하고, 상대방이 이에 대한 보수를 지급하기로 하는 계약.
-
-        ## 4단계: 최종 답변 출력
-        - 반드시 위 유형 중 하나를 한 단어로만 출력하세요.
-        - 해당하지 않으면 '기타'라고만 답하세요.
-        - 그 외의 설명, 해석, 다른 표현은 절대 하지 마세요.
-
-        👉 최종 답변 (한 단어로):
-        """
-    
-    messages=[
-            {
-                "role":"system", 
-                "content":f"당신은 계약서를 분석하는 법률 전문가 AI 입니다.:\n{type_prompt}"
-            },
-            {
-                "role":"user",
-                "content":f"다음은 고용계약을 위한 사용자 간 대화입니다. 대화 내용을 분석하여 적절한 계약 유형과 관련 키워드를 반환해주세요.:\n{conversation_text}"
-            },
-        ]
-    
-    result = gpt_caller(messages)
-    result_type= result.split()[-1]
+    conversation_text = read_transcript(script_filename)
+
+    return classify_text(conversation_text, gpt_caller)
+
+
+# 계약 유형 추출 (asyncio 파이프라인용)
+async def aget_contract_type(
+    script_filename: str,
+    agpt_caller: Callable[[List[Dict[str, str]]], Awaitable[str]]
+) -> str:
+
+    conversation_text = await aread_transcript(script_filename)
+
+    return await aclassify_text(conversation_text, agpt_caller)
+
+
+# 대화 텍스트로 계약 유형 판단 (유사 대화 캐시 적중 시 GPT 호출 생략)
+def classify_text(
+    conversation_text: str,
+    gpt_caller: Callable[[List[Dict[str, str]]], str]
+) -> str:
+
+    if type_cache is not None:
+        cached_type = type_cache.lookup(conversation_text)
+        if cached_type is not None:
+            return cached_type
+
+    try:
+        result = gpt_caller(build_type_messages(conversation_text))
+    except GPTStreamAborted:
+        # 어떤 유형 이름으로도 이어질 수 없는 응답은 무효로 보고 '기타' 처리
+        return "기타"
+    contract_type = parse_contract_type(result)
+    _remember_type(conversation_text, contract_type)
+    return contract_type
+
+
+async def aclassify_text(
+    conversation_text: str,
+    agpt_caller: Callable[[List[Dict[str, str]]], Awaitable[str]]
+) -> str:
+
+    # 유사 대화 캐시(Redis) 조회‧저장은 이벤트 루프를 막지 않도록 스레드에서 실행
+    if type_cache is not None:
+        cached_type = await asyncio.to_thread(type_cache.lookup, conversation_text)
+        if cached_type is not None:
+            return cached_type
+
+    try:
+        result = await agpt_caller(build_type_messages(conversation_text))
+    except GPTStreamAborted:
+        return "기타"
+    contract_type = parse_contract_type(result)
+    await asyncio.to_thread(_remember_type, conversation_text, contract_type)
+    return contract_type
+
+
+# '기타'는 재시도 시 다시 판단하도록 캐시에 남기지 않음
+def _remember_type(conversation_text: str, contract_type: str) -> None:
+    if type_cache is not None and contract_type in CONTRACT_TYPES:
+        type_cache.store(conversation_text, contract_type)
+
+
+# 계약 유형 판단 프롬프트 메시지 구성
+def build_type_messages(conversation_text: str) -> List[Dict[str, str]]:
+
+    conversation_text = fit_transcript(
+        conversation_text, keywords=[cue for cues in TYPE_CUES.values() for cue in cues]
+    )
+
+    return TYPE_TEMPLATE.render(conversation_text=conversation_text)
+
+
+# 대화 단서 출현 빈도로 후보 계약 유형 순위 산출 (단서가 없는 유형은 제외)
+def rank_contract_types(conversation_text: str) -> List[str]:
+    scores = {
+        contract_type: sum(conversation_text.count(cue) for cue in cues)
+        for contract_type, cues in TYPE_CUES.items()
+    }
+    ranked = sorted(
+        (t for t, score in scores.items() if score > 0),
+        key=lambda t: scores[t],
+        reverse=True,
+    )
+    return ranked
+
+
+# 스트리밍 중인 답변이 아직 유형 이름(또는 '기타')의 앞부분일 수 있는지 여부
+def is_type_answer_prefix(partial: str) -> bool:
+    answer = partial.strip(_ANSWER_STRIP_CHARS)
+    return any(name.startswith(answer) for name in (*CONTRACT_TYPES, "기타"))
+
+
+# GPT 응답에서 계약 유형 한 단어 추출
+def parse_contract_type(result: str) -> str:
+    tokens = result.split()
+    if not tokens:
+        return "기타"
+    result_type = tokens[-1].strip(_ANSWER_STRIP_CHARS)
     
     # 보정: 결과가 예상 유형이 아닐 경우 '기타' 처리
     if result_type not in CONTRACT_TYPES:
@@ -12,11 +12,12 @@ router = APIRouter(prefix="/contracts/generate", tags=["Generations"])
 
 @router.post("", status_code=status.HTTP_202_ACCEPTED)
 async def generate_contract(
+    batch: bool = False,  # 급하지 않은 요청: Batch API 로 모아서 처리 (완료까지 수 시간)
     session: AsyncSession = Depends(get_session),
     current_user=Depends(get_current_user),
 ):
     try:
-        await generation_service.create_generation(current_user.id, session)
+        await generation_service.create_generation(current_user.id, session, batch=batch)
         logger.info("계약서 생성 요청 완료: user_id=%s", current_user.id)
         return
     except HTTPException as e:
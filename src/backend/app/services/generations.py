@@ -2,31 +2,45 @@ from __future__ import annotations
 from app.core.logger import logging
 logger = logging.getLogger(__name__)
 
+import asyncio
 from uuid import UUID
 
 from fastapi import HTTPException, status
 from sqlalchemy.exc import SQLAlchemyError
-from sqlmodel import select
+from sqlmodel import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
+from app.core.cancellation import publish_cancel, remember_task
 from app.models.transcription import Transcription, TranscriptionStatus
 from app.models.generation import Generation, GenerationStatus
 from app.models.contract import Contract
+from app.models.generation_batch import GenerationBatchItem
 from app.schemas.generation import GenerationStatusResponse
-from app.tasks.generations import process_generation_pipeline
+from app.tasks.generations import (
+    generation_chain, process_generation_pipeline_async
+)
 
 
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
 
-async def create_generation(user_id: UUID, session: AsyncSession) -> None:
+async def create_generation(
+    user_id: UUID, session: AsyncSession, *, batch: bool = False
+) -> None:
     """
     계약서 생성 추적을 위해 Generation 테이블에 레코드를 추가하거나
     기존 "failed" 레코드에 대해 재시도하고,
     비동기 Celery task queue에 계약서 생성 파이프라인을 등록합니다.
+
+    ``batch`` 이고 GENERATION_BATCH_ENABLED 이면 Celery 대신 배치 대기열(GenerationBatchItem)에 등록하여
+    app.tasks.batch_generations 가 다른 요청과 함께 Batch API 로 처리합니다.
     """
-    logger.info("create_generation 진입: user_id=%s", user_id)
+    logger.info("create_generation 진입: user_id=%s, batch=%s", user_id, batch)
+    if batch and not settings.GENERATION_BATCH_ENABLED:
+        logger.info("배치 모드 비활성화, 즉시 생성으로 처리: user_id=%s", user_id)
+        batch = False
 
     transcription = await _latest_finished_transcription(user_id, session)
     logger.info(
@@ -54,6 +68,9 @@ async def create_generation(user_id: UUID, session: AsyncSession) -> None:
         # "failed": 재시도 요청 발생, "generating"으로 업데이트 및 Celery 재등록
         elif latest_gen.status == GenerationStatus.failed:
             latest_gen.status = GenerationStatus.generating
+            if batch:
+                # 이전 배치 진행 상태가 남아 있으면 처음 단계부터 다시
+                await session.merge(GenerationBatchItem(generation_id=latest_gen.id))
             try:
                 await session.commit()
                 logger.info("실패한 generation 재시작: generation_id=%s", latest_gen.id)
@@ -67,8 +84,11 @@ async def create_generation(user_id: UUID, session: AsyncSession) -> None:
                     status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                     detail="Unexpected server error",
                 )
+            if batch:
+                logger.info("실패한 generation 배치 대기열 재등록: generation_id=%s", latest_gen.id)
+                return
             try:
-                process_generation_pipeline.delay(str(latest_gen.id))
+                await _enqueue_generation(latest_gen.id)
                 logger.info(
                     "generation Celery 재등록 완료: generation_id=%s",
                     latest_gen.id
@@ -111,6 +131,8 @@ async def create_generation(user_id: UUID, session: AsyncSession) -> None:
     logger.info("Generation 레코드 추가 전: transcription_id=%s", transcription.id)
     try:
         session.add(generation)
+        if batch:
+            session.add(GenerationBatchItem(generation_id=generation.id))
         await session.commit()
         await session.refresh(generation)
         logger.info("새 generation 레코드 생성 완료: generation_id=%s", generation.id)
@@ -123,10 +145,14 @@ async def create_generation(user_id: UUID, session: AsyncSession) -> None:
             detail="Unexpected server error",
         )
 
+    if batch:
+        logger.info("generation 배치 대기열 등록 완료: generation_id=%s", generation.id)
+        return
+
     # Celery task queue에 계약서 생성 파이프라인 등록
     try:
         logger.info("Celery task 등록 시도: generation_id=%s", generation.id)
-        process_generation_pipeline.delay(str(generation.id))
+        await _enqueue_generation(generation.id)
         logger.info("generation Celery 등록 완료: generation_id=%s", generation.id)
     except Exception:
         logger.error("Celery 등록 실패: generation_id=%s", generation.id, exc_info=True)
@@ -196,7 +222,14 @@ async def cancel_generation(user_id: UUID, session: AsyncSession) -> None:
         )
 
     generation.status = GenerationStatus.cancelled
+    # 배치 대기열에서 제거 (제출된 배치 작업의 결과는 반영 시 버려짐)
+    await session.execute(
+        delete(GenerationBatchItem).where(GenerationBatchItem.generation_id == generation.id)
+    )
     await session.commit()
+    # 실행 중인 파이프라인에 취소 신호 전달 (대기 중인 태스크는 revoke)
+    # Redis 발행‧Celery revoke 는 블로킹 호출이므로 이벤트 루프를 막지 않도록 스레드에서 실행
+    await asyncio.to_thread(publish_cancel, "generation", generation.id)
     logger.info("generation 취소 완료: generation_id=%s", generation.id)
 
 
@@ -204,6 +237,25 @@ async def cancel_generation(user_id: UUID, session: AsyncSession) -> None:
 # Internal helpers
 # ---------------------------------------------------------------------------
 
+async def _enqueue_generation(generation_id: UUID) -> None:
+    """
+    설정에 따라 동기 단계별 태스크 체인 / asyncio 파이프라인 중 하나를 Celery에 등록합니다.
+
+    체인은 등록 시점에 단계별 task id 가 모두 정해지므로, 취소 시 전부 revoke 할 수 있도록 함께 기록합니다.
+    """
+    if settings.GENERATION_ASYNC_PIPELINE:
+        result = process_generation_pipeline_async.delay(str(generation_id))
+    else:
+        result = generation_chain(str(generation_id)).apply_async()
+
+    task_ids = []
+    while result is not None:
+        task_ids.append(result.id)
+        result = result.parent
+    # Redis 기록은 블로킹 호출이므로 이벤트 루프를 막지 않도록 스레드에서 실행
+    await asyncio.to_thread(remember_task, "generation", generation_id, *task_ids)
+
+
 async def _latest_finished_transcription(
     user_id: UUID, session: AsyncSession
 ) -> Transcription:
@@ -1,6 +1,7 @@
 from app.core.logger import logging
 logger = logging.getLogger(__name__)
 
+import asyncio
 import os
 from uuid import UUID
 from pathlib import Path
@@ -10,6 +11,8 @@ from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
+from app.core.audio_chunker import can_decode
+from app.core.cancellation import publish_cancel, remember_task
 from app.models.transcription import Transcription, TranscriptionStatus
 from app.models.generation import Generation
 from app.schemas.transcription import UploadInitResponse, UploadStatusResponse
@@ -102,6 +105,19 @@ async def trigger_transcription(transcription_id: UUID, session: AsyncSession) -
             detail="Audio file not found. Upload may have failed."
         )
 
+    # Whisper 요청 한도를 넘는 파일은 분할 변환이 가능한 형식만 허용 (MP3 는 pydub + ffmpeg 필요)
+    if audio_path.stat().st_size > settings.MAX_UPLOAD_SIZE_BYTES and not can_decode(audio_path):
+        transcription.status = TranscriptionStatus.upload_failed
+        await session.commit()
+        logger.warning(
+            "분할 불가 형식의 대용량 파일, 상태 'upload_failed'로 반영: transcription_id=%s, path=%s",
+            transcription_id, audio_path
+        )
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="Audio file is too large"
+        )
+
     # 서버 내부 실행 환경이나 DB의 예기치 못한 문제. 로그만 남김 (클라이언트에서는 계속 uploading으로 표시됨)
     try:
         transcription.status = TranscriptionStatus.uploaded
@@ -114,7 +130,9 @@ async def trigger_transcription(transcription_id: UUID, session: AsyncSession) -
 
     # Celery task queue에 텍스트 변환 파이프라인 등록
     try:
-        process_uploaded_audio.delay(str(transcription_id))
+        result = process_uploaded_audio.delay(str(transcription_id))
+        # Redis 기록은 블로킹 호출이므로 이벤트 루프를 막지 않도록 스레드에서 실행
+        await asyncio.to_thread(remember_task, "transcription", transcription_id, result.id)
         logger.info("STT 변환 태스크 Celery 등록 완료: transcription_id=%s", transcription_id)
     except Exception:
         logger.error("Celery 등록 실패: transcription_id=%s", transcription_id, exc_info=True)
@@ -171,6 +189,9 @@ async def cancel_transcription(user_id: UUID, session: AsyncSession) -> None:
 
     transcription.status = TranscriptionStatus.cancelled
     await session.commit()
+    # 실행 중인 STT 태스크에 취소 신호 전달 (대기 중인 태스크는 revoke)
+    # Redis 발행‧Celery revoke 는 블로킹 호출이므로 이벤트 루프를 막지 않도록 스레드에서 실행
+    await asyncio.to_thread(publish_cancel, "transcription", transcription.id)
     logger.info("transcription 취소 완료: transcription_id=%s", transcription.id)
 
 
@@ -190,7 +211,8 @@ async def retry_transcription(user_id: UUID, session: AsyncSession) -> None:
     logger.info("transcription 재시도 준비 완료: transcription_id=%s", transcription.id)
 
     try:
-        process_uploaded_audio.delay(str(transcription.id))
+        result = process_uploaded_audio.delay(str(transcription.id))
+        await asyncio.to_thread(remember_task, "transcription", transcription.id, result.id)
         logger.info("재시도 STT 태스크 Celery 등록 완료: transcription_id=%s", transcription.id)
     except Exception:
         logger.error(
@@ -0,0 +1,269 @@
+from app.core.logger import logging
+logger = logging.getLogger(__name__)
+
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.celery_app import celery_app
+from app.core.batch_api import BatchJobFailed, BatchResult, batch_backend
+from app.core.config import settings
+from app.core.llm import build_chat_request
+from app.core.metrics import increment
+from app.core.transcript_store import TranscriptNotFound, read_transcript
+from app.db.session import get_sync_session
+
+from app.models.transcription import Transcription
+from app.models.generation import Generation, GenerationStatus
+from app.models.generation_batch import GenerationBatchItem, GenerationBatchStage
+
+from app.prompts.type_classifier import build_type_messages, parse_contract_type
+from app.prompts.keyword_extractor import build_extraction_messages, parse_checked_fields
+from app.prompts.annotater import (
+    blank_field_paths, build_annotation_messages, merge_suggestions, parse_suggestions,
+    pending_annotation_paths,
+)
+from app.prompts.combined_extractor import (
+    COMBINED_RESPONSE_FORMAT, build_combined_messages, parse_combined_result
+)
+from app.prompts.keyword_schema import is_supported_contract_type, matches_schema
+from app.tasks.generations import delete_script_file, save_contract
+
+
+# --------------------------------------------------------------------------- #
+# 배치 모드 생성 파이프라인 (GENERATION_BATCH_ENABLED)
+#   create_generation(batch=True) 가 GenerationBatchItem(stage=classify) 을 남기면
+#   submit_generation_batches: 단계별로 대기 항목을 모아 배치 작업 하나로 제출 (batch_id 기록)
+#   poll_generation_batches : 끝난 배치 작업의 결과로 항목을 다음 단계로 넘기고,
+#                             공란 제안까지 끝나면(공란이 없으면 추출 직후) Contract / GptSuggestion 저장
+#   (통합 추출 모드면 classify 단계에서 필드까지 받아 extract 단계를 건너뜀)
+# 두 태스크 모두 Celery beat 로 주기 실행되며, 행 잠금(SKIP LOCKED)으로 중복 실행에도 안전합니다.
+# --------------------------------------------------------------------------- #
+
+@celery_app.task(name="tasks.batch_generations.submit_generation_batches")
+def submit_generation_batches() -> None:
+    backend = batch_backend()
+    for stage in GenerationBatchStage:
+        session = get_sync_session()
+        try:
+            items = session.execute(
+                select(GenerationBatchItem)
+                .join(Generation, Generation.id == GenerationBatchItem.generation_id)
+                .where(
+                    GenerationBatchItem.stage == stage,
+                    GenerationBatchItem.batch_id.is_(None),
+                    Generation.status == GenerationStatus.generating,
+                )
+                .order_by(GenerationBatchItem.updated_at)
+                .limit(settings.GENERATION_BATCH_MAX_REQUESTS)
+                .with_for_update(of=GenerationBatchItem, skip_locked=True)
+            ).scalars().all()
+            if not items:
+                session.commit()
+                continue
+
+            requests: Dict[str, dict] = {}
+            for item in items:
+                request = _build_stage_request(session, item)
+                if request is not None:
+                    requests[str(item.generation_id)] = request
+            if requests:
+                batch_id = backend.submit(requests)
+                for item in items:
+                    if str(item.generation_id) in requests:
+                        item.batch_id = batch_id
+                increment("batch_requests_submitted", len(requests))
+                logger.info("배치 작업 제출: stage=%s, batch_id=%s, 요청 수=%d", stage.value, batch_id, len(requests))
+            session.commit()
+        except Exception:
+            # 제출 실패 시 항목은 대기 상태로 남아 다음 주기에 다시 제출됨
+            session.rollback()
+            logger.exception("배치 작업 제출 실패: stage=%s", stage.value)
+        finally:
+            session.close()
+
+
+@celery_app.task(name="tasks.batch_generations.poll_generation_batches")
+def poll_generation_batches() -> None:
+    session = get_sync_session()
+    try:
+        batch_ids = session.execute(
+            select(GenerationBatchItem.batch_id)
+            .where(GenerationBatchItem.batch_id.is_not(None))
+            .distinct()
+        ).scalars().all()
+    finally:
+        session.close()
+
+    backend = batch_backend()
+    for batch_id in batch_ids:
+        job_failed = False
+        try:
+            results = backend.poll(batch_id)
+        except BatchJobFailed as exc:
+            logger.error("배치 작업 실패: %s", exc)
+            results, job_failed = {}, True
+        except Exception:
+            logger.exception("배치 작업 상태 확인 실패, 다음 주기에 재시도: batch_id=%s", batch_id)
+            continue
+        if results is None:
+            continue
+        _apply_batch_results(batch_id, results, job_failed)
+
+
+def _apply_batch_results(batch_id: str, results: Dict[str, BatchResult], job_failed: bool) -> None:
+    """끝난 배치 작업의 결과를 항목별 트랜잭션으로 반영합니다."""
+    session = get_sync_session()
+    try:
+        generation_ids: List[UUID] = session.execute(
+            select(GenerationBatchItem.generation_id).where(GenerationBatchItem.batch_id == batch_id)
+        ).scalars().all()
+        session.commit()
+
+        for generation_id in generation_ids:
+            item = session.get(
+                GenerationBatchItem, generation_id, with_for_update={"skip_locked": True}
+            )
+            # 다른 poll 태스크가 이미 처리 중이거나 처리한 항목
+            if item is None or item.batch_id != batch_id:
+                session.commit()
+                continue
+            try:
+                _apply_result(session, item, results.get(str(generation_id)), job_failed)
+            except Exception:
+                session.rollback()
+                logger.exception("배치 결과 반영 실패: generation_id=%s", generation_id)
+                _fail_item(session, generation_id)
+    finally:
+        session.close()
+    increment("batch_jobs_completed")
+    logger.info("배치 작업 결과 반영 완료: batch_id=%s, 결과 수=%d", batch_id, len(results))
+
+
+def _apply_result(
+    session: Session, item: GenerationBatchItem, result: Optional[BatchResult], job_failed: bool
+) -> None:
+    generation = session.get(Generation, item.generation_id)
+    if generation is None or generation.status != GenerationStatus.generating:
+        # 처리 중 취소‧삭제된 generation
+        session.delete(item)
+        session.commit()
+        return
+
+    if result is None and not job_failed:
+        # 만료‧취소된 배치 작업에서 처리되지 않은 요청은 다음 주기에 다시 제출
+        item.batch_id = None
+        session.commit()
+        return
+    if result is None or result.error is not None:
+        _fail(session, item, generation, "배치 요청 실패: generation_id=%s (%s)",
+              generation.id, result.error if result else "batch job failed")
+        return
+
+    content = result.content
+    # 배치 응답은 GPT 응답 캐시를 거치지 않으므로 캐시 정리용 messages 는 비워 둠
+    if item.stage == GenerationBatchStage.classify:
+        if settings.GENERATION_COMBINED_EXTRACTION:
+            contract_type, fields = parse_combined_result(content, [])
+        else:
+            contract_type, fields = parse_contract_type(content), None
+        if not is_supported_contract_type(contract_type):
+            _fail(session, item, generation, "Unsupported contract type generated: \'%s\'", contract_type)
+            return
+        item.contract_type = contract_type
+        if fields is None:
+            _advance(session, item, GenerationBatchStage.extract)
+            return
+        content = None  # 통합 추출 결과는 아래 extract 단계 검증으로
+
+    if item.stage in {GenerationBatchStage.classify, GenerationBatchStage.extract}:
+        if content is not None:
+            fields = parse_checked_fields(content, [], item.contract_type)
+        if not matches_schema(item.contract_type, fields):
+            _fail(
+                session, item, generation,
+                "Generated contract fields do not match schema for type \'%s\'", item.contract_type
+            )
+            return
+        item.fields = fields
+        if pending_annotation_paths(item.contract_type, fields):
+            _advance(session, item, GenerationBatchStage.annotate)
+            return
+        suggestions = {}  # 공란이 없거나 모두 캐시된 제안으로 채울 수 있으면 annotate 단계 생략
+    else:
+        suggestions = parse_suggestions(content)
+
+    # 최종 저장
+    suggestions = merge_suggestions(item.contract_type, item.fields, suggestions)
+    transcription = session.get(Transcription, generation.transcription_id)
+    session.delete(item)
+    save_contract(session, generation, item.contract_type, item.fields, suggestions)
+    logger.info("계약서 생성(배치) 완료: generation_id=%s", generation.id)
+    if transcription is not None and transcription.script_file:
+        delete_script_file(transcription.script_file)
+
+
+def _advance(session: Session, item: GenerationBatchItem, stage: GenerationBatchStage) -> None:
+    item.stage = stage
+    item.batch_id = None
+    session.commit()
+
+
+def _build_stage_request(session: Session, item: GenerationBatchItem) -> Optional[dict]:
+    """항목의 현재 단계 요청 본문. 입력이 없어 진행할 수 없으면 generation 을 실패 처리하고 None."""
+    if item.stage == GenerationBatchStage.annotate:
+        # 제출 전에 캐시가 채워졌으면 공란 전체를 요청 (결과는 merge_suggestions 가 GPT 제안 우선으로 합침)
+        field_paths = (
+            pending_annotation_paths(item.contract_type, item.fields)
+            or blank_field_paths(item.contract_type, item.fields)
+        )
+        return build_chat_request(build_annotation_messages(item.contract_type, field_paths))
+
+    generation = session.get(Generation, item.generation_id)
+    transcription = session.get(Transcription, generation.transcription_id)
+    try:
+        if transcription is None or not transcription.script_file:
+            raise TranscriptNotFound(generation.transcription_id)
+        conversation_text = read_transcript(transcription.script_file)
+    except TranscriptNotFound:
+        _fail(session, item, generation, "대화 텍스트 없음: generation_id=%s", generation.id, commit=False)
+        return None
+
+    if item.stage == GenerationBatchStage.extract:
+        return build_chat_request(build_extraction_messages(conversation_text, item.contract_type))
+    if settings.GENERATION_COMBINED_EXTRACTION:
+        return build_chat_request(
+            build_combined_messages(conversation_text),
+            model=settings.GENERATION_COMBINED_MODEL,
+            response_format=COMBINED_RESPONSE_FORMAT,
+        )
+    return build_chat_request(build_type_messages(conversation_text))
+
+
+def _fail(
+    session: Session,
+    item: GenerationBatchItem,
+    generation: Generation,
+    message: str,
+    *args,
+    commit: bool = True,
+) -> None:
+    generation.status = GenerationStatus.failed
+    session.delete(item)
+    if commit:
+        session.commit()
+    logger.error(message, *args)
+
+
+def _fail_item(session: Session, generation_id: UUID) -> None:
+    """예외로 결과를 반영하지 못한 항목: 새 트랜잭션에서 실패 처리합니다."""
+    try:
+        item = session.get(GenerationBatchItem, generation_id)
+        generation = session.get(Generation, generation_id)
+        if item is not None and generation is not None:
+            _fail(session, item, generation, "배치 생성 실패: generation_id=%s", generation_id)
+    except Exception as e:
+        session.rollback()
+        logger.warning("generation 상태 저장 중 추가 에러 발생: %s", e)
@@ -1,142 +1,569 @@
 from app.core.logger import logging
 logger = logging.getLogger(__name__)
 
-from pathlib import Path
+import asyncio
+import functools
+import time
+from contextlib import contextmanager
+from typing import Awaitable, Callable, Dict, Iterator, List, NoReturn, Optional, Tuple
+
+from celery import chain
+from celery.exceptions import Ignore
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
 from app.core.celery_app import celery_app
-from app.db.session import get_sync_session
+from app.core.async_runner import run_coroutine
+from app.core.cancellation import CancelWatcher
+from app.core.transcript_store import (
+    aread_transcript, cached_transcripts, delete_transcript, read_transcript,
+)
+from app.db.session import get_sync_session, async_session_factory
 
 from app.models.transcription import Transcription
 from app.models.generation import Generation, GenerationStatus
 from app.models.contract import Contract
 from app.models.suggestion import GptSuggestion
 
-from app.core.llm import call_gpt_api
+from app.core.llm import (
+    call_gpt_api, acall_gpt_api, stream_gpt_api, astream_gpt_api,
+    log_token_usage, GPTCallCancelled, StreamValidator,
+)
 from app.core.config import settings
-from app.prompts.type_classifier import get_contract_type
-from app.prompts.keyword_extractor import extract_fields
-from app.prompts.annotater import annotate_contract_text
+from app.core.metrics import stage_timer, increment, record_latency, log_latency_summary
+from app.prompts.type_classifier import (
+    get_contract_type, aget_contract_type, aclassify_text, rank_contract_types,
+)
+from app.prompts.keyword_extractor import (
+    extract_fields, aextract_fields, build_extraction_messages, parse_checked_fields
+)
+from app.prompts.annotater import annotate_contract_text, aannotate_contract_text
+from app.prompts.combined_extractor import extract_combined, aextract_combined
+from app.prompts.stream_validators import TypeAnswerValidator, SchemaKeyOrderValidator
+from app.prompts.templates import get_extraction_shards
 from app.prompts.keyword_schema import (
-    is_supported_contract_type, matches_schema, is_valid_field_path
+    is_supported_contract_type, matches_schema, invalid_field_paths
 )
 
 
-@celery_app.task(name="tasks.generations.process_generation_pipeline", bind=True)
-def process_generation_pipeline(self, generation_id: str) -> None:
-    logger.info("계약서 생성 파이프라인 시작: generation_id=%s", generation_id)
+# --------------------------------------------------------------------------- #
+# 동기 파이프라인: 단계별 태스크 체인
+#   classify_contract_type (classify 큐, 짧은 GPT 호출)
+#   → extract_contract_fields (generation 큐)
+#   → annotate_and_save_contract (generation 큐)
+# 단계 사이에는 {generation_id, script_file, contract_type, fields, started_at} 을 넘깁니다.
+# 대화 텍스트 본문은 브로커‧결과 백엔드를 거치지 않도록 이름(script_file)만 넘기고,
+# 각 단계가 저장소에서 읽습니다 (단계 안에서는 read-through 캐시로 한 번만 읽음).
+# --------------------------------------------------------------------------- #
 
-    session = get_sync_session()
-    try:
-        # 생성된 generation 레코드 가져오기
-        generation = session.get(Generation, generation_id)
-        if not generation or generation.status in {
-            GenerationStatus.cancelled, GenerationStatus.done
-        }:
-            return
+def generation_chain(generation_id: str) -> chain:
+    """계약서 생성 단계 태스크 체인을 만듭니다. 큐 배정은 celery_app 의 task_routes 를 따릅니다."""
+    return chain(
+        classify_contract_type.s(generation_id),
+        extract_contract_fields.s(),
+        annotate_and_save_contract.s(),
+    )
+
+
+@celery_app.task(name="tasks.generations.classify_contract_type")
+def classify_contract_type(generation_id: str) -> dict:
+    logger.info("계약서 생성 파이프라인 시작: generation_id=%s", generation_id)
 
+    with _generation_stage("classify", generation_id) as (session, generation, watcher):
         # join. transcription 레코드 가져오기 (-> script_file uuid 가져오기)
         transcription = session.get(
             Transcription,
             generation.transcription_id
         )
         if not transcription or not transcription.script_file:
-            generation.status = GenerationStatus.failed
-            session.commit()
-            return
-        
+            _fail_generation(session, generation, "대화 텍스트 없음: generation_id=%s", generation_id)
+        session.commit()
+
         # 1. 계약 유형 판단
-        session.refresh(generation)
-        if generation.status == GenerationStatus.cancelled:
-            return
-        contract_type = get_contract_type(
-            transcription.script_file,
-            call_gpt_api
-        )
+        #    (통합 모드: 필드 추출까지 한 번에 / 추측 실행 모드: 후보 유형의 필드 추출을 동시에 시작)
+        started_at = time.time()
+        prefetched_fields = None
+        if settings.GENERATION_COMBINED_EXTRACTION:
+            with stage_timer("classify_extract"):
+                contract_type, prefetched_fields = extract_combined(
+                    transcription.script_file,
+                    _gpt_caller("classify_extract", None, watcher.is_cancelled)
+                )
+        elif settings.GENERATION_SPECULATIVE_TOP_K > 0:
+            contract_type, prefetched_fields = run_coroutine(
+                # 본문은 이 단계의 캐시 범위에서 읽어 넘김 (코루틴은 워커 공용 이벤트 루프 스레드에서 실행)
+                _aclassify_with_speculation(
+                    read_transcript(transcription.script_file), _acancel_checker(watcher)
+                )
+            )
+        else:
+            with stage_timer("classify"):
+                contract_type = get_contract_type(
+                    transcription.script_file,
+                    _gpt_caller("classify", TypeAnswerValidator(), watcher.is_cancelled)
+                )
         ### 정의되지 않은 계약 유형인 경우 생성 실패 처리
         if not is_supported_contract_type(contract_type):
-            generation.status = GenerationStatus.failed
-            session.commit()
-            logger.error("Unsupported contract type generated: \'%s\'", contract_type)
-            return
+            _fail_generation(session, generation, "Unsupported contract type generated: \'%s\'", contract_type)
         logger.debug("계약 유형 판별 완료: type='%s'", contract_type)
 
-        # 2. 계약서 JSON 생성
-        session.refresh(generation)
-        if generation.status == GenerationStatus.cancelled:
-            return
-        contract_fields = extract_fields(
-            transcription.script_file,
-            contract_type,
-            call_gpt_api
-        )
+        return {
+            "generation_id": generation_id,
+            "script_file": transcription.script_file,
+            "contract_type": contract_type,
+            "fields": prefetched_fields,
+            "started_at": started_at,
+        }
+
+
+@celery_app.task(name="tasks.generations.extract_contract_fields")
+def extract_contract_fields(payload: dict) -> dict:
+    generation_id = payload["generation_id"]
+    contract_type = payload["contract_type"]
+
+    with _generation_stage("extract", generation_id) as (session, generation, watcher):
+        # 2. 계약서 JSON 생성 (통합 모드·추측 실행 적중 시 이미 추출됨)
+        contract_fields = payload["fields"]
+        if contract_fields is None:
+            with stage_timer("extract"):
+                contract_fields = extract_fields(
+                    payload["script_file"],
+                    contract_type,
+                    _gpt_caller("extract", _extract_validator(contract_type), watcher.is_cancelled)
+                )
         ### 생성된 JSON 필드 유효성 검증
         if not matches_schema(contract_type, contract_fields):
-            generation.status = GenerationStatus.failed
-            session.commit()
-            logger.error("Generated contract fields do not match schema for type \'%s\'", contract_type)
-            return
+            _fail_generation(
+                session, generation,
+                "Generated contract fields do not match schema for type \'%s\'", contract_type
+            )
         logger.debug("계약서 JSON 필드 추출 완료: 필드 수=%d", len(contract_fields))
 
-        # 3. 공란에 대한 정보 제안 텍스트 생성
-        session.refresh(generation)
-        if generation.status == GenerationStatus.cancelled:
-            return
-        contract_suggestions = annotate_contract_text(
-            contract_type,
-            contract_fields,
-            call_gpt_api
-        )
+        return {**payload, "fields": contract_fields}
 
-        # 계약서 테이블에 새 레코드 추가
-        contract = Contract(
-            user_id=generation.user_id,
-            generation_id=generation.id,
-            contract_type=contract_type,
-            contents=contract_fields,
-            initial_contents=contract_fields,
-        )
-        session.add(contract)
-        session.commit()  # 먼저 commit하여 contract.id 생성
-
-        # 계약서 필드마다 제안 텍스트를 suggestion 테이블에 새 레코드로 추가
-        for field_path, suggestion_text in contract_suggestions.items():
-            # 유효하지 않은 key에 대한 제안은 저장하지 않고 로그만 남김
-            if not is_valid_field_path(contract_type, field_path):
-                logger.warning("Invalid suggestion field_path: \'%s\'", field_path)
-                continue
-            if suggestion_text.strip():  # 빈 제안은 저장하지 않음
-                suggestion = GptSuggestion(
-                    contract_id=contract.id,
-                    field_path=field_path,
-                    suggestion_text=suggestion_text,
-                )
-                session.add(suggestion)
 
-        # 계약서 생성 파이프라인 성공적으로 완료
-        generation.status = GenerationStatus.done
-        session.commit()
+@celery_app.task(name="tasks.generations.annotate_and_save_contract")
+def annotate_and_save_contract(payload: dict) -> None:
+    generation_id = payload["generation_id"]
+    contract_type = payload["contract_type"]
+    contract_fields = payload["fields"]
+
+    with _generation_stage("annotate", generation_id) as (session, generation, watcher):
+        # 3. 공란에 대한 정보 제안 텍스트 생성
+        with stage_timer("annotate"):
+            contract_suggestions = annotate_contract_text(
+                contract_type,
+                contract_fields,
+                _gpt_caller("annotate", None, watcher.is_cancelled)
+            )
+        # 단계 태스크가 서로 다른 워커에서 실행될 수 있으므로 벽시계 기준
+        record_latency(_pipeline_stage(), time.time() - payload["started_at"])
+        # 취소 신호 구독에 실패했으면 DB 상태로 다시 확인 (취소된 작업을 done 으로 덮어쓰지 않도록)
+        if watcher.is_cancelled() or (not watcher.subscribed and _cancelled_in_db(session, generation)):
+            raise Ignore()
+
+        save_contract(session, generation, contract_type, contract_fields, contract_suggestions)
         logger.info("계약서 생성 파이프라인 완료: generation_id=%s", generation.id)
+        _log_generation_metrics()
 
         # 대화 텍스트 삭제
-        try:
-            script_path = Path(settings.TEXT_UPLOAD_DIR) / transcription.script_file
-            if script_path.is_file():
-                script_path.unlink()
-                logger.debug("Deleted script file after successful generation: %s", script_path)
-        except Exception as e:
-            logger.warning("Failed to delete script file %s: %s", script_path, e)
+        delete_script_file(payload["script_file"])
+
+
+@contextmanager
+def _generation_stage(
+    stage: str, generation_id: str
+) -> Iterator[Tuple[Session, Generation, CancelWatcher]]:
+    """
+    단계 태스크 공통 처리: 세션·취소 신호 구독을 열고 generation 레코드를 불러옵니다.
+
+    이미 취소·완료된 generation 이거나 실행 중 취소되면 ``Ignore`` 를 발생시켜
+    체인의 다음 단계가 실행되지 않게 하고, 그 밖의 예외는 상태를 failed 로 저장한 뒤 다시 발생시킵니다.
+    """
+    session = get_sync_session()
+    # 취소 요청은 Redis pub/sub 신호로 받음 (단계 사이 확인에 DB 조회 없음)
+    watcher = CancelWatcher("generation", generation_id).start()
+    generation = None
+    try:
+        # 생성된 generation 레코드 가져오기
+        generation = session.get(Generation, generation_id)
+        if not generation or generation.status in {
+            GenerationStatus.cancelled, GenerationStatus.done
+        } or watcher.is_cancelled():
+            raise Ignore()
+        # 조회 트랜잭션을 끝내 긴 GPT 호출 동안 DB 연결을 풀에 반납 (green 풀에서 동시 태스크 수 > 연결 수)
+        session.commit()
+        # 단계 안에서 대화 텍스트는 저장소에서 한 번만 읽음
+        with cached_transcripts():
+            yield session, generation, watcher
+
+    except Ignore:
+        raise
+
+    # 스트리밍 도중 취소 확인 (상태는 이미 cancelled)
+    except GPTCallCancelled:
+        logger.info("계약서 생성 파이프라인 취소로 중단: generation_id=%s, 단계=%s", generation_id, stage)
+        raise Ignore()
 
     # 계약서 생성 파이프라인 실패 및 중단
-    except Exception as exc:
-        logger.exception("계약서 생성 파이프라인 실패: generation_id=%s", generation_id)
+    except Exception:
+        logger.exception("계약서 생성 파이프라인 실패: generation_id=%s, 단계=%s", generation_id, stage)
         try:
-            if "generation" in locals() and generation:
+            if generation is not None:
+                session.rollback()  # 저장 트랜잭션 도중 실패했으면 계약서‧제안 INSERT 를 함께 취소
                 generation.status = GenerationStatus.failed
                 session.commit()
         except Exception as e:
             logger.warning("generation 상태 저장 중 추가 에러 발생: %s", e)
-        raise exc
+        raise
+
+    finally:
+        watcher.close()
+        session.close()
+
+
+def _cancelled_in_db(session: Session, generation: Generation) -> bool:
+    session.refresh(generation, attribute_names=["status"])
+    return generation.status == GenerationStatus.cancelled
+
+
+def _fail_generation(session: Session, generation: Generation, message: str, *args) -> NoReturn:
+    """결과가 유효하지 않아 더 진행할 수 없을 때: 상태를 failed 로 저장하고 체인을 멈춥니다."""
+    generation.status = GenerationStatus.failed
+    session.commit()
+    logger.error(message, *args)
+    raise Ignore()
+
+
+def save_contract(
+    session: Session,
+    generation: Generation,
+    contract_type: str,
+    contract_fields: dict,
+    contract_suggestions: Dict[str, str],
+) -> None:
+    """
+    계약서와 필드별 제안 텍스트를 저장하고 generation 을 done 으로 전환합니다 (배치 모드와 공용).
+
+    계약서 INSERT, 제안 일괄 INSERT, generation 상태 변경을 한 트랜잭션으로 처리합니다.
+    """
+    contract = _new_contract(generation, contract_type, contract_fields)
+    suggestion_rows = _suggestion_rows(contract, contract_suggestions)
+
+    # 계약서 생성 파이프라인 성공적으로 완료
+    generation.status = GenerationStatus.done
+    session.add(contract)
+    session.flush()  # 제안 INSERT 의 외래 키보다 계약서 INSERT 가 먼저
+    if suggestion_rows:
+        session.execute(insert(GptSuggestion).values(suggestion_rows))
+    session.commit()
+
+
+def _new_contract(generation: Generation, contract_type: str, contract_fields: dict) -> Contract:
+    # id 는 모델 기본값(uuid4)으로 클라이언트에서 생성되므로 commit 없이 제안 행에 바로 사용
+    return Contract(
+        user_id=generation.user_id,
+        generation_id=generation.id,
+        contract_type=contract_type,
+        contents=contract_fields,
+        initial_contents=contract_fields,
+    )
+
+
+def _suggestion_rows(contract: Contract, contract_suggestions: Dict[str, str]) -> List[dict]:
+    """일괄 INSERT 할 제안 행. 유효하지 않은 key는 로그만 남기고, 빈 제안은 저장하지 않습니다."""
+    invalid_paths = invalid_field_paths(contract.contract_type, contract_suggestions)
+    if invalid_paths:
+        logger.warning("Invalid suggestion field_path: %s", sorted(invalid_paths))
+    return [
+        {"contract_id": contract.id, "field_path": field_path, "suggestion_text": suggestion_text}
+        for field_path, suggestion_text in contract_suggestions.items()
+        if field_path not in invalid_paths and suggestion_text.strip()
+    ]
+
+
+@celery_app.task(name="tasks.generations.process_generation_pipeline")
+def process_generation_pipeline(generation_id: str) -> None:
+    """
+    이전 단일 태스크 이름의 호환용 별칭 (deprecated). 단계별 태스크 체인(``generation_chain``)을 시작합니다.
+
+    배포 전에 큐에 들어간 이전 이름의 메시지를 처리하기 위한 것으로, 새 요청은 이 이름으로 등록하지 않습니다.
+    """
+    logger.warning(
+        "deprecated 태스크 이름(process_generation_pipeline)으로 생성 요청 수신, 단계별 체인으로 전환: "
+        "generation_id=%s", generation_id
+    )
+    generation_chain(generation_id).apply_async()
+
+
+@celery_app.task(name="tasks.generations.process_generation_pipeline_async", bind=True)
+def process_generation_pipeline_async(self, generation_id: str) -> None:
+    """
+    단계별 태스크 체인(``generation_chain``)의 asyncio 단일 태스크 버전.
+
+    파이프라인 본문을 워커 프로세스 공용 이벤트 루프(app.core.async_runner)에서 실행합니다.
+    GPT 호출(AsyncOpenAI)과 DB 접근(asyncpg)이 모두 비동기이므로,
+    threads/gevent 풀로 여러 태스크를 동시에 받으면 한 프로세스 안에서
+    여러 생성 작업의 네트워크 대기가 겹쳐 진행됩니다.
+
+    취소 신호를 받으면 파이프라인 코루틴 자체를 취소하므로
+    진행 중인 GPT 요청(HTTP 연결)도 응답을 기다리지 않고 바로 끊깁니다.
+    """
+    with CancelWatcher("generation", generation_id) as watcher:
+        run_coroutine(_arun_generation_pipeline(generation_id, watcher))
+
+
+async def _arun_generation_pipeline(generation_id: str, watcher: CancelWatcher) -> None:
+    logger.info("계약서 생성 파이프라인(async) 시작: generation_id=%s", generation_id)
+
+    pipeline_task = asyncio.current_task()
+    persisting = False
+
+    def _interrupt() -> None:
+        # 이벤트 루프 스레드에서 실행. 결과 저장(커밋)이 시작된 뒤에는 끊지 않음
+        if not persisting:
+            pipeline_task.cancel()
+
+    loop = asyncio.get_running_loop()
+    watcher.add_callback(lambda: loop.call_soon_threadsafe(_interrupt))
+
+    # 유형 판단‧필드 추출이 같은 대화 텍스트를 저장소에서 한 번만 읽도록 태스크 범위 캐시 사용
+    async with async_session_factory() as session, cached_transcripts():
+        try:
+            generation = await session.get(Generation, generation_id)
+            if not generation or generation.status in {
+                GenerationStatus.cancelled, GenerationStatus.done
+            }:
+                return
+
+            transcription = await session.get(
+                Transcription,
+                generation.transcription_id
+            )
+            if not transcription or not transcription.script_file:
+                generation.status = GenerationStatus.failed
+                await session.commit()
+                return
+
+            # 1. 계약 유형 판단
+            pipeline_started = time.perf_counter()
+            is_cancelled = _acancel_checker(watcher)
+            prefetched_fields = None
+            if settings.GENERATION_COMBINED_EXTRACTION:
+                with stage_timer("classify_extract"):
+                    contract_type, prefetched_fields = await aextract_combined(
+                        transcription.script_file,
+                        _agpt_caller("classify_extract", None, is_cancelled)
+                    )
+            elif settings.GENERATION_SPECULATIVE_TOP_K > 0:
+                contract_type, prefetched_fields = await _aclassify_with_speculation(
+                    await aread_transcript(transcription.script_file), is_cancelled
+                )
+            else:
+                with stage_timer("classify"):
+                    contract_type = await aget_contract_type(
+                        transcription.script_file,
+                        _agpt_caller("classify", TypeAnswerValidator(), is_cancelled)
+                    )
+            if not is_supported_contract_type(contract_type):
+                generation.status = GenerationStatus.failed
+                await session.commit()
+                logger.error("Unsupported contract type generated: \'%s\'", contract_type)
+                return
+            logger.debug("계약 유형 판별 완료: type='%s'", contract_type)
+
+            # 2. 계약서 JSON 생성
+            if prefetched_fields is not None:
+                contract_fields = prefetched_fields
+            else:
+                with stage_timer("extract"):
+                    contract_fields = await aextract_fields(
+                        transcription.script_file,
+                        contract_type,
+                        _agpt_caller("extract", _extract_validator(contract_type), is_cancelled)
+                    )
+            if not matches_schema(contract_type, contract_fields):
+                generation.status = GenerationStatus.failed
+                await session.commit()
+                logger.error("Generated contract fields do not match schema for type \'%s\'", contract_type)
+                return
+            logger.debug("계약서 JSON 필드 추출 완료: 필드 수=%d", len(contract_fields))
+
+            # 3. 공란에 대한 정보 제안 텍스트 생성
+            with stage_timer("annotate"):
+                contract_suggestions = await aannotate_contract_text(
+                    contract_type,
+                    contract_fields,
+                    _agpt_caller("annotate", None, is_cancelled)
+                )
+            record_latency(_pipeline_stage(), time.perf_counter() - pipeline_started)
+            if watcher.is_cancelled():
+                return
+            if not watcher.subscribed:
+                # 취소 신호 구독에 실패했으면 DB 상태로 다시 확인
+                await session.refresh(generation, attribute_names=["status"])
+                if generation.status == GenerationStatus.cancelled:
+                    return
+            persisting = True
+
+            # save_contract 와 같이 한 트랜잭션으로 저장
+            contract = _new_contract(generation, contract_type, contract_fields)
+            suggestion_rows = _suggestion_rows(contract, contract_suggestions)
+            generation.status = GenerationStatus.done
+            session.add(contract)
+            await session.flush()
+            if suggestion_rows:
+                await session.execute(insert(GptSuggestion).values(suggestion_rows))
+            await session.commit()
+            logger.info("계약서 생성 파이프라인(async) 완료: generation_id=%s", generation.id)
+            _log_generation_metrics()
+
+            delete_script_file(transcription.script_file)
+
+        except (GPTCallCancelled, asyncio.CancelledError):
+            if not watcher.is_cancelled():
+                raise
+            logger.info("계약서 생성 파이프라인(async) 취소로 중단: generation_id=%s", generation_id)
+
+        except Exception as exc:
+            logger.exception("계약서 생성 파이프라인(async) 실패: generation_id=%s", generation_id)
+            try:
+                if "generation" in locals() and generation:
+                    await session.rollback()
+                    generation.status = GenerationStatus.failed
+                    await session.commit()
+            except Exception as e:
+                logger.warning("generation 상태 저장 중 추가 에러 발생: %s", e)
+            raise exc
+
+
+async def _aclassify_with_speculation(
+    conversation_text: str,
+    is_cancelled: Callable[[], Awaitable[bool]],
+) -> Tuple[str, Optional[dict]]:
+    """
+    계약 유형 판단과 동시에 후보 유형들의 필드 추출을 미리 시작합니다.
+
+    후보는 대화 단서 빈도(rank_contract_types) 상위 k개 중, 추출 프롬프트 길이 합계가
+    GENERATION_SPECULATIVE_MAX_PROMPT_CHARS 를 넘지 않는 범위에서 고릅니다.
+    판단된 유형과 일치하는 추출 결과만 사용하고 나머지 요청은 취소합니다.
+    모든 호출은 일반 단계와 같은 검증기‧취소 확인을 거치며, 적중한 추출 결과가 실패하거나
+    스키마에 맞지 않으면 None 을 돌려 일반 필드 추출로 넘깁니다.
+
+    Returns
+    -------
+    tuple[str, dict | None]
+        (계약 유형, 추측 실행이 적중한 경우 추출된 필드 / 빗나간 경우 None)
+    """
+    # 비용 상한 안에서 후보 선정
+    candidates: Dict[str, list] = {}
+    spent_chars = 0
+    for candidate in rank_contract_types(conversation_text)[:settings.GENERATION_SPECULATIVE_TOP_K]:
+        messages = build_extraction_messages(conversation_text, candidate)
+        prompt_chars = sum(len(m["content"]) for m in messages)
+        if spent_chars + prompt_chars > settings.GENERATION_SPECULATIVE_MAX_PROMPT_CHARS:
+            break
+        candidates[candidate] = messages
+        spent_chars += prompt_chars
+
+    async def _timed_call(candidate: str, messages: list) -> str:
+        with stage_timer("extract_speculative"):
+            return await _agpt_caller("extract", _extract_validator(candidate), is_cancelled)(messages)
+
+    extract_tasks = {
+        candidate: asyncio.create_task(_timed_call(candidate, messages))
+        for candidate, messages in candidates.items()
+    }
+    try:
+        with stage_timer("classify"):
+            contract_type = await aclassify_text(
+                conversation_text, _agpt_caller("classify", TypeAnswerValidator(), is_cancelled)
+            )
+
+        task = extract_tasks.pop(contract_type, None)
+        if task is None:
+            increment("speculative_miss")
+            logger.debug(
+                "추측 실행 빗나감: type='%s', candidates=%s", contract_type, list(candidates)
+            )
+            return contract_type, None
+
+        increment("speculative_hit")
+        # 분류 이후 추출 결과를 추가로 기다린 시간만 extract 단계로 기록
+        try:
+            with stage_timer("extract"):
+                fields = parse_checked_fields(
+                    await task, candidates[contract_type], contract_type
+                )
+        except GPTCallCancelled:
+            raise
+        except Exception as exc:
+            logger.warning("추측 실행 추출 실패, 일반 추출로 진행: type='%s' (%s)", contract_type, exc)
+            return contract_type, None
+        if not matches_schema(contract_type, fields):
+            logger.warning("추측 실행 추출 결과가 스키마와 다름, 일반 추출로 진행: type='%s'", contract_type)
+            return contract_type, None
+        return contract_type, fields
 
     finally:
-        session.close()
\ No newline at end of file
+        for task in extract_tasks.values():
+            task.cancel()
+        if extract_tasks:
+            await asyncio.gather(*extract_tasks.values(), return_exceptions=True)
+
+
+# --------------------------------------------------------------------------- #
+# GPT 호출 함수 구성 (스트리밍 사용 시 단계별 검증기 + 취소 확인)
+# --------------------------------------------------------------------------- #
+
+def _acancel_checker(watcher: CancelWatcher) -> Callable[[], Awaitable[bool]]:
+    async def is_cancelled() -> bool:
+        return watcher.is_cancelled()
+    return is_cancelled
+
+
+def _extract_validator(contract_type: str) -> Optional[StreamValidator]:
+    # 샤드 요청은 동시에 진행되므로 상태를 가진 검증기 하나를 함께 쓸 수 없음
+    if get_extraction_shards(contract_type):
+        return None
+    return SchemaKeyOrderValidator(contract_type)
+
+
+def _gpt_caller(stage: str, validator: Optional[StreamValidator], is_cancelled: Callable[[], bool]):
+    if not settings.LLM_STREAMING_ENABLED:
+        return functools.partial(call_gpt_api, stage=stage)
+    return functools.partial(stream_gpt_api, validator=validator, is_cancelled=is_cancelled, stage=stage)
+
+
+def _agpt_caller(
+    stage: str, validator: Optional[StreamValidator], is_cancelled: Callable[[], Awaitable[bool]]
+):
+    if not settings.LLM_STREAMING_ENABLED:
+        return functools.partial(acall_gpt_api, stage=stage)
+    return functools.partial(astream_gpt_api, validator=validator, is_cancelled=is_cancelled, stage=stage)
+
+
+# 파이프라인 방식별 GPT 단계 전체 소요 시간 지표 이름 (A/B 비교용)
+_PIPELINE_STAGES = ("pipeline_combined", "pipeline_speculative", "pipeline_staged")
+
+
+def _pipeline_stage() -> str:
+    if settings.GENERATION_COMBINED_EXTRACTION:
+        return "pipeline_combined"
+    if settings.GENERATION_SPECULATIVE_TOP_K > 0:
+        return "pipeline_speculative"
+    return "pipeline_staged"
+
+
+def _log_generation_metrics() -> None:
+    log_latency_summary("classify", "extract", "classify_extract", "annotate", *_PIPELINE_STAGES)
+    log_token_usage()
+
+
+def delete_script_file(script_file: str) -> None:
+    """생성 완료 후 대화 텍스트를 저장소에서 삭제합니다. 실패해도 파이프라인은 성공으로 둡니다."""
+    try:
+        delete_transcript(script_file)
+        logger.debug("Deleted script file after successful generation: %s", script_file)
+    except Exception as e:
+        logger.warning("Failed to delete script file %s: %s", script_file, e)
@@ -1,10 +1,14 @@
+import uuid
 from pathlib import Path
+from typing import Iterable, Iterator
 
 from app.core.celery_app import celery_app
+from app.core.cancellation import CancelWatcher, TaskCancelled
 from app.db.session import get_sync_session
-from app.core.stt import transcribe_audio
+from app.core.stt import transcribe_audio_stream
+from app.core.transcript_store import delete_transcript
 from app.models.transcription import Transcription, TranscriptionStatus
-from app.prompts.preprocessor import text_preprocess
+from app.prompts.preprocessor import stream_preprocess
 from app.core.config import settings
 
 from app.core.logger import logging
@@ -16,6 +20,8 @@ def process_uploaded_audio(self, transcription_id: str) -> None:
     logger.info("STT 태스크 시작: transcription_id=%s", transcription_id)
 
     session = get_sync_session()
+    # 취소 요청은 Redis pub/sub 신호로 받음 (변환 구간 사이마다 확인)
+    watcher = CancelWatcher("transcription", transcription_id).start()
     try:
         transcription = session.get(Transcription, transcription_id)
         if not transcription or transcription.status in {
@@ -30,12 +36,17 @@ def process_uploaded_audio(self, transcription_id: str) -> None:
         logger.info("transcription 상태 'transcribing' 설정 완료: transcription_id=%s", transcription_id)
 
         try:
-            # Whisper API 호출 및 변환
-            script_filename = transcribe_audio(transcription.audio_file)
-            processed_filename = f"processed_{script_filename}"
+            # Whisper API 호출 및 변환, 변환된 조각부터 바로 텍스트 전처리
+            processed_filename = f"processed_{uuid.uuid4()}.txt"
+            stream_preprocess(
+                _until_cancelled(transcribe_audio_stream(transcription.audio_file), watcher),
+                processed_filename
+            )
 
-            # 텍스트 전처리 실행
-            text_preprocess(script_filename, processed_filename)
+        # 취소 신호로 중단 (상태는 이미 cancelled, 남은 Whisper 구간 요청은 취소됨)
+        except TaskCancelled:
+            logger.info("STT 태스크 취소로 중단: transcription_id=%s", transcription_id)
+            return
 
         except Exception as exc:
             transcription.status = TranscriptionStatus.transcription_failed
@@ -43,10 +54,13 @@ def process_uploaded_audio(self, transcription_id: str) -> None:
             logger.error("STT 변환 실패: transcription_id=%s", transcription.id, exc_info=True)
             raise exc
         else:
-            updated_transcription = session.get(Transcription, transcription_id)
-            if updated_transcription.status == TranscriptionStatus.cancelled:
+            # 취소 신호 구독에 실패했으면 DB 상태로 다시 확인 (취소된 작업을 done 으로 덮어쓰지 않도록)
+            if watcher.is_cancelled() or (
+                not watcher.subscribed and _cancelled_in_db(session, transcription)
+            ):
+                _delete_processed_file(processed_filename)
                 return
-            
+
             # Transcription 테이블 레코드에 파일명 저장하고 상태 반영
             transcription.script_file = processed_filename
             transcription.status = TranscriptionStatus.done
@@ -66,4 +80,30 @@ def process_uploaded_audio(self, transcription_id: str) -> None:
                     logger.warning("Failed to delete audio file %s: %s", audio_path, e)
                     
     finally:
+        watcher.close()
         session.close()
+
+
+def _until_cancelled(segments: Iterable[str], watcher: CancelWatcher) -> Iterator[str]:
+    """변환 조각을 넘기기 전마다 취소 여부를 확인합니다. 취소되면 원본 스트림을 닫아 남은 구간 변환을 멈춥니다."""
+    iterator = iter(segments)
+    try:
+        for segment in iterator:
+            watcher.raise_if_cancelled()
+            yield segment
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            close()
+
+
+def _cancelled_in_db(session, transcription: Transcription) -> bool:
+    session.refresh(transcription, attribute_names=["status"])
+    return transcription.status == TranscriptionStatus.cancelled
+
+
+def _delete_processed_file(filename: str) -> None:
+    try:
+        delete_transcript(filename)
+    except Exception as e:
+        logger.warning("Failed to delete processed file %s: %s", filename, e)
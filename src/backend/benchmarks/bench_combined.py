@@ -0,0 +1,82 @@
+"""
+유형 판단 + 필드 추출 통합 모드 지연 시간 비교
+===========================================
+같은 대화 텍스트로 기존 2단계 방식(get_contract_type → extract_fields)과
+통합 방식(extract_combined, Structured Outputs 한 번 호출)을 번갈아 실행하고
+방식별 p50 / p95 와 결과 일치 여부를 출력합니다. 공란 제안(annotate) 단계는 두 방식이 같으므로 제외합니다.
+
+실제 OpenAI API 를 호출하므로 OPENAI_API_KEY 가 필요하고 비용이 발생합니다.
+측정값이 캐시에 왜곡되지 않도록 GPT 응답 캐시와 유사 대화 유형 캐시는 끈 상태로 실행합니다.
+
+실행 (src/backend 에서):
+    python -m benchmarks.bench_combined path/to/processed_transcript.txt [--repeat 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+
+def _percentile(samples: List[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("transcript", type=Path, help="전처리된 대화 텍스트 파일")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    transcript = args.transcript.resolve()
+    # app 모듈을 import 하기 전에 설정해야 적용됨
+    os.environ["TEXT_UPLOAD_DIR"] = str(transcript.parent)
+    os.environ["LLM_CACHE_ENABLED"] = "false"
+    os.environ["TYPE_CACHE_ENABLED"] = "false"
+
+    from app.core.llm import call_gpt_api
+    from app.core.config import settings
+    from app.prompts.combined_extractor import extract_combined
+    from app.prompts.keyword_extractor import extract_fields
+    from app.prompts.keyword_schema import matches_schema
+    from app.prompts.type_classifier import get_contract_type
+
+    def staged() -> Tuple[str, dict]:
+        contract_type = get_contract_type(transcript.name, call_gpt_api)
+        return contract_type, extract_fields(transcript.name, contract_type, call_gpt_api)
+
+    def combined() -> Tuple[str, dict]:
+        return extract_combined(transcript.name, call_gpt_api)
+
+    modes: Dict[str, Callable[[], Tuple[str, dict]]] = {
+        f"staged ({settings.OPENAI_MODEL})": staged,
+        f"combined ({settings.GENERATION_COMBINED_MODEL})": combined,
+    }
+    timings: Dict[str, List[float]] = {name: [] for name in modes}
+    results: Dict[str, List[str]] = {name: [] for name in modes}
+
+    # 순서 효과를 줄이기 위해 방식을 번갈아 실행
+    for _ in range(args.repeat):
+        for name, run in modes.items():
+            started = time.perf_counter()
+            contract_type, fields = run()
+            timings[name].append(time.perf_counter() - started)
+            valid = "ok" if matches_schema(contract_type, fields) else "schema mismatch"
+            results[name].append(f"{contract_type}/{valid}")
+
+    print(f"transcript: {transcript} ({len(transcript.read_text(encoding='utf-8'))} chars), repeat={args.repeat}")
+    for name, samples in timings.items():
+        print(
+            f"{name:<40} mean={statistics.mean(samples):6.2f}s "
+            f"p50={_percentile(samples, 0.50):6.2f}s p95={_percentile(samples, 0.95):6.2f}s "
+            f"results={sorted(set(results[name]))}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+불용어 제거 전처리 벤치마크
+==========================
+기존 방식(NLTK word_tokenize + 토큰별 stopwords_set 조회)과
+Aho–Corasick 불용어 엔진(app.prompts.stopword_filter)을 긴 대화 텍스트에서 비교합니다.
+
+실행 (src/backend 에서):
+    python -m benchmarks.bench_preprocess [--minutes 60] [--repeat 5]
+
+nltk 는 더 이상 프로젝트 의존성이 아니므로, 설치된 경우에만 기존 방식을 함께 측정합니다.
+NLTK punkt 리소스가 없으면 기존 방식은 문장 분리를 생략(preserve_line=True)하고 측정합니다.
+(문장 분리 비용이 빠지므로 기존 방식에 유리한 조건)
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import time
+from typing import Callable, List
+
+try:
+    from nltk.tokenize import word_tokenize  # 선택 의존성 (기존 방식 비교용)
+except ImportError:
+    word_tokenize = None
+
+from app.prompts.stopwords import stopwords_set
+from app.prompts.stopword_filter import korean_stopword_filter, tokenize
+
+# 대화체 샘플 문장 (불용어·여러 토큰 불용어 포함)
+_SAMPLE_SENTENCES = [
+    "SPEAKER_00 : 아 그러니까 보증금은 천만 원이고 월세는 50만 원으로 하기로 했죠 ?",
+    "SPEAKER_01 : 네 맞아요 . 예를 들면 관리비는 따로 내는 거고요 .",
+    "SPEAKER_00 : 계약 기간은 2024-05-01부터 2년으로 하고 , 하기만 하면 갱신도 가능합니다 .",
+    "SPEAKER_01 : 음 그리고 잔금은 입주 전날까지 드리면 되나요 ?",
+    "SPEAKER_00 : 또한 반려동물은 안 되고요 , 그 외에 특약은 없습니다 .",
+]
+
+
+def _make_transcript(minutes: int, seed: int = 0) -> str:
+    # 분당 약 150 단어 기준
+    rng = random.Random(seed)
+    words_needed = minutes * 150
+    out: List[str] = []
+    count = 0
+    while count < words_needed:
+        sentence = rng.choice(_SAMPLE_SENTENCES)
+        out.append(sentence)
+        count += len(sentence.split())
+    return "\n".join(out)
+
+
+def _legacy(text: str) -> str:
+    return " ".join(w for w in word_tokenize(text) if w not in stopwords_set)
+
+
+def _legacy_without_punkt(text: str) -> str:
+    return " ".join(w for w in word_tokenize(text, preserve_line=True) if w not in stopwords_set)
+
+
+def _regex_set_lookup(text: str) -> str:
+    # 토크나이저 교체 효과만 분리해서 보기 위한 비교군 (여러 토큰 불용어는 제거하지 못함)
+    return " ".join(w for w in tokenize(text) if w not in stopwords_set)
+
+
+def _aho_corasick(text: str) -> str:
+    return korean_stopword_filter.filter_text(text)
+
+
+def _measure(fn: Callable[[str], str], text: str, repeat: int) -> List[float]:
+    fn(text)  # warm-up
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(text)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=int, default=60, help="대화 길이(분)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    text = _make_transcript(args.minutes)
+    print(f"transcript: {args.minutes} min, {len(text):,} chars")
+
+    candidates = [
+        ("regex tokenize + set", _regex_set_lookup),
+        ("regex tokenize + aho-corasick", _aho_corasick),
+    ]
+    if word_tokenize is not None:
+        candidates.insert(0, ("nltk word_tokenize + set", _legacy))
+    else:
+        print("nltk 미설치: 기존 방식(nltk word_tokenize) 측정 생략")
+    for name, fn in candidates:
+        try:
+            timings = _measure(fn, text, args.repeat)
+        except LookupError:
+            name, fn = "nltk (preserve_line, no punkt)", _legacy_without_punkt
+            timings = _measure(fn, text, args.repeat)
+        kept = len(fn(text).split())
+        print(
+            f"{name:32s} median {statistics.median(timings) * 1000:8.1f} ms"
+            f"   min {min(timings) * 1000:8.1f} ms   tokens kept {kept:,}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""
+워커 풀별 처리량 / 메모리 비교 (prefork vs gevent)
+==============================================
+GPT 단계처럼 네트워크 대기뿐인 태스크를 워커 풀 프로필별로 실행하고
+처리량(tasks/s), 워커 프로세스 트리 전체의 최대 RSS, RAM 1GB 당 처리량을 출력합니다.
+
+실제 OpenAI 대신 응답을 --latency 초 늦게 돌려주는 로컬 Chat Completions 스텁 서버를 띄우므로
+비용이 들지 않고, 태스크는 app.core.llm.call_gpt_api 를 그대로 호출합니다(GPT 응답 캐시는 끔).
+워커는 프로필마다 새 프로세스로 띄우며, 측정 전에 태스크 한 번으로 예열합니다.
+
+필요 조건
+    - Redis (CELERY_BROKER_URL / CELERY_RESULT_BACKEND)
+    - gevent / eventlet 프로필 측정 시 해당 패키지 (+ DB 를 쓰는 실제 태스크라면 psycogreen)
+    - Linux (/proc 로 RSS 측정)
+
+실행 (src/backend 에서):
+    python -m benchmarks.bench_worker_pool --tasks 400 --latency 2.0 \\
+        --profile prefork:4 --profile prefork:8 --profile gevent:100
+
+결과 기록 방법
+    - 같은 머신에서 다른 부하 없이 실행하고, 출력 표를 그대로 붙입니다 (CPU 모델, RAM, 커널도 함께 기록).
+    - prefork 는 프로세스 수에 비례해 RSS 가 늘어나므로 -c 를 두세 가지로 바꿔 함께 측정합니다.
+    - --latency 는 운영 환경의 GPT 단계 p50 지연(app.core.metrics 의 latency 로그)에 맞춥니다.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from app.core.celery_app import celery_app
+from app.core.llm import call_gpt_api
+
+BENCH_QUEUE = "bench"
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+@celery_app.task(name="benchmarks.llm_wait", queue=BENCH_QUEUE)
+def llm_wait() -> int:
+    return len(call_gpt_api([{"role": "user", "content": "ping"}]))
+
+
+# --------------------------------------------------------------------------- #
+# OpenAI Chat Completions 스텁 서버
+# --------------------------------------------------------------------------- #
+
+def _start_stub_server(latency: float) -> ThreadingHTTPServer:
+    body = json.dumps({
+        "id": "bench",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "bench-stub",
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": "ok"},
+            "finish_reason": "stop",
+        }],
+        "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+    }).encode("utf-8")
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self) -> None:  # noqa: N802
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            time.sleep(latency)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# --------------------------------------------------------------------------- #
+# 워커 프로세스 / 메모리 측정
+# --------------------------------------------------------------------------- #
+
+def _process_tree_rss(root_pid: int) -> int:
+    """root_pid 와 모든 하위 프로세스의 RSS 합계 (bytes)."""
+    children: Dict[int, List[int]] = {}
+    rss: Dict[int, int] = {}
+    for entry in Path("/proc").iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / "stat").read_text()
+            status = (entry / "status").read_text()
+        except OSError:
+            continue
+        ppid = int(stat.rsplit(")", 1)[1].split()[1])
+        children.setdefault(ppid, []).append(int(entry.name))
+        for line in status.splitlines():
+            if line.startswith("VmRSS:"):
+                rss[int(entry.name)] = int(line.split()[1]) * 1024
+                break
+
+    total = 0
+    stack = [root_pid]
+    while stack:
+        pid = stack.pop()
+        total += rss.get(pid, 0)
+        stack.extend(children.get(pid, []))
+    return total
+
+
+class _PeakRss:
+    def __init__(self, pid: int, interval: float = 0.5) -> None:
+        self.peak = 0
+        self._pid = pid
+        self._interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self) -> "_PeakRss":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.peak = max(self.peak, _process_tree_rss(self._pid))
+            self._stop.wait(self._interval)
+
+
+def _start_worker(pool: str, concurrency: int, api_base: str) -> subprocess.Popen:
+    env = dict(
+        os.environ,
+        OPENAI_API_BASE=api_base,
+        OPENAI_API_KEY=os.environ.get("OPENAI_API_KEY") or "bench",
+        LLM_CACHE_ENABLED="false",
+        CELERY_WORKER_POOL=pool,
+        CELERY_POOL_CONCURRENCY=str(concurrency),
+        CELERY_WORKER_QUEUE="",
+    )
+    return subprocess.Popen(
+        [
+            sys.executable, "-m", "celery", "-A", "app.core.celery_app", "worker",
+            "-P", pool, "-c", str(concurrency), "-Q", BENCH_QUEUE,
+            "-I", "benchmarks.bench_worker_pool",
+            "-n", f"bench-{pool}-{concurrency}@%h",
+            "--without-gossip", "--without-mingle", "--without-heartbeat",
+            "--loglevel", "WARNING",
+        ],
+        cwd=BACKEND_DIR,
+        env=env,
+    )
+
+
+def _run_profile(pool: str, concurrency: int, tasks: int, api_base: str) -> Tuple[float, int]:
+    worker = _start_worker(pool, concurrency, api_base)
+    try:
+        llm_wait.delay().get(timeout=120)  # 예열 (워커 기동 대기 포함)
+        with _PeakRss(worker.pid) as rss:
+            started = time.perf_counter()
+            results = [llm_wait.delay() for _ in range(tasks)]
+            for result in results:
+                result.get(timeout=600)
+            elapsed = time.perf_counter() - started
+        return elapsed, rss.peak
+    finally:
+        worker.terminate()
+        try:
+            worker.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            worker.kill()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=400)
+    parser.add_argument("--latency", type=float, default=2.0, help="스텁 GPT 응답 지연 (초)")
+    parser.add_argument(
+        "--profile", action="append", default=[],
+        help="풀:동시성 (예: prefork:8, gevent:100). 여러 번 지정 가능",
+    )
+    args = parser.parse_args()
+    profiles = [p.split(":", 1) for p in (args.profile or ["prefork:8", "gevent:100"])]
+
+    server = _start_stub_server(args.latency)
+    api_base = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    print(f"tasks={args.tasks}, stub latency={args.latency:.2f}s, cpu={os.cpu_count()}")
+    print(f"{'profile':<16} {'elapsed':>9} {'tasks/s':>9} {'peak RSS':>10} {'tasks/s per GB':>15}")
+    try:
+        for pool, concurrency in profiles:
+            elapsed, peak_rss = _run_profile(pool, int(concurrency), args.tasks, api_base)
+            throughput = args.tasks / elapsed
+            rss_gb = peak_rss / 1024 ** 3
+            print(
+                f"{pool + ':' + concurrency:<16} {elapsed:8.1f}s {throughput:9.2f} "
+                f"{peak_rss / 1024 ** 2:8.0f}MB {throughput / rss_gb if rss_gb else 0:15.1f}"
+            )
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+import io
+import math
+import shutil
+import struct
+import wave
+
+from app.core import audio_chunker
+from app.core.audio_chunker import (
+    MIN_OVERLAP_TOKENS, SAMPLE_RATE, SAMPLE_WIDTH,
+    can_decode, export_wav, find_chunk_bounds, merge_transcript_stream, merge_transcripts, overlap_token_window,
+)
+
+
+def _tone(seconds: float) -> bytes:
+    count = int(seconds * SAMPLE_RATE)
+    return b"".join(
+        struct.pack("<h", int(8000 * math.sin(2 * math.pi * 440 * i / SAMPLE_RATE))) for i in range(count)
+    )
+
+
+def _silence(seconds: float) -> bytes:
+    return b"\x00\x00" * int(seconds * SAMPLE_RATE)
+
+
+def _bounds(pcm: bytes, max_chunk_seconds: float, overlap_seconds: float = 0.0):
+    return find_chunk_bounds(
+        pcm,
+        max_chunk_seconds=max_chunk_seconds,
+        min_silence_ms=400,
+        silence_threshold_dbfs=-40,
+        overlap_seconds=overlap_seconds,
+    )
+
+
+def test_short_audio_is_one_chunk():
+    pcm = _tone(3)
+    bounds = _bounds(pcm, max_chunk_seconds=10)
+    assert [(b.start_sample, b.end_sample) for b in bounds] == [(0, len(pcm) // SAMPLE_WIDTH)]
+
+
+def test_cut_at_middle_of_silence():
+    # 6초 음성 + 1초 무음 + 6초 음성, 최대 10초 → 무음 중앙(6.5초)에서 분할
+    pcm = _tone(6) + _silence(1) + _tone(6)
+    bounds = _bounds(pcm, max_chunk_seconds=10)
+
+    assert len(bounds) == 2
+    assert abs(bounds[0].end_seconds - 6.5) <= 0.05
+    assert bounds[1].start_sample == bounds[0].end_sample
+    assert bounds[-1].end_sample == len(pcm) // SAMPLE_WIDTH
+
+
+def test_cut_at_max_length_without_silence():
+    pcm = _tone(25)
+    bounds = _bounds(pcm, max_chunk_seconds=10)
+
+    assert [round(b.end_seconds, 2) for b in bounds] == [10.0, 20.0, 25.0]
+    assert all(b.end_seconds - b.start_seconds <= 10 for b in bounds)
+
+
+def test_chunks_overlap_and_cover_audio():
+    pcm = _tone(25)
+    bounds = _bounds(pcm, max_chunk_seconds=10, overlap_seconds=1.0)
+
+    assert bounds[0].start_sample == 0
+    for previous, current in zip(bounds, bounds[1:]):
+        assert current.start_sample == previous.end_sample - SAMPLE_RATE
+        assert current.index == previous.index + 1
+    assert bounds[-1].end_sample == len(pcm) // SAMPLE_WIDTH
+
+
+def test_export_wav_contains_only_the_chunk():
+    pcm = _tone(6) + _silence(1) + _tone(6)
+    bound = _bounds(pcm, max_chunk_seconds=10)[1]
+
+    with wave.open(io.BytesIO(export_wav(pcm, bound)), "rb") as wf:
+        assert (wf.getnchannels(), wf.getsampwidth(), wf.getframerate()) == (1, SAMPLE_WIDTH, SAMPLE_RATE)
+        assert wf.getnframes() == bound.end_sample - bound.start_sample
+
+
+def test_merge_removes_overlap_between_chunks():
+    texts = [
+        "계약 기간은 2년이고 보증금은 천만 원입니다",
+        "보증금은 천만 원입니다 월세는 50만 원으로 하죠",
+        "50만 원으로 하죠 관리비는 별도입니다",
+    ]
+    assert list(merge_transcript_stream(texts)) == [
+        "계약 기간은 2년이고 보증금은 천만 원입니다",
+        "월세는 50만 원으로 하죠",
+        "관리비는 별도입니다",
+    ]
+
+
+def test_merge_keeps_text_without_overlap():
+    assert merge_transcripts(["가 나 다", "라 마", "", "바"]) == "가 나 다 라 마 바"
+
+
+def test_merge_keeps_single_repeated_word_at_boundary():
+    # 실제로 반복된 한 단어는 겹침으로 보지 않음
+    assert merge_transcripts(["보증금은 천만 원 네", "네 월세는 50만 원"]) == "보증금은 천만 원 네 네 월세는 50만 원"
+
+
+def test_merge_trims_only_within_overlap_window():
+    texts = ["가 나 다 라 마 바", "다 라 마 바 사"]
+    assert merge_transcripts(texts, max_overlap_tokens=4) == "가 나 다 라 마 바 사"
+    # 일치 구간이 겹침 범위보다 길면 범위 안의 일치만 찾으므로 그대로 둠
+    assert merge_transcripts(texts, max_overlap_tokens=3) == "가 나 다 라 마 바 다 라 마 바 사"
+
+
+def test_merge_without_overlap_window_keeps_everything():
+    assert merge_transcripts(["가 나", "가 나"], max_overlap_tokens=0) == "가 나 가 나"
+
+
+def test_overlap_token_window():
+    assert overlap_token_window(0) == 0
+    assert overlap_token_window(1.0) == 5
+    assert overlap_token_window(0.1) == MIN_OVERLAP_TOKENS
+
+
+def test_can_decode_wav_without_optional_dependencies(tmp_path):
+    assert can_decode(tmp_path / "a.wav")
+    assert can_decode(tmp_path / "a.mp3") == (
+        audio_chunker.AudioSegment is not None and shutil.which(audio_chunker.AudioSegment.converter) is not None
+    )
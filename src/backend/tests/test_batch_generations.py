@@ -0,0 +1,195 @@
+import json
+import uuid
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel
+
+from app.core.batch_api import BatchResult, parse_output
+from app.core.config import settings
+from app.models.generation import Generation, GenerationStatus
+from app.models.generation_batch import GenerationBatchItem, GenerationBatchStage
+from app.models.transcription import Transcription, TranscriptionStatus
+from app.models.user import User
+from app.prompts import annotater
+from app.prompts.json_repair import conform_to_schema
+from app.prompts.keyword_schema import get_compiled_keyword_schema
+from app.tasks import batch_generations
+
+CONTRACT_TYPE = "임대차"
+BATCH_ID = "batch_1"
+
+
+# SQLite 에는 JSONB 가 없으므로 같은 값을 JSON 컬럼으로 저장
+@compiles(JSONB, "sqlite")
+def _jsonb_as_json(type_, compiler, **kwargs):
+    return "JSON"
+
+
+@pytest.fixture
+def factory(monkeypatch):
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine, tables=[
+        User.__table__, Transcription.__table__, Generation.__table__, GenerationBatchItem.__table__,
+    ])
+    factory = sessionmaker(bind=engine, expire_on_commit=False, autoflush=False)
+    monkeypatch.setattr(batch_generations, "get_sync_session", factory)
+    monkeypatch.setattr(annotater, "suggestion_cache", None)
+    monkeypatch.setattr(settings, "GENERATION_COMBINED_EXTRACTION", False)
+    return factory
+
+
+@pytest.fixture
+def saved(monkeypatch):
+    calls = []
+
+    def _save(session, generation, contract_type, fields, suggestions):
+        generation.status = GenerationStatus.done
+        session.commit()
+        calls.append((contract_type, fields, suggestions))
+
+    monkeypatch.setattr(batch_generations, "save_contract", _save)
+    monkeypatch.setattr(batch_generations, "delete_script_file", lambda name: None)
+    return calls
+
+
+def _blank_fields():
+    fields, _, _ = conform_to_schema({}, get_compiled_keyword_schema(CONTRACT_TYPE).key_parts)
+    return fields
+
+
+def _add_item(factory, stage=GenerationBatchStage.classify, status=GenerationStatus.generating, **values):
+    session = factory()
+    transcription = Transcription(user_id=uuid.uuid4(), status=TranscriptionStatus.done)
+    session.add(transcription)
+    session.flush()
+    generation = Generation(user_id=transcription.user_id, transcription_id=transcription.id, status=status)
+    session.add(generation)
+    session.flush()
+    session.add(GenerationBatchItem(generation_id=generation.id, stage=stage, batch_id=BATCH_ID, **values))
+    session.commit()
+    session.close()
+    return generation.id
+
+
+def _state(factory, generation_id):
+    session = factory()
+    try:
+        generation = session.get(Generation, generation_id)
+        item = session.get(GenerationBatchItem, generation_id)
+        return generation.status, item
+    finally:
+        session.close()
+
+
+def _apply(generation_id, result, job_failed=False):
+    results = {} if result is None else {str(generation_id): result}
+    batch_generations._apply_batch_results(BATCH_ID, results, job_failed)
+
+
+def test_parse_output_separates_contents_and_errors():
+    lines = [
+        {"custom_id": "a", "response": {"status_code": 200, "body": {
+            "choices": [{"message": {"content": " 임대차 "}}]}}},
+        {"custom_id": "b", "response": {"status_code": 500, "body": {"error": "server"}}},
+        {"custom_id": "c", "response": None, "error": {"code": "request_failed"}},
+        {"custom_id": "d", "response": {"status_code": 200, "body": {"choices": []}}},
+    ]
+    results = parse_output("\n".join(json.dumps(line) for line in lines) + "\n\n")
+
+    assert results["a"] == BatchResult(content="임대차")
+    assert results["b"].error == "server"
+    assert "request_failed" in results["c"].error
+    assert results["d"].error == "Invalid response structure"
+
+
+def test_classify_result_advances_to_extract(factory):
+    generation_id = _add_item(factory)
+    _apply(generation_id, BatchResult(content=CONTRACT_TYPE))
+
+    status, item = _state(factory, generation_id)
+    assert status == GenerationStatus.generating
+    assert (item.stage, item.batch_id, item.contract_type) == (GenerationBatchStage.extract, None, CONTRACT_TYPE)
+
+
+def test_combined_result_skips_extract_stage(factory, saved, monkeypatch):
+    monkeypatch.setattr(settings, "GENERATION_COMBINED_EXTRACTION", True)
+    monkeypatch.setattr(batch_generations, "pending_annotation_paths", lambda contract_type, fields: [])
+    generation_id = _add_item(factory)
+    fields = _blank_fields()
+    content = json.dumps({"result": {"type": CONTRACT_TYPE, "fields": fields}}, ensure_ascii=False)
+    _apply(generation_id, BatchResult(content=content))
+
+    assert _state(factory, generation_id) == (GenerationStatus.done, None)
+    assert [(t, f) for t, f, _ in saved] == [(CONTRACT_TYPE, fields)]
+
+
+def test_unsupported_type_fails_generation(factory, monkeypatch):
+    monkeypatch.setattr(settings, "GENERATION_COMBINED_EXTRACTION", True)
+    generation_id = _add_item(factory)
+    _apply(generation_id, BatchResult(content='{"result": {"type": "위임", "fields": {}}}'))
+    assert _state(factory, generation_id) == (GenerationStatus.failed, None)
+
+
+def test_extract_result_without_blanks_to_ask_saves_contract(factory, saved, monkeypatch):
+    monkeypatch.setattr(batch_generations, "pending_annotation_paths", lambda contract_type, fields: [])
+    generation_id = _add_item(factory, GenerationBatchStage.extract, contract_type=CONTRACT_TYPE)
+    fields = _blank_fields()
+    _apply(generation_id, BatchResult(content=json.dumps(fields, ensure_ascii=False)))
+
+    assert _state(factory, generation_id) == (GenerationStatus.done, None)
+    assert [(t, f) for t, f, _ in saved] == [(CONTRACT_TYPE, fields)]
+
+
+def test_extract_result_with_blanks_advances_to_annotate(factory, monkeypatch):
+    monkeypatch.setattr(batch_generations, "pending_annotation_paths", lambda contract_type, fields: ["lessor.name"])
+    generation_id = _add_item(factory, GenerationBatchStage.extract, contract_type=CONTRACT_TYPE)
+    _apply(generation_id, BatchResult(content=json.dumps(_blank_fields(), ensure_ascii=False)))
+
+    status, item = _state(factory, generation_id)
+    assert (status, item.stage, item.fields) == (GenerationStatus.generating, GenerationBatchStage.annotate, _blank_fields())
+
+
+def test_annotate_result_saves_merged_suggestions(factory, saved):
+    generation_id = _add_item(
+        factory, GenerationBatchStage.annotate, contract_type=CONTRACT_TYPE, fields=_blank_fields(),
+    )
+    path = annotater.blank_field_paths(CONTRACT_TYPE, _blank_fields())[-1]
+    section, _, leaf = path.rpartition(".")
+    suggestion = {section: {leaf: "확인 필요"}} if section else {leaf: "확인 필요"}
+    _apply(generation_id, BatchResult(content=json.dumps(suggestion, ensure_ascii=False)))
+
+    assert _state(factory, generation_id) == (GenerationStatus.done, None)
+    assert saved[0][2][path] == "확인 필요"
+
+
+def test_missing_result_is_resubmitted_unless_job_failed(factory):
+    generation_id = _add_item(factory)
+    _apply(generation_id, None)
+    status, item = _state(factory, generation_id)
+    assert (status, item.stage, item.batch_id) == (GenerationStatus.generating, GenerationBatchStage.classify, None)
+
+    other_id = _add_item(factory)
+    _apply(other_id, None, job_failed=True)
+    assert _state(factory, other_id) == (GenerationStatus.failed, None)
+
+
+def test_request_error_fails_generation(factory):
+    generation_id = _add_item(factory)
+    _apply(generation_id, BatchResult(error="server"))
+    assert _state(factory, generation_id) == (GenerationStatus.failed, None)
+
+
+def test_cancelled_generation_only_drops_item(factory):
+    generation_id = _add_item(factory, status=GenerationStatus.cancelled)
+    _apply(generation_id, BatchResult(content=CONTRACT_TYPE))
+    assert _state(factory, generation_id) == (GenerationStatus.cancelled, None)
+
+
+def test_unparseable_result_fails_generation(factory):
+    generation_id = _add_item(factory, GenerationBatchStage.extract, contract_type=CONTRACT_TYPE)
+    _apply(generation_id, BatchResult(content="JSON 이 아닌 응답"))
+    assert _state(factory, generation_id) == (GenerationStatus.failed, None)
@@ -0,0 +1,115 @@
+import time
+import uuid
+
+import fakeredis
+import pytest
+import redis
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel
+
+from app.core import cancellation
+from app.core.cancellation import CancelWatcher, TaskCancelled, publish_cancel, remember_task
+from app.models.transcription import Transcription, TranscriptionStatus
+from app.tasks import transcriptions
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    client = fakeredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(cancellation, "_client", client)
+    return client
+
+
+@pytest.fixture
+def revoked(monkeypatch):
+    calls = []
+    from app.core.celery_app import celery_app
+    monkeypatch.setattr(celery_app.control, "revoke", lambda task_ids: calls.append(task_ids))
+    return calls
+
+
+def _wait_for(predicate, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return predicate()
+
+
+def test_publish_cancel_signals_running_watcher(fake_redis, revoked):
+    fired = []
+    with CancelWatcher("generation", "g1") as watcher:
+        assert watcher.subscribed
+        watcher.add_callback(lambda: fired.append(1))
+        publish_cancel("generation", "g1")
+        assert _wait_for(watcher.is_cancelled)
+        with pytest.raises(TaskCancelled):
+            watcher.raise_if_cancelled()
+    assert fired == [1]
+
+
+def test_cancel_before_subscribe_is_seen_from_flag(fake_redis, revoked):
+    publish_cancel("transcription", "t1")
+    with CancelWatcher("transcription", "t1") as watcher:
+        assert watcher.is_cancelled()
+        # 이미 취소된 뒤 등록한 콜백은 즉시 실행
+        fired = []
+        watcher.add_callback(lambda: fired.append(1))
+        assert fired == [1]
+
+
+def test_remember_task_revokes_all_chain_ids_and_clears_old_flag(fake_redis, revoked):
+    publish_cancel("generation", "g2")
+    remember_task("generation", "g2", "classify-id", "extract-id", "annotate-id")
+    with CancelWatcher("generation", "g2") as watcher:
+        assert not watcher.is_cancelled()  # 재등록 시 이전 취소 플래그 제거
+
+    publish_cancel("generation", "g2")
+    assert revoked == [["classify-id", "extract-id", "annotate-id"]]
+
+
+def test_other_objects_are_not_cancelled(fake_redis, revoked):
+    with CancelWatcher("generation", "g3") as watcher:
+        publish_cancel("generation", "other")
+        publish_cancel("transcription", "g3")
+        time.sleep(0.2)
+        assert not watcher.is_cancelled()
+
+
+def test_redis_failure_leaves_watcher_unsubscribed(monkeypatch, revoked):
+    class DownRedis:
+        def pubsub(self, **kwargs):
+            raise redis.ConnectionError("down")
+
+        def pipeline(self):
+            raise redis.ConnectionError("down")
+
+    monkeypatch.setattr(cancellation, "_client", DownRedis())
+    publish_cancel("generation", "g4")  # 예외 없이 경고만
+    with CancelWatcher("generation", "g4") as watcher:
+        assert not watcher.subscribed
+        assert not watcher.is_cancelled()
+    assert revoked == []
+
+
+def test_transcription_cancel_is_rechecked_in_db():
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine, tables=[Transcription.__table__])
+    factory = sessionmaker(bind=engine, expire_on_commit=False, autoflush=False)
+
+    session = factory()
+    transcription = Transcription(user_id=uuid.uuid4(), status=TranscriptionStatus.transcribing)
+    session.add(transcription)
+    session.commit()
+    assert not transcriptions._cancelled_in_db(session, transcription)
+
+    # API 서버가 다른 세션에서 취소
+    other = factory()
+    other.get(Transcription, transcription.id).status = TranscriptionStatus.cancelled
+    other.commit()
+    other.close()
+
+    assert transcriptions._cancelled_in_db(session, transcription)
+    session.close()
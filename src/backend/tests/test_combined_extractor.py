@@ -0,0 +1,84 @@
+import json
+
+import pytest
+
+from app.core.config import settings
+from app.prompts import combined_extractor
+from app.prompts.combined_extractor import (
+    COMBINED_RESPONSE_FORMAT, build_combined_json_schema, extract_combined, parse_combined_result,
+)
+from app.prompts.keyword_schema import keyword_schema
+
+MESSAGES = [{"role": "user", "content": "대화"}]
+
+
+@pytest.fixture
+def discarded(monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        combined_extractor, "discard_cached_response",
+        lambda messages, **kwargs: calls.append((messages, kwargs)),
+    )
+    return calls
+
+
+def _objects(schema):
+    if schema.get("type") == "object":
+        yield schema
+        for value in schema["properties"].values():
+            yield from _objects(value)
+    for variant in schema.get("anyOf", ()):
+        yield from _objects(variant)
+
+
+def test_schema_has_one_strict_variant_per_type():
+    schema = build_combined_json_schema(keyword_schema)
+    variants = schema["properties"]["result"]["anyOf"]
+
+    assert [v["properties"]["type"]["enum"] for v in variants] == [[t] for t in keyword_schema]
+    for obj in _objects(schema):
+        assert obj["additionalProperties"] is False
+        assert obj["required"] == list(obj["properties"])
+
+
+def test_schema_leaves_carry_field_descriptions():
+    schema = build_combined_json_schema({"임대차": {"lessor": {"name": "임대인 이름"}}})
+    fields = schema["properties"]["result"]["anyOf"][0]["properties"]["fields"]
+    assert fields["properties"]["lessor"]["properties"]["name"] == {"type": "string", "description": "임대인 이름"}
+
+
+def test_parse_returns_type_and_fields(discarded):
+    result = json.dumps({"result": {"type": "임대차", "fields": {"lessor": {"name": "김철수"}}}}, ensure_ascii=False)
+    assert parse_combined_result(result, MESSAGES) == ("임대차", {"lessor": {"name": "김철수"}})
+    # 코드 펜스‧후행 쉼표 등은 json_repair 로 복구
+    fenced = '```json\n{"result": {"type": "매매", "fields": {},},}\n```'
+    assert parse_combined_result(fenced, MESSAGES) == ("매매", {})
+    assert discarded == []
+
+
+@pytest.mark.parametrize("result", [
+    "계약 유형: 임대차",
+    '{"type": "임대차", "fields": {}}',
+    '{"result": {"type": "임대차"}}',
+    '{"result": {"type": 1, "fields": {}}}',
+    '{"result": {"type": "임대차", "fields": "없음"}}',
+    '{"result": ["임대차"]}',
+])
+def test_malformed_result_is_discarded_from_cache(result, discarded):
+    with pytest.raises(ValueError):
+        parse_combined_result(result, MESSAGES)
+    assert discarded == [(MESSAGES, {
+        "model": settings.GENERATION_COMBINED_MODEL, "response_format": COMBINED_RESPONSE_FORMAT,
+    })]
+
+
+def test_extract_combined_requests_structured_output(monkeypatch):
+    monkeypatch.setattr(combined_extractor, "read_transcript", lambda name: "보증금은 천만 원")
+    calls = []
+
+    def _caller(messages, **kwargs):
+        calls.append(kwargs)
+        return '{"result": {"type": "임대차", "fields": {}}}'
+
+    assert extract_combined("a.txt", _caller) == ("임대차", {})
+    assert calls == [{"model": settings.GENERATION_COMBINED_MODEL, "response_format": COMBINED_RESPONSE_FORMAT}]
@@ -0,0 +1,97 @@
+import json
+
+import pytest
+
+from app.core.config import settings
+from app.prompts import keyword_extractor, templates
+from app.prompts.json_repair import conform_to_schema
+from app.prompts.keyword_extractor import merge_shard_fields
+from app.prompts.keyword_schema import get_compiled_keyword_schema, keyword_schema, matches_schema
+from app.prompts.schema_compiler import split_sections
+
+CONTRACT_TYPE = "임대차"
+
+
+def _leaves(value):
+    return sum(_leaves(v) for v in value.values()) if isinstance(value, dict) else 1
+
+
+@pytest.fixture
+def shards(monkeypatch):
+    monkeypatch.setattr(settings, "GENERATION_EXTRACTION_SHARDS", 3)
+    return templates._extraction_shards(keyword_schema[CONTRACT_TYPE])
+
+
+@pytest.fixture
+def discarded(monkeypatch):
+    calls = []
+    monkeypatch.setattr(keyword_extractor, "discard_cached_response", calls.append)
+    return calls
+
+
+def _full_payload():
+    payload, _, _ = conform_to_schema({}, get_compiled_keyword_schema(CONTRACT_TYPE).key_parts)
+    return payload
+
+
+def test_split_sections_keeps_order_and_balances_leaves():
+    schema = {"a": {"x": "", "y": ""}, "b": "", "c": {"x": "", "y": "", "z": ""}, "d": "", "e": ""}
+    groups = split_sections(schema, 2)
+
+    assert [list(group) for group in groups] == [["a", "b"], ["c", "d", "e"]]
+    assert [key for group in groups for key in group] == list(schema)
+    assert split_sections(schema, 1) == (schema,)
+
+
+def test_split_sections_never_splits_a_section():
+    schema = keyword_schema[CONTRACT_TYPE]
+    groups = split_sections(schema, 3)
+    assert len(groups) == 3
+    for group in groups:
+        for key, value in group.items():
+            assert value is schema[key]
+    sizes = [sum(_leaves(v) for v in group.values()) for group in groups]
+    assert max(sizes) - min(sizes) <= max(_leaves(v) for v in schema.values())
+
+
+def test_merge_uses_only_owned_sections(shards, discarded):
+    full = _full_payload()
+    results = []
+    for shard in shards:
+        part = {section: full[section] for section in shard.sections}
+        # 다른 샤드가 맡은 항목을 덧붙여 보내도 무시해야 함
+        other = next(s for s in full if s not in shard.sections)
+        part[other] = "엉뚱한 값"
+        results.append(json.dumps(part, ensure_ascii=False))
+    messages_list = [[{"role": "user", "content": str(i)}] for i in range(len(shards))]
+
+    fields = merge_shard_fields(results, messages_list, shards, CONTRACT_TYPE)
+
+    assert fields == full
+    assert list(fields) == list(keyword_schema[CONTRACT_TYPE])
+    assert matches_schema(CONTRACT_TYPE, fields)
+    assert discarded == []
+
+
+def test_merge_fills_missing_fields_from_schema(shards, discarded):
+    full = _full_payload()
+    results = [json.dumps({s: full[s] for s in shard.sections}, ensure_ascii=False) for shard in shards]
+    first_section = shards[0].sections[0]
+    results[0] = json.dumps({s: full[s] for s in shards[0].sections if s != first_section}, ensure_ascii=False)
+    messages_list = [[{"role": "user", "content": str(i)}] for i in range(len(shards))]
+
+    fields = merge_shard_fields(results, messages_list, shards, CONTRACT_TYPE)
+
+    assert matches_schema(CONTRACT_TYPE, fields)
+    assert discarded == []
+
+
+def test_unparseable_shard_discards_its_cached_response(shards, discarded):
+    full = _full_payload()
+    results = [json.dumps({s: full[s] for s in shard.sections}, ensure_ascii=False) for shard in shards]
+    results[1] = "JSON 이 아닌 응답"
+    messages_list = [[{"role": "user", "content": str(i)}] for i in range(len(shards))]
+
+    with pytest.raises(ValueError):
+        merge_shard_fields(results, messages_list, shards, CONTRACT_TYPE)
+    assert discarded == [messages_list[1]]
@@ -0,0 +1,45 @@
+import pytest
+
+from app.prompts.json_repair import conform_to_schema, loads_tolerant, repair_json
+
+
+def test_valid_json_is_parsed_as_is():
+    assert loads_tolerant('{"a": 1, "b": [1, 2]}') == {"a": 1, "b": [1, 2]}
+
+
+def test_code_fence_and_surrounding_text_are_dropped():
+    text = '다음은 결과입니다.\n```json\n{"name": "홍길동", "amount": "1000"}\n```\n이상입니다.'
+    assert loads_tolerant(text) == {"name": "홍길동", "amount": "1000"}
+
+
+def test_single_quoted_strings_are_converted():
+    text = "{'name': '홍길동', 'note': 'he said \"ok\"', 'ok': True, 'none': None}"
+    assert loads_tolerant(text) == {
+        "name": "홍길동", "note": 'he said "ok"', "ok": True, "none": None,
+    }
+
+
+def test_trailing_commas_are_removed():
+    text = '{"a": [1, 2, ], "b": {"c": "d", }, }'
+    assert loads_tolerant(text) == {"a": [1, 2], "b": {"c": "d"}}
+
+
+def test_truncated_response_is_closed():
+    text = '{"seller": {"name": "김철수", "address": "서울시 강남'
+    assert loads_tolerant(text) == {"seller": {"name": "김철수", "address": "서울시 강남"}}
+
+
+def test_text_without_object_raises_value_error():
+    assert repair_json("계약 유형: 매매") is None
+    with pytest.raises(ValueError):
+        loads_tolerant("계약 유형: 매매")
+
+
+def test_conform_to_schema_fills_missing_and_drops_unknown_keys():
+    key_parts = [("seller", "name"), ("seller", "address"), ("price",)]
+    payload = {"seller": {"name": "김철수", "phone": "010"}, "price": "1억"}
+
+    result, filled, dropped = conform_to_schema(payload, key_parts)
+
+    assert result == {"seller": {"name": "김철수", "address": ""}, "price": "1억"}
+    assert (filled, dropped) == (1, 1)
@@ -0,0 +1,94 @@
+import os
+import time
+import types
+
+import fakeredis
+import pytest
+import redis
+
+from app.core import llm_cache
+from app.core.llm_cache import LLMResponseCache, _DiskBackend, _RedisBackend, make_cache_key
+
+MESSAGES = [{"role": "system", "content": "지시문"}, {"role": "user", "content": "대화"}]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    # 사용 시각 순서를 결정적으로 만들기 위한 가짜 시계
+    fake = types.SimpleNamespace(now=1_000_000.0)
+    fake.time = lambda: fake.now
+    fake.monotonic = time.monotonic
+    monkeypatch.setattr(llm_cache, "time", fake)
+    return fake
+
+
+def _redis_backend(ttl=3600, max_entries=2):
+    backend = _RedisBackend("redis://localhost:6379/0", ttl, max_entries)
+    backend._client = fakeredis.FakeRedis(decode_responses=True)
+    return backend
+
+
+def test_cache_key_is_canonical():
+    reordered = [{"content": m["content"], "role": m["role"], "name": "x"} for m in MESSAGES]
+    assert make_cache_key("gpt-4", 0.0, MESSAGES) == make_cache_key("gpt-4", 0.0, reordered)
+    assert make_cache_key("gpt-4", 0.0, MESSAGES) != make_cache_key("gpt-4", 0.2, MESSAGES)
+    assert make_cache_key("gpt-4", 0.0, MESSAGES) != make_cache_key("gpt-4o", 0.0, MESSAGES)
+    assert make_cache_key("gpt-4", 0.0, MESSAGES) != make_cache_key(
+        "gpt-4", 0.0, MESSAGES, response_format={"type": "json_object"}
+    )
+
+
+def test_redis_evicts_least_recently_used(clock):
+    backend = _redis_backend(max_entries=2)
+    backend.set("a", "A")
+    clock.now += 1
+    backend.set("b", "B")
+    clock.now += 1
+    assert backend.get("a") == "A"  # a 를 최근 사용으로 갱신
+    clock.now += 1
+    backend.set("c", "C")
+
+    assert backend.get("b") is None
+    assert (backend.get("a"), backend.get("c")) == ("A", "C")
+
+
+def test_redis_entries_have_ttl_and_expired_index_is_pruned(clock):
+    backend = _redis_backend(ttl=60, max_entries=10)
+    backend.set("a", "A")
+    assert 0 < backend._client.ttl("llm:resp:a") <= 60
+
+    clock.now += 120
+    backend._client.delete("llm:resp:a")  # Redis TTL 만료
+    backend.set("b", "B")
+    assert backend._client.zrange("llm:resp:lru", 0, -1) == ["b"]
+
+
+def test_disk_ttl_and_lru(tmp_path, clock):
+    backend = _DiskBackend(str(tmp_path), ttl_seconds=60, max_entries=2)
+    backend.set("a", "A")
+    backend.set("b", "B")
+    os.utime(tmp_path / "a.json", (1, 1))
+    os.utime(tmp_path / "b.json", (2, 2))
+    backend.set("c", "C")  # 가장 오래 쓰지 않은 a 제거
+    assert sorted(p.name for p in tmp_path.glob("*.json")) == ["b.json", "c.json"]
+
+    clock.now += 120
+    assert backend.get("b") is None
+    assert not (tmp_path / "b.json").exists()
+
+
+def test_falls_back_to_disk_when_redis_is_down(tmp_path):
+    class DownRedis:
+        def __getattr__(self, name):
+            def _fail(*args, **kwargs):
+                raise redis.ConnectionError("down")
+            return _fail
+
+    cache = LLMResponseCache("redis://localhost:6379/0", str(tmp_path), ttl_seconds=60, max_entries=10)
+    cache._redis._client = DownRedis()
+
+    cache.set("k", "응답")
+    assert cache.get("k") == "응답"
+    assert (tmp_path / "k.json").exists()
+    cache.delete("k")
+    assert cache.get("k") is None
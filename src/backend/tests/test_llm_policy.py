@@ -0,0 +1,118 @@
+import asyncio
+import threading
+import time
+
+import httpx
+import openai
+import pytest
+
+from app.core import rate_limiter
+from app.core.config import settings
+from app.core.llm_policy import arun_hedged, run_hedged, stage_policy
+from app.core.rate_limiter import backoff_seconds, send_rate_limited
+
+
+def _connection_error():
+    return openai.APIConnectionError(request=httpx.Request("POST", "https://api.openai.com/v1/chat/completions"))
+
+
+def test_backoff_is_full_jitter_within_cap(monkeypatch):
+    monkeypatch.setattr(rate_limiter.random, "uniform", lambda low, high: (low, high))
+    assert backoff_seconds(0, 0.5, 8) == (0, 0.5)
+    assert backoff_seconds(3, 0.5, 8) == (0, 4)
+    assert backoff_seconds(10, 0.5, 8) == (0, 8)
+
+
+def test_transient_errors_are_retried_up_to_stage_budget(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(rate_limiter.time, "sleep", sleeps.append)
+    calls = []
+
+    def _send():
+        calls.append(1)
+        raise _connection_error()
+
+    with pytest.raises(openai.APIConnectionError):
+        send_rate_limited(None, _send, max_retries=2)
+    assert len(calls) == 3
+    assert len(sleeps) == 2
+    assert all(0 <= s <= settings.LLM_RETRY_MAX_SECONDS for s in sleeps)
+
+
+def test_other_errors_are_not_retried():
+    calls = []
+
+    def _send():
+        calls.append(1)
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        send_rate_limited(None, _send, max_retries=5)
+    assert len(calls) == 1
+
+
+def test_stage_policy_defaults(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_STAGE_RETRIES", {"classify": 4})
+    monkeypatch.setattr(settings, "LLM_STAGE_HEDGE_AFTER_SECONDS", {"classify": 1.5})
+    assert (stage_policy("classify").retries, stage_policy("classify").hedge_after) == (4, 1.5)
+    assert (stage_policy("extract").retries, stage_policy("extract").hedge_after) == (
+        settings.OPENAI_MAX_RETRIES, 0.0,
+    )
+
+
+def test_run_hedged_without_delay_calls_once():
+    calls = []
+    assert run_hedged(lambda index, lost: calls.append(index) or "ok", 0) == "ok"
+    assert calls == [0]
+
+
+def test_run_hedged_uses_faster_second_attempt():
+    first_lost = threading.Event()
+
+    def _attempt(index, lost):
+        if index == 0:
+            lost.wait(2)
+            if lost.is_set():
+                first_lost.set()
+            return "slow"
+        return "fast"
+
+    assert run_hedged(_attempt, 0.05) == "fast"
+    assert first_lost.wait(1)
+
+
+def test_run_hedged_keeps_first_result_when_fast():
+    calls = []
+
+    def _attempt(index, lost):
+        calls.append(index)
+        return "first"
+
+    assert run_hedged(_attempt, 1.0) == "first"
+    assert calls == [0]
+
+
+def test_run_hedged_raises_when_both_fail():
+    def _attempt(index, lost):
+        time.sleep(0.1 if index == 0 else 0)
+        raise RuntimeError(f"attempt {index}")
+
+    with pytest.raises(RuntimeError):
+        run_hedged(_attempt, 0.05)
+
+
+def test_arun_hedged_cancels_losing_attempt():
+    cancelled = []
+
+    async def _attempt(index):
+        if index == 0:
+            try:
+                await asyncio.sleep(2)
+            except asyncio.CancelledError:
+                cancelled.append(index)
+                raise
+            return "slow"
+        return "fast"
+
+    assert asyncio.run(arun_hedged(_attempt, 0.05)) == "fast"
+    assert cancelled == [0]
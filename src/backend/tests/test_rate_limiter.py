@@ -0,0 +1,128 @@
+import fakeredis
+import httpx
+import openai
+import pytest
+import redis
+
+from app.core import rate_limiter
+from app.core.config import settings
+from app.core.rate_limiter import RateLimiter, parse_duration, retry_after_seconds, send_rate_limited
+
+
+@pytest.fixture
+def server():
+    # 같은 서버에 붙은 워커 여러 개를 흉내 내기 위해 연결마다 같은 FakeServer 를 씀
+    return fakeredis.FakeServer()
+
+
+def _limiter(server, rpm=0, tpm=0):
+    return RateLimiter("test", rpm, tpm, client=fakeredis.FakeRedis(server=server, decode_responses=True))
+
+
+class _Raw:
+    def __init__(self, headers=None):
+        self.headers = headers or {}
+
+
+def _rate_limit_error(headers):
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    response = httpx.Response(429, headers=headers, request=request)
+    return openai.RateLimitError("rate limited", response=response, body=None)
+
+
+def test_parse_duration_formats():
+    assert parse_duration("20ms") == pytest.approx(0.02)
+    assert parse_duration("6m0s") == 360
+    assert parse_duration("1.5") == 1.5
+    assert parse_duration("") is None
+    assert retry_after_seconds({"retry-after-ms": "250", "retry-after": "3"}) == 0.25
+    assert retry_after_seconds({"x-ratelimit-reset-requests": "1s", "x-ratelimit-reset-tokens": "2s"}) == 2
+
+
+def test_request_bucket_is_shared_between_workers(server):
+    first, second = _limiter(server, rpm=2), _limiter(server, rpm=2)
+    assert first.try_acquire() == 0
+    assert second.try_acquire() == 0
+    assert 0 < first.try_acquire() <= 30  # 분당 2회 → 다음 요청까지 최대 30초
+
+
+def test_token_bucket_charges_estimated_tokens(server):
+    limiter = _limiter(server, tpm=1000)
+    assert limiter.try_acquire(tokens=800) == 0
+    wait = limiter.try_acquire(tokens=400)
+    assert wait == pytest.approx(12, abs=0.5)  # 부족한 200토큰 × 60 / 1000
+    assert limiter.try_acquire(tokens=150) == 0
+
+
+def test_observe_lowers_bucket_and_blocks_on_exhaustion(server):
+    limiter = _limiter(server, rpm=100)
+    limiter.observe({"x-ratelimit-remaining-requests": "0", "x-ratelimit-reset-requests": "5s"})
+    assert _limiter(server, rpm=100).try_acquire() == pytest.approx(5, abs=0.5)
+
+
+def test_penalize_blocks_all_workers(server):
+    limiter, other = _limiter(server, rpm=100), _limiter(server, rpm=100)
+    assert limiter.penalize({"retry-after": "3"}, attempt=0) == 3
+    assert limiter.try_acquire() == pytest.approx(3, abs=0.5)
+    assert other.try_acquire() == pytest.approx(3, abs=0.5)
+
+
+def test_redis_failure_fails_open():
+    class DownRedis:
+        def register_script(self, script):
+            def _run(**kwargs):
+                raise redis.ConnectionError("down")
+            return _run
+
+    limiter = RateLimiter("test", 1, 1, client=DownRedis())
+    assert limiter.try_acquire(tokens=10) == 0
+    assert limiter.try_acquire(tokens=10) == 0
+
+
+def test_429_waits_in_the_shared_limiter(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(rate_limiter.time, "sleep", sleeps.append)
+
+    class _Limiter:
+        def __init__(self):
+            self.events = []
+
+        def acquire(self, tokens=0):
+            self.events.append(("acquire", tokens))
+
+        def penalize(self, headers, attempt):
+            self.events.append(("penalize", headers["retry-after"], attempt))
+            return 2.0
+
+        def observe(self, headers):
+            self.events.append(("observe",))
+
+    limiter = _Limiter()
+    responses = [_rate_limit_error({"retry-after": "2"}), _Raw()]
+
+    def _send():
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    assert isinstance(send_rate_limited(limiter, _send, tokens=50), _Raw)
+    # 대기는 다음 acquire 가 공용 차단 시각을 보고 하므로 래퍼 자체는 잠들지 않음
+    assert limiter.events == [
+        ("acquire", 50), ("penalize", "2", 0), ("acquire", 50), ("observe",),
+    ]
+    assert sleeps == [0.0]
+
+
+def test_429_gives_up_after_max_retries(monkeypatch):
+    monkeypatch.setattr(rate_limiter.time, "sleep", lambda seconds: None)
+    monkeypatch.setattr(settings, "LLM_RATE_LIMIT_MAX_RETRIES", 2)
+    calls = []
+
+    def _send():
+        calls.append(1)
+        raise _rate_limit_error({})
+
+    with pytest.raises(openai.RateLimitError):
+        send_rate_limited(None, _send)
+    assert len(calls) == 3
@@ -0,0 +1,47 @@
+from itertools import chain
+
+from app.prompts.stopword_filter import StopwordFilter, korean_stopword_filter, tokenize
+from app.prompts.stopwords import stopwords_set
+
+
+def _filter_segments(stopword_filter: StopwordFilter, segments):
+    tokens = chain.from_iterable(tokenize(segment) for segment in segments)
+    return list(stopword_filter.filter_tokens(tokens))
+
+
+def test_tokenize_keeps_numbers_and_splits_punctuation():
+    assert list(tokenize("보증금 4,200만 원, 2024-05-01부터?")) == [
+        "보증금", "4,200만", "원", ",", "2024-05-01부터", "?",
+    ]
+
+
+def test_multi_token_stopword_across_segment_boundary():
+    stopword_filter = StopwordFilter(["예를 들면", "그리고"])
+    segments = ["보증금은 예를", "들면 천만 원 그리고", "월세"]
+    assert _filter_segments(stopword_filter, segments) == ["보증금은", "천만", "원", "월세"]
+
+
+def test_partial_multi_token_stopword_is_kept():
+    stopword_filter = StopwordFilter(["예를 들면"])
+    assert _filter_segments(stopword_filter, ["예를", "보면"]) == ["예를", "보면"]
+    # 스트림 끝에서 보류 중이던 토큰도 내보냄
+    assert _filter_segments(stopword_filter, ["계약은 예를"]) == ["계약은", "예를"]
+
+
+def test_overlapping_stopwords_are_all_removed():
+    stopword_filter = StopwordFilter(["가 나", "나 다 라", "다"])
+    assert _filter_segments(stopword_filter, ["가 나", "다 라 마"]) == ["마"]
+
+
+def test_default_filter_matches_single_token_lookup():
+    segments = ["아 그러니까 보증금은 천만 원이고", "또한 반려동물은 안 되고요 ."]
+    tokens = list(chain.from_iterable(tokenize(segment) for segment in segments))
+    expected = [token for token in tokens if token not in stopwords_set]
+    assert _filter_segments(korean_stopword_filter, segments) == expected
+
+
+def test_default_filter_keeps_negation_phrases():
+    text = "연체하지 않도록 하고 수리는 할 줄 안다 보증금은 천만 원 밖에 안된다"
+    kept = korean_stopword_filter.filter_text(text)
+    for phrase in ("않도록", "할 줄 안다", "밖에 안된다"):
+        assert phrase in kept
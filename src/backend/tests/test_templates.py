@@ -0,0 +1,52 @@
+import re
+
+import pytest
+
+from app.prompts.keyword_schema import compiled_keyword_schema
+from app.prompts.templates import (
+    COMBINED_TEMPLATE, EXTRACTION_TEMPLATES, TYPE_TEMPLATE, PromptTemplate,
+    get_annotation_template, get_extraction_template,
+)
+
+_PLACEHOLDER = re.compile(r"\{[a-z_]+\}")
+
+
+def _all_templates():
+    yield TYPE_TEMPLATE
+    yield COMBINED_TEMPLATE
+    for contract_type in compiled_keyword_schema:
+        yield get_extraction_template(contract_type)
+        yield get_annotation_template(contract_type)
+
+
+def test_render_puts_static_prefix_first_and_variables_last():
+    template = PromptTemplate(system="지시문", suffix="## 대화 내용:\n{conversation_text}")
+    assert template.render(conversation_text="보증금 {천만} 원") == [
+        {"role": "system", "content": "지시문"},
+        {"role": "user", "content": "## 대화 내용:\n보증금 {천만} 원"},
+    ]
+
+
+def test_static_prefix_is_shared_between_calls():
+    first = get_extraction_template("임대차").render(conversation_text="가")
+    second = get_extraction_template("임대차").render(conversation_text="나")
+    assert first[0]["content"] is second[0]["content"]
+    assert first[1]["content"] != second[1]["content"]
+
+
+@pytest.mark.parametrize("template", list(_all_templates()))
+def test_static_prefix_is_fully_rendered_and_dedented(template):
+    assert not _PLACEHOLDER.search(template.system)
+    assert not template.system.startswith((" ", "\n"))
+    assert not any(line.startswith("    ##") for line in template.system.splitlines())
+
+
+def test_extraction_prefix_carries_the_type_keyword_block():
+    for contract_type, compiled in compiled_keyword_schema.items():
+        assert compiled.info_block in get_extraction_template(contract_type).system
+    assert EXTRACTION_TEMPLATES["임대차"].system != EXTRACTION_TEMPLATES["매매"].system
+
+
+def test_unknown_type_falls_back_to_empty_templates():
+    assert get_extraction_template("없는 유형").render(conversation_text="대화")[1]["content"].endswith("대화")
+    assert get_annotation_template("없는 유형").render(fields_json="{}")[1]["content"].endswith("{}")
@@ -0,0 +1,22 @@
+from app.core.config import settings
+from app.prompts.token_budget import compress_transcript, count_tokens, fit_transcript
+
+TEXT = "네 . 안녕하세요 반갑습니다 오늘 날씨가 좋네요 . 보증금은 천만 원이고 월세는 50만 원입니다 . " * 3
+
+
+def test_budget_is_opt_in(monkeypatch):
+    monkeypatch.setattr(settings, "PROMPT_BUDGET_ENABLED", False)
+    assert fit_transcript(TEXT, budget_tokens=1) == TEXT
+
+
+def test_duplicates_are_removed_within_budget(monkeypatch):
+    monkeypatch.setattr(settings, "PROMPT_BUDGET_ENABLED", True)
+    assert fit_transcript(TEXT, budget_tokens=10_000) == (
+        "네 . 안녕하세요 반갑습니다 오늘 날씨가 좋네요 . 보증금은 천만 원이고 월세는 50만 원입니다 . 네 . 네 ."
+    )
+
+
+def test_compression_keeps_sentences_with_terms_in_order():
+    sentences = ["안녕하세요 반갑습니다", "보증금은 천만 원입니다", "날씨가 좋네요", "2024년 5월부터 입주합니다"]
+    budget = count_tokens(sentences[1]) + count_tokens(sentences[3]) + 2
+    assert compress_transcript(sentences, budget) == [sentences[1], sentences[3]]
@@ -0,0 +1,139 @@
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel
+
+from app.core import transcript_store
+from app.core.transcript_store import (
+    LocalTranscriptStore, PostgresTranscriptStore, S3TranscriptStore, TranscriptNotFound,
+    aread_transcript, cached_transcripts, delete_transcript, read_transcript, write_transcript,
+)
+from app.models.transcription_script import TranscriptionScript
+
+
+class _CountingStore:
+    def __init__(self, inner):
+        self.inner = inner
+        self.reads = 0
+
+    def write(self, name, text):
+        self.inner.write(name, text)
+
+    def read(self, name):
+        self.reads += 1
+        return self.inner.read(name)
+
+    def delete(self, name):
+        self.inner.delete(name)
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    counting = _CountingStore(LocalTranscriptStore(str(tmp_path)))
+    monkeypatch.setattr(transcript_store, "transcript_store", lambda: counting)
+    return counting
+
+
+def _roundtrip(backend):
+    backend.write("a.txt", "보증금은 천만 원")
+    backend.write("a.txt", "보증금은 이천만 원")  # 덮어쓰기
+    assert backend.read("a.txt") == "보증금은 이천만 원"
+    backend.delete("a.txt")
+    backend.delete("a.txt")  # 없는 본문 삭제는 무시
+    with pytest.raises(TranscriptNotFound):
+        backend.read("a.txt")
+
+
+def test_local_store_roundtrip(tmp_path):
+    _roundtrip(LocalTranscriptStore(str(tmp_path)))
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_postgres_store_roundtrip(monkeypatch):
+    # 같은 ORM 경로를 SQLite 메모리 DB 로 확인
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine, tables=[TranscriptionScript.__table__])
+    factory = sessionmaker(bind=engine, expire_on_commit=False, autoflush=False)
+    monkeypatch.setattr("app.db.session.get_sync_session", factory)
+
+    _roundtrip(PostgresTranscriptStore())
+
+
+def test_s3_store_roundtrip(monkeypatch):
+    class FakeClientError(Exception):
+        def __init__(self, code):
+            self.response = {"Error": {"Code": code}}
+
+    class FakeBody:
+        def __init__(self, data):
+            self._data = data
+
+        def read(self):
+            return self._data
+
+    class FakeS3:
+        def __init__(self):
+            self.objects = {}
+
+        def put_object(self, Bucket, Key, Body, ContentType):
+            self.objects[(Bucket, Key)] = Body
+
+        def get_object(self, Bucket, Key):
+            if (Bucket, Key) not in self.objects:
+                raise FakeClientError("NoSuchKey")
+            return {"Body": FakeBody(self.objects[(Bucket, Key)])}
+
+        def delete_object(self, Bucket, Key):
+            self.objects.pop((Bucket, Key), None)
+
+    client = FakeS3()
+    monkeypatch.setattr(transcript_store, "boto3", type("boto3", (), {"client": lambda *a, **k: client}))
+    monkeypatch.setattr(transcript_store, "ClientError", FakeClientError)
+
+    backend = S3TranscriptStore("bucket", "transcripts/", None)
+    backend.write("b.txt", "월세")
+    assert client.objects == {("bucket", "transcripts/b.txt"): "월세".encode("utf-8")}
+    _roundtrip(backend)
+
+
+def test_s3_store_requires_bucket(monkeypatch):
+    monkeypatch.setattr(transcript_store, "boto3", type("boto3", (), {"client": lambda *a, **k: None}))
+    with pytest.raises(ValueError):
+        S3TranscriptStore("", "transcripts/", None)
+
+
+def test_reads_are_cached_within_scope(store):
+    write_transcript("a.txt", "본문")
+    with cached_transcripts():
+        assert read_transcript("a.txt") == "본문"
+        with cached_transcripts():  # 안쪽 범위는 바깥 캐시를 그대로 씀
+            assert read_transcript("a.txt") == "본문"
+        assert read_transcript("a.txt") == "본문"
+    assert store.reads == 1
+
+    read_transcript("a.txt")  # 범위 밖에서는 매번 읽음
+    assert store.reads == 2
+
+
+def test_delete_evicts_cached_text(store):
+    write_transcript("a.txt", "본문")
+    with cached_transcripts():
+        read_transcript("a.txt")
+        delete_transcript("a.txt")
+        with pytest.raises(TranscriptNotFound):
+            read_transcript("a.txt")
+
+
+def test_async_reads_share_scope_cache(store):
+    write_transcript("a.txt", "본문")
+
+    async def _read_twice():
+        async with cached_transcripts():
+            first, second = await asyncio.gather(aread_transcript("a.txt"), aread_transcript("a.txt"))
+            return first, second, await aread_transcript("a.txt")
+
+    assert asyncio.run(_read_twice()) == ("본문", "본문", "본문")
+    # 동시에 시작한 두 읽기는 캐시가 비어 있을 때 시작하므로 최대 2회
+    assert store.reads <= 2
@@ -0,0 +1,77 @@
+import fakeredis
+import pytest
+import redis
+
+from app.prompts.type_cache import ContractTypeCache, minhash, similarity
+
+LEASE = " ".join(f"임대차{i} 보증금{i} 월세{i}" for i in range(20))
+SALE = " ".join(f"매매{i} 잔금{i} 등기{i}" for i in range(20))
+EMPLOYMENT = " ".join(f"근로{i} 임금{i} 휴가{i}" for i in range(20))
+
+
+@pytest.fixture
+def make_cache():
+    def _make(threshold=0.85, max_entries=100, min_tokens=5, client=None):
+        cache = ContractTypeCache(threshold=threshold, max_entries=max_entries, min_tokens=min_tokens)
+        cache._cache._client = client or fakeredis.FakeRedis(decode_responses=True)
+        return cache
+    return _make
+
+
+def test_similarity_of_near_duplicates():
+    tokens = LEASE.split()
+    edited = tokens[:-1] + ["관리비"]
+    assert similarity(minhash(tokens), minhash(tokens)) == 1.0
+    assert similarity(minhash(tokens), minhash(edited)) >= 0.85
+    assert similarity(minhash(tokens), minhash(SALE.split())) < 0.2
+
+
+def test_lookup_returns_type_of_similar_conversation(make_cache):
+    cache = make_cache()
+    cache.store(LEASE, "주택임대차계약서")
+    cache.store(SALE, "부동산매매계약서")
+
+    assert cache.lookup(LEASE) == "주택임대차계약서"
+    assert cache.lookup(LEASE.replace("월세19", "관리비")) == "주택임대차계약서"
+    assert cache.lookup(SALE) == "부동산매매계약서"
+    assert cache.lookup(EMPLOYMENT) is None
+
+
+def test_below_threshold_is_a_miss(make_cache):
+    cache = make_cache(threshold=1.0)
+    cache.store(LEASE, "주택임대차계약서")
+    assert cache.lookup(LEASE.replace("월세19", "관리비")) is None
+
+
+def test_short_conversations_are_ignored(make_cache):
+    client = fakeredis.FakeRedis(decode_responses=True)
+    cache = make_cache(min_tokens=100, client=client)
+    cache.store(LEASE, "주택임대차계약서")
+    assert client.keys("*") == []
+    assert cache.lookup(LEASE) is None
+
+
+def test_eviction_removes_oldest_entry_and_its_bands(make_cache):
+    client = fakeredis.FakeRedis(decode_responses=True)
+    cache = make_cache(max_entries=2, client=client)
+    cache.store(LEASE, "주택임대차계약서")
+    cache.store(SALE, "부동산매매계약서")
+    cache.store(EMPLOYMENT, "근로계약서")
+
+    assert cache.lookup(LEASE) is None
+    assert cache.lookup(EMPLOYMENT) == "근로계약서"
+    assert sorted(client.hkeys("typecache:entries")) == ["2", "3"]
+    members = set().union(*(client.smembers(key) for key in client.keys("typecache:band:*")))
+    assert "1" not in members
+
+
+def test_redis_failure_falls_back_to_no_cache(make_cache):
+    class DownRedis:
+        def __getattr__(self, name):
+            def _fail(*args, **kwargs):
+                raise redis.ConnectionError("down")
+            return _fail
+
+    cache = make_cache(client=DownRedis())
+    cache.store(LEASE, "주택임대차계약서")  # 예외 없이 경고만
+    assert cache.lookup(LEASE) is None
@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+
+from app.core.llm import GPTStreamAborted, StreamValidationError
+from app.prompts import type_classifier
+from app.prompts.stream_validators import TypeAnswerValidator
+from app.prompts.type_classifier import (
+    TYPE_CUES, aclassify_text, classify_text, parse_contract_type, rank_contract_types,
+)
+
+
+def _feed(chunks):
+    validator = TypeAnswerValidator()
+    for chunk in chunks:
+        validator.feed(chunk)
+
+
+@pytest.mark.parametrize("chunks", [
+    ["임", "대", "차"],
+    ["소비", "대차"],
+    [" \"사용", "대차\"", "."],
+    ["기타"],
+    ["\n", "매매", "\n"],
+])
+def test_validator_accepts_type_names(chunks):
+    _feed(chunks)
+
+
+@pytest.mark.parametrize("chunks", [
+    ["이 ", "계약은"],
+    ["임대", "인"],
+    ["임대차", " 계약입니다"],
+])
+def test_validator_aborts_once_no_type_can_follow(chunks):
+    with pytest.raises(StreamValidationError):
+        _feed(chunks)
+
+
+def test_parse_contract_type_ignores_quotes_and_period():
+    assert parse_contract_type("\"임대차\".") == "임대차"
+    assert parse_contract_type("결론: 도급") == "도급"
+    assert parse_contract_type("") == "기타"
+
+
+def test_aborted_answer_is_treated_as_other(monkeypatch):
+    monkeypatch.setattr(type_classifier, "type_cache", None)
+
+    def _aborted(messages):
+        raise GPTStreamAborted("유형 판단 응답이 계약 유형 이름이 아님")
+
+    async def _aaborted(messages):
+        _aborted(messages)
+
+    assert classify_text("보증금은 천만 원", _aborted) == "기타"
+    assert asyncio.run(aclassify_text("보증금은 천만 원", _aaborted)) == "기타"
+
+
+def test_rank_orders_candidates_by_cue_count():
+    text = "보증금은 천만 원, 월세는 50만 원이고 관리비 별도. 잔금은 다음 달에"
+    assert rank_contract_types(text) == ["임대차", "매매"]
+
+
+def test_rank_ignores_common_words():
+    # "팔월", "하자(권유)", "반환"은 특정 유형의 단서가 아님
+    assert rank_contract_types("팔월에 만나서 그렇게 하자 네 책은 반환했어요") == []
+
+
+def test_cues_are_specific():
+    for cues in TYPE_CUES.values():
+        assert all(len(cue) >= 2 for cue in cues)